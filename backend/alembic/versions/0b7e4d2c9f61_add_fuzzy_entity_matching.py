@@ -0,0 +1,60 @@
+"""add fuzzy entity matching queue and trigram index
+
+Revision ID: 0b7e4d2c9f61
+Revises: f1d3c6a85e27
+Create Date: 2026-03-16 10:51:44.302518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e4d2c9f61'
+down_revision: Union[str, Sequence[str], None] = 'f1d3c6a85e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('entity_match_candidates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('normalized_name', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('candidate_entity_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('reviewed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['candidate_entity_id'], ['global_entities.id'], ),
+    sa.ForeignKeyConstraint(['entity_id'], ['global_entities.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_entity_match_candidates_candidate_entity_id'), 'entity_match_candidates', ['candidate_entity_id'], unique=False)
+    op.create_index(op.f('ix_entity_match_candidates_entity_id'), 'entity_match_candidates', ['entity_id'], unique=False)
+    op.create_index(op.f('ix_entity_match_candidates_status'), 'entity_match_candidates', ['status'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'ix_global_entities_normalized_trgm',
+            'global_entities',
+            ['normalized_name'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'normalized_name': 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_global_entities_normalized_trgm', table_name='global_entities')
+    op.drop_index(op.f('ix_entity_match_candidates_status'), table_name='entity_match_candidates')
+    op.drop_index(op.f('ix_entity_match_candidates_entity_id'), table_name='entity_match_candidates')
+    op.drop_index(op.f('ix_entity_match_candidates_candidate_entity_id'), table_name='entity_match_candidates')
+    op.drop_table('entity_match_candidates')
@@ -0,0 +1,35 @@
+"""add job watermarks for incremental entity clustering
+
+Revision ID: 3d8f1b6a2e40
+Revises: 0b7e4d2c9f61
+Create Date: 2026-03-18 09:12:37.481906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d8f1b6a2e40'
+down_revision: Union[str, Sequence[str], None] = '0b7e4d2c9f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_watermarks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_name', sa.String(), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_watermarks')
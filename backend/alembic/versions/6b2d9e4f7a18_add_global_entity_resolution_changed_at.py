@@ -0,0 +1,30 @@
+"""track resolution-relevant changes to global entities
+
+Revision ID: 6b2d9e4f7a18
+Revises: 8e6a0f3c5b19
+Create Date: 2026-03-24 11:27:05.318642
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b2d9e4f7a18'
+down_revision: Union[str, Sequence[str], None] = '8e6a0f3c5b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('global_entities', sa.Column('resolution_changed_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_global_entities_resolution_changed_at'), 'global_entities', ['resolution_changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_global_entities_resolution_changed_at'), table_name='global_entities')
+    op.drop_column('global_entities', 'resolution_changed_at')
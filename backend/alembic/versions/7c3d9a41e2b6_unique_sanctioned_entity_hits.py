@@ -0,0 +1,59 @@
+"""unique sanctioned entity hits
+
+Revision ID: 7c3d9a41e2b6
+Revises: 2f5c8e259bd0
+Create Date: 2026-03-04 10:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3d9a41e2b6'
+down_revision: Union[str, Sequence[str], None] = '2f5c8e259bd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL programs would never collide under the unique constraint
+    op.execute("UPDATE sanctioned_entities SET program = '' WHERE program IS NULL")
+
+    # Drop duplicate hits left behind by the old check-then-insert path
+    op.execute(
+        """
+        DELETE FROM sanctioned_entities
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM sanctioned_entities
+            GROUP BY entity_id, source, program
+        )
+        """
+    )
+
+    with op.batch_alter_table('sanctioned_entities') as batch_op:
+        batch_op.alter_column(
+            'program',
+            existing_type=sa.String(),
+            nullable=False,
+            server_default='',
+        )
+        batch_op.create_unique_constraint(
+            'uq_sanctioned_entity_source_program',
+            ['entity_id', 'source', 'program'],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('sanctioned_entities') as batch_op:
+        batch_op.drop_constraint('uq_sanctioned_entity_source_program', type_='unique')
+        batch_op.alter_column(
+            'program',
+            existing_type=sa.String(),
+            nullable=True,
+            server_default=None,
+        )
@@ -0,0 +1,33 @@
+"""composite indexes for the Section 889 join path
+
+Revision ID: 8e6a0f3c5b19
+Revises: 3d8f1b6a2e40
+Create Date: 2026-03-19 16:04:52.730114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e6a0f3c5b19'
+down_revision: Union[str, Sequence[str], None] = '3d8f1b6a2e40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (supplier_id, entity_id) supersedes the single-column supplier_id index
+    op.create_index('ix_supplier_entity_links_supplier_entity', 'supplier_entity_links', ['supplier_id', 'entity_id'], unique=False)
+    op.drop_index(op.f('ix_supplier_entity_links_supplier_id'), table_name='supplier_entity_links')
+    op.create_index('ix_covered_entities_entity_designation', 'covered_entities', ['entity_id', 'designation'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_covered_entities_entity_designation', table_name='covered_entities')
+    op.create_index(op.f('ix_supplier_entity_links_supplier_id'), 'supplier_entity_links', ['supplier_id'], unique=False)
+    op.drop_index('ix_supplier_entity_links_supplier_entity', table_name='supplier_entity_links')
@@ -0,0 +1,53 @@
+"""add sanctions_names with trigram index
+
+Revision ID: 9a1e6f0c3d52
+Revises: 7c3d9a41e2b6
+Create Date: 2026-03-06 16:44:09.517830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1e6f0c3d52'
+down_revision: Union[str, Sequence[str], None] = '7c3d9a41e2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sanctions_names',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('list_name', sa.String(), nullable=False),
+    sa.Column('list_version', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('normalized_name', sa.String(), nullable=False),
+    sa.Column('details', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sanctions_names_id'), 'sanctions_names', ['id'], unique=False)
+    op.create_index(op.f('ix_sanctions_names_list_name'), 'sanctions_names', ['list_name'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'ix_sanctions_names_normalized_trgm',
+            'sanctions_names',
+            ['normalized_name'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'normalized_name': 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_sanctions_names_normalized_trgm', table_name='sanctions_names')
+    op.drop_index(op.f('ix_sanctions_names_list_name'), table_name='sanctions_names')
+    op.drop_index(op.f('ix_sanctions_names_id'), table_name='sanctions_names')
+    op.drop_table('sanctions_names')
@@ -0,0 +1,41 @@
+"""add sanctions_list_versions
+
+Revision ID: c4b8e2d17a93
+Revises: 9a1e6f0c3d52
+Create Date: 2026-03-09 11:27:53.840116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4b8e2d17a93'
+down_revision: Union[str, Sequence[str], None] = '9a1e6f0c3d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sanctions_list_versions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('content_hash', sa.String(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    sa.Column('record_count', sa.Integer(), nullable=True),
+    sa.Column('parse_duration', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'content_hash', name='uq_sanctions_list_version_hash')
+    )
+    op.create_index(op.f('ix_sanctions_list_versions_id'), 'sanctions_list_versions', ['id'], unique=False)
+    op.create_index(op.f('ix_sanctions_list_versions_source'), 'sanctions_list_versions', ['source'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sanctions_list_versions_source'), table_name='sanctions_list_versions')
+    op.drop_index(op.f('ix_sanctions_list_versions_id'), table_name='sanctions_list_versions')
+    op.drop_table('sanctions_list_versions')
@@ -0,0 +1,34 @@
+"""add graph sync state to entities and links
+
+Revision ID: e5f2a7b90c14
+Revises: c4b8e2d17a93
+Create Date: 2026-03-11 09:05:37.662194
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f2a7b90c14'
+down_revision: Union[str, Sequence[str], None] = 'c4b8e2d17a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('global_entities', sa.Column('graph_sync_hash', sa.String(), nullable=True))
+    op.add_column('global_entities', sa.Column('graph_synced_at', sa.DateTime(), nullable=True))
+    op.add_column('supplier_entity_links', sa.Column('graph_sync_hash', sa.String(), nullable=True))
+    op.add_column('supplier_entity_links', sa.Column('graph_synced_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('supplier_entity_links', 'graph_synced_at')
+    op.drop_column('supplier_entity_links', 'graph_sync_hash')
+    op.drop_column('global_entities', 'graph_synced_at')
+    op.drop_column('global_entities', 'graph_sync_hash')
@@ -0,0 +1,28 @@
+"""index supplier_entity_links.supplier_id
+
+Revision ID: f1d3c6a85e27
+Revises: e5f2a7b90c14
+Create Date: 2026-03-12 14:38:20.119457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d3c6a85e27'
+down_revision: Union[str, Sequence[str], None] = 'e5f2a7b90c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_supplier_entity_links_supplier_id'), 'supplier_entity_links', ['supplier_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_supplier_entity_links_supplier_id'), table_name='supplier_entity_links')
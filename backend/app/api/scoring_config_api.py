@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import ScoringConfig, User
-from app.schemas import ScoringConfigUpdate, ScoringConfigResponse
+from app.schemas import ScoringConfigUpdate, ScoringConfigResponse, ScoringWhatIfResponse
 from app.core.security import require_admin
+from app.services.scoring_engine import ScoringEngine
+from app.services.scoring_simulation_service import simulate_scoring_config
 
 router = APIRouter(prefix="/admin/scoring-config", tags=["Admin Scoring Config"])
 
@@ -44,4 +46,18 @@ def update_scoring_config(
     db.add(new_config)
     db.commit()
     db.refresh(new_config)
+
+    # Pick up the new weights in this process without waiting for the reload check
+    ScoringEngine.invalidate()
     return new_config
+
+
+@router.post("/what-if", response_model=ScoringWhatIfResponse)
+def what_if_scoring_config(
+    data: ScoringConfigUpdate,
+    top_n: int = Query(20, ge=1, le=500),
+    db: Session = Depends(get_db),
+    admin_user: User = Depends(require_admin)
+):
+    """Re-score every supplier's latest assessment under a candidate config without activating it."""
+    return simulate_scoring_config(data, db, top_n=top_n)
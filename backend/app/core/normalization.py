@@ -0,0 +1,97 @@
+"""
+Name Normalization
+==================
+The one normalizer for company / person names, used for supplier and
+entity de-duplication, entity resolution, sanctions screening and covered
+entity matching. Every stored ``normalized_name`` / ``normalized_alias``
+and every screening index is built with it, so lookups on either side
+always agree.
+
+Steps
+  1. Unicode fold: NFKD, drop combining marks, casefold ("Société" -> "societe")
+  2. Drop periods and apostrophes ("S.A." -> "sa", "O'Neil" -> "oneil"),
+     turn every other punctuation character into a space
+  3. Collapse whitespace
+  4. Strip trailing legal-form tokens ("huawei technologies co ltd" ->
+     "huawei technologies"), always keeping at least one token
+
+``normalize_name`` memoizes hot names in an LRU. ``normalize_names`` is the
+bulk variant: pandas string ops over a Series, de-duplicated scalar calls
+over a list. Both produce identical output.
+
+Bump ``NORMALIZER_VERSION`` whenever the output changes; it keys caches and
+on-disk indexes, and stored names need ``scripts/renormalize_names.py``.
+"""
+
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterable
+
+
+NORMALIZER_VERSION = 2
+NORMALIZE_CACHE_SIZE = int(os.getenv("NORMALIZE_CACHE_SIZE", "65536"))
+
+LEGAL_SUFFIXES = frozenset({
+    # English
+    "ltd", "limited", "co", "company", "corp", "corporation", "inc", "incorporated",
+    "llc", "llp", "lp", "plc", "pvt", "private", "pte", "pty",
+    # European
+    "gmbh", "ag", "kg", "sa", "sas", "sarl", "srl", "spa", "bv", "nv",
+    "oy", "oyj", "ab", "as", "asa", "aps", "kft", "sro", "doo",
+    # Russian / CIS
+    "jsc", "ojsc", "pjsc", "cjsc", "ooo", "zao", "oao", "ооо", "зао", "оао", "пао",
+    # Asian
+    "kk", "bhd", "sdn", "tbk",
+})
+
+_COMBINING_MARKS = "\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f"
+_COMBINING_RE = re.compile(f"[{_COMBINING_MARKS}]")
+_DROP_RE = re.compile(r"[.'’`]")
+_PUNCT_RE = re.compile(r"[^\w\s]|_")
+_SPACE_RE = re.compile(r"\s+")
+_SUFFIX_RE = re.compile(
+    r"^(\S.*?)(?:\s(?:" + "|".join(sorted(LEGAL_SUFFIXES, key=len, reverse=True)) + r"))+$"
+)
+
+
+def _normalize(name: str) -> str:
+    text = unicodedata.normalize("NFKD", name)
+    text = _COMBINING_RE.sub("", text).casefold()
+    text = _DROP_RE.sub("", text)
+    text = _PUNCT_RE.sub(" ", text)
+    text = _SPACE_RE.sub(" ", text).strip()
+    return _SUFFIX_RE.sub(r"\1", text)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_name(name: str) -> str:
+    if not name:
+        return ""
+    return _normalize(name)
+
+
+def normalize_names(names: Iterable[str]):
+    """
+    Bulk ``normalize_name``. A pandas Series is normalized with vectorized
+    string ops and returned as a Series (same index); any other iterable
+    returns a list. Missing values normalize to "".
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+
+    if pd is not None and isinstance(names, pd.Series):
+        text = names.fillna("").astype(str).str.normalize("NFKD")
+        text = text.str.replace(_COMBINING_RE, "", regex=True).str.casefold()
+        text = text.str.replace(_DROP_RE, "", regex=True)
+        text = text.str.replace(_PUNCT_RE, " ", regex=True)
+        text = text.str.replace(_SPACE_RE, " ", regex=True).str.strip()
+        return text.str.replace(_SUFFIX_RE, r"\1", regex=True)
+
+    # Bypasses the LRU: one-off bulk names would only evict hot ones
+    names = ["" if n is None else str(n) for n in names]
+    unique = {n: _normalize(n) for n in dict.fromkeys(names)}
+    return [unique[n] for n in names]
@@ -77,6 +77,140 @@ def link_supplier_to_entity(
         )
 
 
+# =====================================================
+# BULK SYNC (GRAPH RECONCILIATION)
+# =====================================================
+
+def bulk_upsert_global_entity_nodes(rows: list[dict]):
+    """rows: [{"name", "type", "country"}] — one UNWIND transaction per call."""
+    if not rows:
+        return
+    with get_session() as session:
+        session.run(
+            """
+            UNWIND $rows AS row
+            MERGE (e:GlobalEntity {canonical_name: row.name})
+            SET e.entity_type = row.type,
+                e.country = row.country,
+                e.updated_at = timestamp()
+            """,
+            rows=rows,
+        )
+
+
+def bulk_link_suppliers_to_entities(rows: list[dict]):
+    """rows: [{"supplier", "entity", "confidence", "method"}]"""
+    if not rows:
+        return
+    with get_session() as session:
+        session.run(
+            """
+            UNWIND $rows AS row
+            MERGE (s:Supplier {name: row.supplier})
+            MERGE (e:GlobalEntity {canonical_name: row.entity})
+            MERGE (s)-[r:RESOLVES_TO]->(e)
+            SET r.confidence = row.confidence,
+                r.method = row.method,
+                r.updated_at = timestamp()
+            """,
+            rows=rows,
+        )
+
+
+def existing_global_entity_names(names: list[str]) -> set[str]:
+    if not names:
+        return set()
+    with get_session() as session:
+        result = session.run(
+            """
+            UNWIND $names AS name
+            MATCH (e:GlobalEntity {canonical_name: name})
+            RETURN e.canonical_name AS name
+            """,
+            names=names,
+        )
+        return {r["name"] for r in result}
+
+
+def existing_supplier_links(pairs: list[tuple[str, str]]) -> set[tuple[str, str]]:
+    if not pairs:
+        return set()
+    with get_session() as session:
+        result = session.run(
+            """
+            UNWIND $pairs AS pair
+            MATCH (s:Supplier {name: pair[0]})-[:RESOLVES_TO]->(e:GlobalEntity {canonical_name: pair[1]})
+            RETURN s.name AS supplier, e.canonical_name AS entity
+            """,
+            pairs=[list(p) for p in pairs],
+        )
+        return {(r["supplier"], r["entity"]) for r in result}
+
+
+_MERGE_ENTITY_NODE_STATEMENTS = (
+    # Survivor inherits the sanction flag
+    """
+    UNWIND $rows AS row
+    MATCH (old:GlobalEntity {canonical_name: row.old})
+    MERGE (new:GlobalEntity {canonical_name: row.new})
+    FOREACH (_ IN CASE WHEN old.sanctioned THEN [1] ELSE [] END |
+        SET new.sanctioned = true,
+            new.sanction_source = coalesce(new.sanction_source, old.sanction_source),
+            new.enterprise_risk_score = 100
+    )
+    """,
+    """
+    UNWIND $rows AS row
+    MATCH (s:Supplier)-[r:RESOLVES_TO]->(:GlobalEntity {canonical_name: row.old})
+    MATCH (new:GlobalEntity {canonical_name: row.new})
+    MERGE (s)-[m:RESOLVES_TO]->(new)
+    SET m.confidence = r.confidence,
+        m.method = r.method,
+        m.updated_at = timestamp()
+    """,
+    """
+    UNWIND $rows AS row
+    MATCH (:GlobalEntity {canonical_name: row.old})-[r:RELATION]->(b)
+    MATCH (new:GlobalEntity {canonical_name: row.new})
+    WHERE b <> new
+    MERGE (new)-[m:RELATION {type: r.type}]->(b)
+    SET m.confidence = r.confidence,
+        m.weight = r.weight,
+        m.updated_at = timestamp()
+    """,
+    """
+    UNWIND $rows AS row
+    MATCH (a)-[r:RELATION]->(:GlobalEntity {canonical_name: row.old})
+    MATCH (new:GlobalEntity {canonical_name: row.new})
+    WHERE a <> new
+    MERGE (a)-[m:RELATION {type: r.type}]->(new)
+    SET m.confidence = r.confidence,
+        m.weight = r.weight,
+        m.updated_at = timestamp()
+    """,
+    """
+    UNWIND $rows AS row
+    MATCH (old:GlobalEntity {canonical_name: row.old})
+    DETACH DELETE old
+    """,
+)
+
+
+def merge_global_entity_nodes(rows: list[dict]):
+    """
+    rows: [{"old", "new"}] canonical names. Moves every RESOLVES_TO and
+    RELATION edge of each old node onto the new one and deletes the old
+    node, in one transaction.
+    """
+    if not rows:
+        return
+    with get_session() as session:
+        with session.begin_transaction() as tx:
+            for statement in _MERGE_ENTITY_NODE_STATEMENTS:
+                tx.run(statement, rows=rows)
+            tx.commit()
+
+
 # =====================================================
 # ENTITY RELATIONSHIP CREATION
 # =====================================================
@@ -83,3 +83,8 @@ def startup_event():
     # START BACKGROUND SCHEDULER
     from app.services.scheduler_service import start_scheduler
     start_scheduler()
+
+    # WARM SANCTIONS SNAPSHOTS (loaded once, refreshed in background)
+    from app.services.public_data_service import sanctions_store, SCREENING_SERVICE_URL
+    if not SCREENING_SERVICE_URL:
+        sanctions_store.warm()
@@ -9,6 +9,7 @@ from sqlalchemy import (
     UniqueConstraint,
     BigInteger,
     Float,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -53,6 +54,15 @@ class User(Base):
 class GlobalEntity(Base):
     __tablename__ = "global_entities"
 
+    __table_args__ = (
+        Index(
+            "ix_global_entities_normalized_trgm",
+            "normalized_name",
+            postgresql_using="gin",
+            postgresql_ops={"normalized_name": "gin_trgm_ops"},
+        ),
+    )
+
     id = Column(Integer, primary_key=True)
     canonical_name = Column(String, index=True, nullable=False)
     normalized_name = Column(String, index=True, nullable=False)
@@ -60,6 +70,12 @@ class GlobalEntity(Base):
     country = Column(String, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Last change to a field resolution and clustering depend on (name, type, country)
+    resolution_changed_at = Column(DateTime, nullable=True, index=True)
+
+    # Neo4j sync state: hash of the node properties last written to the graph
+    graph_sync_hash = Column(String, nullable=True)
+    graph_synced_at = Column(DateTime, nullable=True)
 
     aliases = relationship("GlobalEntityAlias", back_populates="entity", cascade="all, delete-orphan")
     sanctions = relationship("SanctionedEntity", back_populates="entity")
@@ -79,6 +95,24 @@ class GlobalEntityAlias(Base):
     entity = relationship("GlobalEntity", back_populates="aliases")
 
 
+class EntityMatchCandidate(Base):
+    """Borderline fuzzy resolution queued for review: was ``entity_id`` really ``candidate_entity_id``?"""
+    __tablename__ = "entity_match_candidates"
+
+    id = Column(Integer, primary_key=True)
+
+    name = Column(String, nullable=False)
+    normalized_name = Column(String, nullable=False)
+
+    entity_id = Column(Integer, ForeignKey("global_entities.id"), nullable=False, index=True)
+    candidate_entity_id = Column(Integer, ForeignKey("global_entities.id"), nullable=False, index=True)
+    score = Column(Float, nullable=False)
+
+    status = Column(String, default="PENDING", index=True)  # PENDING | ACCEPTED | REJECTED
+    created_at = Column(DateTime, default=datetime.utcnow)
+    reviewed_at = Column(DateTime, nullable=True)
+
+
 # =====================================================
 # SUPPLIER (TENANT SCOPED)
 # =====================================================
@@ -139,6 +173,10 @@ class Supplier(Base):
 class SupplierEntityLink(Base):
     __tablename__ = "supplier_entity_links"
 
+    __table_args__ = (
+        Index("ix_supplier_entity_links_supplier_entity", "supplier_id", "entity_id"),
+    )
+
     id = Column(Integer, primary_key=True)
     supplier_id = Column(Integer, ForeignKey("suppliers.id"), nullable=False)
     entity_id = Column(Integer, ForeignKey("global_entities.id"), nullable=False)
@@ -146,6 +184,10 @@ class SupplierEntityLink(Base):
     confidence_score = Column(Float, nullable=False)
     resolution_method = Column(String, default="AUTO")  # AUTO | MANUAL
 
+    # Neo4j sync state for the RESOLVES_TO relationship
+    graph_sync_hash = Column(String, nullable=True)
+    graph_synced_at = Column(DateTime, nullable=True)
+
     supplier = relationship("Supplier", back_populates="entity_links")
     entity = relationship("GlobalEntity", back_populates="supplier_links")
 
@@ -156,21 +198,87 @@ class SupplierEntityLink(Base):
 class SanctionedEntity(Base):
     __tablename__ = "sanctioned_entities"
 
+    __table_args__ = (
+        UniqueConstraint(
+            "entity_id",
+            "source",
+            "program",
+            name="uq_sanctioned_entity_source_program",
+        ),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     source = Column(String, nullable=False)  # OFAC | BIS | UN | EU | etc.
-    program = Column(String, nullable=True)
+    program = Column(String, nullable=False, default="", server_default="")
 
     entity_id = Column(Integer, ForeignKey("global_entities.id"), nullable=False)
 
     entity = relationship("GlobalEntity", back_populates="sanctions")
 
 
+# =====================================================
+# SANCTIONS LIST VERSIONS
+# =====================================================
+class SanctionsListVersion(Base):
+    """One row per distinct payload of a sanctions list (OFAC / BIS / EU)."""
+    __tablename__ = "sanctions_list_versions"
+
+    __table_args__ = (
+        UniqueConstraint(
+            "source",
+            "content_hash",
+            name="uq_sanctions_list_version_hash",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    source = Column(String, nullable=False, index=True)
+    content_hash = Column(String, nullable=False)  # sha256 of the raw payload
+
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    record_count = Column(Integer, default=0)
+    parse_duration = Column(Float, nullable=True)  # seconds
+
+
+# =====================================================
+# SANCTIONS LIST NAMES (POSTGRES SCREENING ENGINE)
+# =====================================================
+class SanctionsName(Base):
+    """
+    One row per record of the current version of each sanctions list, used
+    by the pg_trgm screening engine (SCREENING_ENGINE=postgres).
+    """
+    __tablename__ = "sanctions_names"
+
+    __table_args__ = (
+        Index(
+            "ix_sanctions_names_normalized_trgm",
+            "normalized_name",
+            postgresql_using="gin",
+            postgresql_ops={"normalized_name": "gin_trgm_ops"},
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    list_name = Column(String, nullable=False, index=True)
+    list_version = Column(String, nullable=False)
+
+    name = Column(String, nullable=False)
+    normalized_name = Column(String, nullable=False)
+    details = Column(JSON, default=dict)
+
+
 # =====================================================
 # SECTION 889 COVERED ENTITY
 # =====================================================
 class CoveredEntity(Base):
     __tablename__ = "covered_entities"
 
+    __table_args__ = (
+        Index("ix_covered_entities_entity_designation", "entity_id", "designation"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     designation = Column(String, nullable=False)  # e.g., "Section 889(a)(1)(B)"
@@ -269,6 +377,21 @@ class IngestionRun(Base):
     completed_at = Column(DateTime, nullable=True)
 
 
+# =====================================================
+# JOB WATERMARKS (INCREMENTAL BACKGROUND JOBS)
+# =====================================================
+class JobWatermark(Base):
+    """How far an incremental job has got, e.g. the last global entity id clustered."""
+    __tablename__ = "job_watermarks"
+
+    id = Column(Integer, primary_key=True)
+
+    job_name = Column(String, unique=True, nullable=False)
+    value = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 # =====================================================
 # TRUST MODEL CONFIG (VERSIONED)
 # =====================================================
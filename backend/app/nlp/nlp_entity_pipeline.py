@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 
 from app.nlp.entity_extractor import extract_entities
 from app.nlp.relationship_extractor import extract_relationships
-from app.services.entity_resolution_service import resolve_or_create_entity
+from app.services.entity_resolution_service import resolve_entities_bulk
 from app.graph.supplier_graph_service import create_entity_relationship
 
 
@@ -13,15 +13,14 @@ def process_document(text: str, db: Session):
 
     entity_map = {}
 
-    # Resolve entities
+    # Resolve entities (one batch per entity label)
+    names_by_label = {}
     for ent in extracted_entities:
-        entity, _ = resolve_or_create_entity(
-            name=ent["text"],
-            db=db,
-            entity_type=ent["label"],
-        )
+        names_by_label.setdefault(ent["label"], []).append(ent["text"])
 
-        entity_map[ent["text"]] = entity.canonical_name
+    for label, names in names_by_label.items():
+        for name, (entity, _) in zip(names, resolve_entities_bulk(names, db, entity_type=label)):
+            entity_map[name] = entity.canonical_name
 
     # Resolve relationships
     for rel in extracted_relationships:
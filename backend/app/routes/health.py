@@ -5,3 +5,22 @@ router = APIRouter(prefix="/health", tags=["Health"])
 @router.get("/")
 def health_check():
     return {"status": "ok"}
+
+
+@router.get("/screening")
+def screening_health():
+    from app.services.public_data_service import sanctions_store, screening_cache
+    from app.screening.covered_matcher import covered_matcher
+
+    return {
+        "lists": sanctions_store.versions(),
+        "result_cache": screening_cache.stats(),
+        "covered_entities": covered_matcher.stats(),
+    }
+
+
+@router.get("/entity-resolution")
+def entity_resolution_health():
+    from app.services.entity_cache import entity_cache
+
+    return {"cache": entity_cache.stats()}
@@ -22,7 +22,7 @@ from app.services.audit_service import log_action
 from app.core.security import get_current_user
 from app.graph.supplier_graph_service import create_supplier_node
 from app.graph.graph_client import get_session
-from app.services.entity_resolution_service import normalize
+from app.core.normalization import normalize_name
 
 router = APIRouter(prefix="/suppliers", tags=["Suppliers"])
 
@@ -44,7 +44,7 @@ def search_suppliers(
 ):
 
     if query:
-        normalized_query = normalize(query)
+        normalized_query = normalize_name(query)
         # Multi-field similarity scoring
         name_sim = func.similarity(Supplier.normalized_name, normalized_query)
         industry_sim = func.similarity(Supplier.industry, normalized_query)
@@ -87,7 +87,7 @@ def search_suppliers(
         search_pattern = f"%{query}%"
         base_query = base_query.filter(
             or_(
-                func.similarity(Supplier.normalized_name, normalize(query)) > 0.15,
+                func.similarity(Supplier.normalized_name, normalize_name(query)) > 0.15,
                 func.similarity(Supplier.industry, query) > 0.3,
                 func.similarity(Supplier.country, query) > 0.4,
                 Supplier.address.ilike(search_pattern),
@@ -97,7 +97,7 @@ def search_suppliers(
 
     # Order by score + boosts
     if query:
-        normalized_query = normalize(query)
+        normalized_query = normalize_name(query)
         order_expr = desc(
             search_score
             + case((Supplier.normalized_name == normalized_query, 2.0), else_=0.0)
@@ -130,7 +130,7 @@ def create_supplier(
 ):
     from app.services.entity_resolution_service import resolve_supplier_entity
 
-    normalized = normalize(supplier.name)
+    normalized = normalize_name(supplier.name)
 
     existing = (
         db.query(Supplier)
@@ -77,3 +77,24 @@ class ScoringConfigResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ScoringMover(BaseModel):
+    supplier_id: int
+    supplier: str
+    current_score: int
+    candidate_score: int
+    delta: int
+    current_status: str
+    candidate_status: str
+
+
+class ScoringWhatIfResponse(BaseModel):
+    suppliers: int
+    skipped: int
+    scoring_version: str
+    current_config_version: Optional[str]
+    current_status_counts: Dict[str, int]
+    candidate_status_counts: Dict[str, int]
+    migrations: Dict[str, int]
+    top_movers: list[ScoringMover]
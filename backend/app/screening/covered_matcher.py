@@ -0,0 +1,188 @@
+"""
+Section 889 Covered-Entity Matcher
+==================================
+In-memory, token-blocked index over every covered entity's names (the
+GlobalEntity canonical name plus its aliases), loaded through the
+``covered_entities`` -> ``global_entities`` join once per covered-entity
+version instead of fuzzy-scoring the whole table on every assessment.
+
+Covered-entity ingestion records a "Section 889" row in
+``sanctions_list_versions`` (see list_version_service); the matcher checks
+for a newer row at most every ``COVERED_VERSION_CHECK_SECONDS`` and
+rebuilds when it changes. Lookups are memoized per normalized name until
+the next rebuild; ``match_bulk`` scores a batch of unseen names in one
+cdist pass.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from rapidfuzz import fuzz, process
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.normalization import normalize_name, normalize_names
+from app.models import CoveredEntity, GlobalEntity, GlobalEntityAlias, SanctionsListVersion
+from app.screening.name_index import NameIndex
+
+
+COVERED_ENTITY_SOURCE = "Section 889"
+COVERED_MATCH_THRESHOLD = 80   # a name matches when token_set_ratio exceeds this
+COVERED_VERSION_CHECK_SECONDS = int(os.getenv("COVERED_VERSION_CHECK_SECONDS", "30"))
+COVERED_RESULT_CACHE_SIZE = 50000
+
+
+@dataclass(frozen=True)
+class CoveredMatch:
+    entity_id: int
+    name: str             # canonical name of the covered entity
+    designation: str
+    source: str
+    score: float
+
+
+class CoveredEntityMatcher:
+    def __init__(self, check_interval: int = COVERED_VERSION_CHECK_SECONDS):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = float("-inf")
+        # (index, owners, results) swapped as one: owners[i] lists the
+        # (entity_id, canonical_name, designation, source) of index.names[i]
+        self._state: tuple[NameIndex, list[list[tuple]], dict] = (NameIndex(()), [], {})
+
+    # ---------------------------------------------
+    # Loading
+    # ---------------------------------------------
+    @staticmethod
+    def _current_version(db: Session) -> tuple:
+        # The count / max id part catches rows written without recording a version
+        latest = (
+            db.query(SanctionsListVersion.content_hash)
+            .filter(SanctionsListVersion.source == COVERED_ENTITY_SOURCE)
+            .order_by(SanctionsListVersion.fetched_at.desc())
+            .limit(1)
+            .scalar()
+        )
+        count, max_id = db.query(func.count(CoveredEntity.id), func.max(CoveredEntity.id)).one()
+        return latest, count, max_id
+
+    def _load(self, db: Session):
+        rows = (
+            db.query(
+                GlobalEntity.id,
+                GlobalEntity.canonical_name,
+                GlobalEntity.normalized_name,
+                CoveredEntity.designation,
+                CoveredEntity.source,
+            )
+            .join(CoveredEntity, CoveredEntity.entity_id == GlobalEntity.id)
+            .order_by(CoveredEntity.id)
+            .all()
+        )
+        aliases: dict[int, list[str]] = {}
+        if rows:
+            for entity_id, alias in (
+                db.query(GlobalEntityAlias.entity_id, GlobalEntityAlias.normalized_alias)
+                .filter(GlobalEntityAlias.entity_id.in_({r.id for r in rows}))
+            ):
+                aliases.setdefault(entity_id, []).append(alias)
+
+        owners: dict[str, list[tuple]] = {}
+        for r in rows:
+            owner = (r.id, r.canonical_name, r.designation, r.source)
+            for name in dict.fromkeys([r.normalized_name, *aliases.get(r.id, ())]):
+                if name:
+                    owners.setdefault(name, []).append(owner)
+
+        names = list(owners)
+        self._state = (NameIndex(names), [owners[n] for n in names], {})
+
+    def _ensure_current(self, db: Session):
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return
+            version = self._current_version(db)
+            if version != self._version:
+                self._load(db)
+                self._version = version
+            self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        """Force a version check on the next lookup (called after local ingestion)."""
+        self._checked_at = float("-inf")
+
+    # ---------------------------------------------
+    # Lookup
+    # ---------------------------------------------
+    def match(self, name: str, db: Session) -> CoveredMatch | None:
+        """Best covered entity whose name scores above COVERED_MATCH_THRESHOLD, if any."""
+        self._ensure_current(db)
+        norm = normalize_name(name)
+
+        index, owners, results = self._state
+        if norm in results:
+            return results[norm]
+
+        match = self._best(norm, index.candidates(norm, COVERED_MATCH_THRESHOLD), index, owners)
+        self._remember(results, {norm: match})
+        return match
+
+    def match_bulk(self, names: list[str], db: Session) -> list[CoveredMatch | None]:
+        """``match`` for many names, in input order; unseen names are scored in one cdist pass."""
+        self._ensure_current(db)
+        norms = normalize_names(names)
+
+        index, owners, results = self._state
+        found = {norm: results[norm] for norm in norms if norm in results}
+        pending = [norm for norm in dict.fromkeys(norms) if norm not in found]
+
+        if pending and len(index):
+            # float32 pre-filter just below the threshold, exact re-score in _best
+            matrix = process.cdist(
+                pending,
+                index.names,
+                scorer=fuzz.token_set_ratio,
+                score_cutoff=COVERED_MATCH_THRESHOLD - 0.5,
+                workers=-1,
+            )
+            for row, norm in enumerate(pending):
+                found[norm] = self._best(norm, matrix[row].nonzero()[0].tolist(), index, owners)
+        else:
+            found.update(dict.fromkeys(pending))
+
+        self._remember(results, {norm: found[norm] for norm in pending})
+        return [found[norm] for norm in norms]
+
+    @staticmethod
+    def _best(norm: str, positions, index: NameIndex, owners: list[list[tuple]]) -> CoveredMatch | None:
+        best = None
+        for i in positions:
+            score = fuzz.token_set_ratio(norm, index.names[i])
+            if score > COVERED_MATCH_THRESHOLD and (best is None or score > best[0]):
+                best = (score, i)
+        if not best:
+            return None
+        entity_id, canonical_name, designation, source = owners[best[1]][0]
+        return CoveredMatch(entity_id, canonical_name, designation, source, round(best[0], 2))
+
+    @staticmethod
+    def _remember(results: dict, matches: dict):
+        if len(results) + len(matches) > COVERED_RESULT_CACHE_SIZE:
+            results.clear()
+        results.update(matches)
+
+    def stats(self) -> dict:
+        return {
+            "version": self._version[0] if self._version else None,
+            "names": len(self._state[0]),
+            "cached_lookups": len(self._state[2]),
+        }
+
+
+# Process-wide instance used by section889_service
+covered_matcher = CoveredEntityMatcher()
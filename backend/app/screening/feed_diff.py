@@ -0,0 +1,45 @@
+"""
+Sanctions Feed Diff
+===================
+Computes which entries were added to or removed from a list between two
+snapshot versions, so a list update can be screened as a small delta
+instead of triggering a full portfolio rescore.
+"""
+
+from dataclasses import dataclass, field
+
+from app.screening.sanctions_store import ListSnapshot, SanctionsRecord
+
+
+@dataclass
+class FeedDelta:
+    source: str
+    old_version: str
+    new_version: str
+    added: list[SanctionsRecord] = field(default_factory=list)
+    removed: list[SanctionsRecord] = field(default_factory=list)
+
+    @property
+    def changed(self) -> list[SanctionsRecord]:
+        return self.added + self.removed
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed)
+
+
+def _record_key(record: SanctionsRecord) -> tuple[str, str]:
+    # Same name re-listed under another program is a real change
+    return record.normalized_name, record.details.get("program", "")
+
+
+def diff_snapshots(old: ListSnapshot, new: ListSnapshot) -> FeedDelta:
+    old_records = {_record_key(r): r for r in old.records}
+    new_records = {_record_key(r): r for r in new.records}
+
+    return FeedDelta(
+        source=new.source,
+        old_version=old.version,
+        new_version=new.version,
+        added=[r for key, r in new_records.items() if key not in old_records],
+        removed=[r for key, r in old_records.items() if key not in new_records],
+    )
@@ -0,0 +1,317 @@
+"""
+Compact On-Disk Sanctions Index
+===============================
+Binary, memory-mappable form of one ``ListSnapshot``: the normalized and
+display names, the per-record hit fields, and the blocking postings used by
+``BlockingIndex.candidates``.
+
+The process that ingests a list writes the file once per list version;
+every other API / Celery worker process ``mmap``s it read-only, so all of
+them share a single page-cache copy instead of each parsing and holding its
+own. Files are replaced atomically (``os.replace``), so a process that still
+maps the previous version keeps a valid view until it remaps.
+
+Layout (native byte order, every section 8-byte aligned)
+  b"SIDX" | u32 meta length | meta JSON | sections…
+
+  Strings are stored as string tables: a u32 offsets array (n + 1) plus a
+  UTF-8 blob. Hit fields (program, country, sdn_type…) are dictionary
+  encoded: one small-integer code array per field plus a table of distinct
+  values whose entry 0 is reserved for "record has no such field", so a
+  missing key and an empty value read back as they were written. Token and bigram postings are a sorted key table, a u32 offsets
+  array into a flat u32 postings array, and (tokens only) a u8 flag marking
+  common tokens, whose postings are sorted by name length.
+"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Sequence
+
+import numpy as np
+
+from app.core.normalization import NORMALIZER_VERSION
+from app.screening.name_index import BlockingIndex, NameIndex
+from app.screening.sanctions_store import ListSnapshot, SanctionsRecord
+
+
+MAGIC = b"SIDX"
+FORMAT_VERSION = 3
+_ALIGN = 8
+_ABSENT = 0  # field code of a record without that detail
+
+
+# =====================================================
+# WRITER
+# =====================================================
+
+def _string_table(values: Sequence[str]) -> tuple[array, bytes]:
+    offsets = array("I", [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def _postings_table(keys: list[str], postings: dict) -> tuple[array, array]:
+    offsets = array("I", [0])
+    flat = array("I")
+    for key in keys:
+        flat.extend(postings[key])
+        offsets.append(len(flat))
+    return offsets, flat
+
+
+def write_index_file(snapshot: ListSnapshot, path: str):
+    """Serialize a parsed snapshot (with its NameIndex) and atomically install it at ``path``."""
+    records = snapshot.records
+    index: NameIndex = snapshot.index
+    sections: dict[str, bytes] = {}
+
+    def add_strings(prefix: str, values: Sequence[str]):
+        offsets, blob = _string_table(values)
+        sections[f"{prefix}.off"] = offsets.tobytes()
+        sections[f"{prefix}.blob"] = blob
+
+    add_strings("norm", [r.normalized_name for r in records])
+    add_strings("name", [r.name for r in records])
+
+    fields = list(dict.fromkeys(key for r in records for key in r.details))
+    for field_name in fields:
+        table: dict[str, int] = {}
+        codes = [
+            table.setdefault(str(r.details[field_name]), len(table) + 1) if field_name in r.details else _ABSENT
+            for r in records
+        ]
+        sections[f"field.{field_name}.codes"] = array("H" if len(table) <= 0xFFFF else "I", codes).tobytes()
+        add_strings(f"field.{field_name}", ["", *table])
+
+    sections["lengths"] = array("I", index.lengths).tobytes()
+
+    tokens = sorted(index.tokens, key=lambda t: t.encode("utf-8"))
+    add_strings("tok", tokens)
+    offsets, flat = _postings_table(tokens, {t: index.tokens[t][0] for t in tokens})
+    sections["tok.post.off"] = offsets.tobytes()
+    sections["tok.post"] = flat.tobytes()
+    sections["tok.common"] = bytes(1 if index.tokens[t][1] is not None else 0 for t in tokens)
+
+    grams = sorted(index.grams, key=lambda g: g.encode("utf-8"))
+    add_strings("gram", grams)
+    offsets, flat = _postings_table(grams, index.grams)
+    sections["gram.post.off"] = offsets.tobytes()
+    sections["gram.post"] = flat.tobytes()
+
+    # Section offsets are relative to the start of the (aligned) data area
+    layout: dict[str, list[int]] = {}
+    cursor = 0
+    for key, data in sections.items():
+        layout[key] = [cursor, len(data)]
+        cursor += len(data) + (-len(data) % _ALIGN)
+
+    meta = json.dumps({
+        "format": FORMAT_VERSION,
+        "normalizer": NORMALIZER_VERSION,
+        "byteorder": sys.byteorder,
+        "source": snapshot.source,
+        "version": snapshot.version,
+        "fetched_at": snapshot.fetched_at.isoformat(),
+        "etag": snapshot.etag,
+        "last_modified": snapshot.last_modified,
+        "record_count": len(records),
+        "fields": fields,
+        "code_types": {f: ("H" if len(sections[f"field.{f}.codes"]) == 2 * len(records) else "I") for f in fields},
+        "sections": layout,
+    }).encode("utf-8")
+
+    header = MAGIC + len(meta).to_bytes(4, "little") + meta
+    header += b"\0" * (-len(header) % _ALIGN)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(header)
+        for data in sections.values():
+            fh.write(data)
+            fh.write(b"\0" * (-len(data) % _ALIGN))
+    os.replace(tmp_path, path)
+
+
+# =====================================================
+# READER
+# =====================================================
+
+class _StringTable(Sequence):
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._off = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._off) - 1
+
+    def raw(self, i: int) -> bytes:
+        return bytes(self._blob[self._off[i]:self._off[i + 1]])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self.raw(i).decode("utf-8")
+
+    def find(self, key: str) -> int:
+        """Binary search a table written in UTF-8 byte order; -1 if absent."""
+        target = key.encode("utf-8")
+        keys = _RawKeys(self)
+        pos = bisect_left(keys, target)
+        if pos < len(self) and self.raw(pos) == target:
+            return pos
+        return -1
+
+
+class _RawKeys:
+    def __init__(self, table: _StringTable):
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._table.raw(i)
+
+
+class _KeyedLengths:
+    """lengths[ids[k]] as a sequence, so bisect can cut common-token postings."""
+
+    def __init__(self, ids: memoryview, lengths: memoryview):
+        self._ids = ids
+        self._lengths = lengths
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, k: int) -> int:
+        return self._lengths[self._ids[k]]
+
+
+class MappedRecords(Sequence):
+    """Decodes ``SanctionsRecord`` objects on demand from the mapped file."""
+
+    def __init__(self, norms: _StringTable, names: _StringTable, fields: dict):
+        self._norms = norms
+        self._names = names
+        self._fields = fields  # field -> (codes, values table)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return SanctionsRecord(
+            name=self._names[i],
+            normalized_name=self._norms[i],
+            details={
+                f: values[codes[i]] for f, (codes, values) in self._fields.items() if codes[i] != _ABSENT
+            },
+        )
+
+
+class MappedNameIndex(BlockingIndex):
+    def __init__(self, mm: mmap.mmap, view: memoryview, section):
+        self._mm = mm      # keep the mapping alive as long as the index is referenced
+        self._view = view
+        self._names_table = _StringTable(section("norm.off", "I"), section("norm.blob"))
+        self._lengths = section("lengths", "I")
+        self._tokens = _StringTable(section("tok.off", "I"), section("tok.blob"))
+        self._tok_off = section("tok.post.off", "I")
+        self._tok_post = section("tok.post", "I")
+        self._tok_common = section("tok.common")
+        self._grams = _StringTable(section("gram.off", "I"), section("gram.blob"))
+        self._gram_off = section("gram.post.off", "I")
+        self._gram_post = section("gram.post", "I")
+
+    @property
+    def names(self) -> Sequence[str]:
+        # Decoded by position on access; whole-list passes copy it for their own duration
+        return self._names_table
+
+    def __len__(self) -> int:
+        return len(self._names_table)
+
+    def token_postings(self, token: str):
+        pos = self._tokens.find(token)
+        if pos < 0:
+            return None
+        ids = self._tok_post[self._tok_off[pos]:self._tok_off[pos + 1]]
+        if self._tok_common[pos]:
+            return ids, _KeyedLengths(ids, self._lengths)
+        return ids, None
+
+    def gram_postings(self, gram: str):
+        pos = self._grams.find(gram)
+        if pos < 0:
+            return ()
+        return self._gram_post[self._gram_off[pos]:self._gram_off[pos + 1]]
+
+    def name_lengths(self):
+        return np.frombuffer(self._lengths, dtype=np.uint32)
+
+
+def read_index_meta(path: str) -> dict | None:
+    try:
+        with open(path, "rb") as fh:
+            if fh.read(4) != MAGIC:
+                return None
+            meta_len = int.from_bytes(fh.read(4), "little")
+            return json.loads(fh.read(meta_len))
+    except (OSError, ValueError):
+        return None
+
+
+def open_index_file(path: str) -> ListSnapshot | None:
+    """Map an index file read-only and wrap it as a ``ListSnapshot``."""
+    meta = read_index_meta(path)
+    if not meta or meta.get("format") != FORMAT_VERSION or meta.get("byteorder") != sys.byteorder:
+        return None
+    if meta.get("normalizer") != NORMALIZER_VERSION:
+        # Names normalized by an older normalizer: re-parse instead
+        return None
+
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(mm)
+    header_len = 8 + int.from_bytes(view[4:8], "little")
+    data_start = header_len + (-header_len % _ALIGN)
+
+    def section(key: str, fmt: str | None = None) -> memoryview:
+        offset, length = meta["sections"][key]
+        part = view[data_start + offset:data_start + offset + length]
+        return part.cast(fmt) if fmt else part
+
+    index = MappedNameIndex(mm, view, section)
+    fields = {
+        f: (
+            section(f"field.{f}.codes", meta["code_types"][f]),
+            _StringTable(section(f"field.{f}.off", "I"), section(f"field.{f}.blob")),
+        )
+        for f in meta["fields"]
+    }
+    records = MappedRecords(index._names_table, _StringTable(section("name.off", "I"), section("name.blob")), fields)
+
+    return ListSnapshot(
+        source=meta["source"],
+        version=meta["version"],
+        records=records,
+        fetched_at=datetime.fromisoformat(meta["fetched_at"]),
+        etag=meta.get("etag"),
+        last_modified=meta.get("last_modified"),
+        index=index,
+    )
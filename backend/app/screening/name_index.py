@@ -0,0 +1,207 @@
+"""
+Name Blocking Index
+===================
+Inverted index from normalized name tokens and per-token character
+bigrams to positions in a list of names. Used to pick the candidates worth
+scoring with RapidFuzz ``token_set_ratio`` instead of scoring every row.
+
+Why the blocking is safe at a given ``min_score``
+  ``token_set_ratio`` is an indel ratio, 2·LCS / (len1 + len2), so two
+  strings can only reach ``min_score`` when the longer one is at most
+  ``2 / min_score - 1`` times the shorter one (≈1.44× at 82).
+
+  - Rare tokens: every name sharing a rare token with the query is a
+    candidate.
+  - Common tokens ("co", "ltd", "bank"…): a name sharing *only* common
+    tokens can still score 100 ("bank" vs "bank melli"), but only if it is
+    no longer than the length bound above. Common-token postings are kept
+    sorted by name length and cut at that bound, unless the query itself is
+    made up almost entirely of common tokens, in which case every holder of
+    the token can reach the threshold and the full posting list is used.
+  - Bigrams: a name sharing no token at all ("huawei" vs "huawey",
+    "interoarional" vs "international") scores ratio(A, B) of the two
+    sorted token strings. Every character an indel alignment deletes from
+    A breaks at most 2 of A's per-token bigrams and every inserted one at
+    most 1, so a name reaching ``min_score`` shares at least
+    ``distinct bigrams of A - max(2·deletions + insertions)`` of them
+    (``_min_shared_grams``) and lies within the length bound. Every name
+    meeting both is a candidate, at every query length; short queries,
+    where the bigram bound drops to zero, fall back to the length bound
+    alone. Counting is one ``bincount`` over the query's postings.
+"""
+
+import math
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Sequence
+
+import numpy as np
+
+
+DEFAULT_MIN_SCORE = 82
+COMMON_TOKEN_RATIO = 0.02     # tokens in >2% of names get length-bounded postings
+MIN_COMMON_DF = 50            # …but never treat a token as common below this df
+SCORE_SLACK = 0.5             # bounds are computed this far below min_score (float scores)
+
+
+def _token_bigrams(tokens: set[str]) -> set[str]:
+    """Bigrams of each space-padded token; independent of token order."""
+    grams: set[str] = set()
+    for token in tokens:
+        padded = f" {token} "
+        grams.update(padded[i:i + 2] for i in range(len(padded) - 1))
+    return grams
+
+
+def _token_set_len(tokens: set[str]) -> int:
+    """Length of the tokens joined the way token_set_ratio joins them."""
+    if not tokens:
+        return 0
+    return sum(len(t) for t in tokens) + len(tokens) - 1
+
+
+def _length_bound(length: int, min_score: float) -> int:
+    ratio = min_score / 100
+    return int(length * (2 / ratio - 1))
+
+
+def _length_range(length: int, min_score: float) -> tuple[float, float]:
+    """Lengths a string can have and still reach ``min_score`` against one of ``length``."""
+    ratio = (min_score - SCORE_SLACK) / 100
+    return length * ratio / (2 - ratio), length * (2 - ratio) / ratio
+
+
+def _min_shared_grams(length: int, distinct_grams: int, min_score: float) -> int:
+    """
+    Fewest distinct per-token bigrams a name sharing no token with a query
+    (joined length ``length``, ``distinct_grams`` bigrams) must share with
+    it to reach ``min_score``. An alignment with LCS l has ``length - l``
+    deletions and ``other - l`` insertions, l >= ratio·(length + other) / 2;
+    the bigram loss 2·del + ins is linear in ``other``, so its maximum is at
+    an end of the length range. A repeated bigram of the query is counted
+    once on both sides, which only lowers the bound.
+    """
+    ratio = (min_score - SCORE_SLACK) / 100
+    loss = max(
+        2 * length + other - 1.5 * ratio * (length + other)
+        for other in _length_range(length, min_score)
+    )
+    return math.ceil(distinct_grams - loss - 1e-9)
+
+
+class BlockingIndex:
+    """
+    Candidate selection shared by every index storage. Subclasses provide
+    ``names`` plus the posting lookups below.
+    """
+
+    names: Sequence[str]
+
+    def token_postings(self, token: str) -> tuple[Sequence[int], Sequence[int] | None] | None:
+        """(ids, None) for a rare token, (ids, lengths) for a common one, None if unknown."""
+        raise NotImplementedError
+
+    def gram_postings(self, gram: str) -> Sequence[int]:
+        raise NotImplementedError
+
+    def name_lengths(self) -> np.ndarray:
+        """Joined token-set length of every name, by position."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def candidates(self, query: str, min_score: float = DEFAULT_MIN_SCORE) -> list[int]:
+        """Sorted positions of names that can score ``min_score`` against ``query``."""
+        if not query:
+            return []
+
+        tokens = set(query.split())
+        found: set[int] = set()
+        common: dict[str, tuple] = {}
+
+        for token in tokens:
+            postings = self.token_postings(token)
+            if postings is None:
+                continue
+            ids, lengths = postings
+            if lengths is None:
+                found.update(ids)
+            else:
+                common[token] = postings
+
+        if common:
+            shared_len = _token_set_len(set(common))
+            rest_len = _token_set_len(tokens - set(common))
+            # Best case for a name sharing only the common tokens:
+            # ratio(sect, sect + rest) with the query's remaining tokens unshared
+            best = 100 if rest_len == 0 else 200 * shared_len / (2 * shared_len + 1 + rest_len)
+            bound = _length_bound(_token_set_len(tokens), min_score)
+
+            for ids, lengths in common.values():
+                if best >= min_score:
+                    found.update(ids)
+                else:
+                    found.update(ids[:bisect_right(lengths, bound)])
+
+        found.update(self._gram_candidates(tokens, min_score))
+        return sorted(found)
+
+    def _gram_candidates(self, tokens: set[str], min_score: float) -> list[int]:
+        """Names that can reach ``min_score`` without sharing a whole token with the query."""
+        length = _token_set_len(tokens)
+        grams = _token_bigrams(tokens)
+        shortest, longest = _length_range(length, min_score)
+
+        lengths = self.name_lengths()
+        mask = (lengths >= shortest) & (lengths <= longest)
+
+        need = _min_shared_grams(length, len(grams), min_score)
+        if need > 0:
+            postings = [np.asarray(self.gram_postings(g), dtype=np.uint32) for g in grams]
+            shared = np.bincount(np.concatenate(postings), minlength=len(lengths))
+            mask &= shared >= need
+
+        return np.flatnonzero(mask).tolist()
+
+
+class NameIndex(BlockingIndex):
+    """Token / bigram postings over a fixed sequence of normalized names."""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = names
+
+        token_postings: dict[str, list[int]] = defaultdict(list)
+        gram_postings: dict[str, list[int]] = defaultdict(list)
+        lengths: list[int] = []
+
+        for idx, name in enumerate(names):
+            tokens = set(name.split())
+            lengths.append(_token_set_len(tokens))
+            for token in tokens:
+                token_postings[token].append(idx)
+            for gram in _token_bigrams(tokens):
+                gram_postings[gram].append(idx)
+
+        max_df = max(MIN_COMMON_DF, int(len(names) * COMMON_TOKEN_RATIO))
+
+        self.lengths = lengths
+        self.tokens: dict[str, tuple[tuple, tuple | None]] = {}
+        for token, ids in token_postings.items():
+            if len(ids) > max_df:
+                ids.sort(key=lengths.__getitem__)
+                self.tokens[token] = (tuple(ids), tuple(lengths[i] for i in ids))
+            else:
+                self.tokens[token] = (tuple(ids), None)
+
+        self.grams = {k: np.array(v, dtype=np.uint32) for k, v in gram_postings.items()}
+        self._length_array = np.array(lengths, dtype=np.uint32)
+
+    def token_postings(self, token: str):
+        return self.tokens.get(token)
+
+    def gram_postings(self, gram: str):
+        return self.grams.get(gram, ())
+
+    def name_lengths(self):
+        return self._length_array
@@ -0,0 +1,173 @@
+"""
+Postgres Screening Engine
+=========================
+Alternative to the in-memory blocking index (``SCREENING_ENGINE=postgres``):
+the current version of each sanctions list is copied into ``sanctions_names``
+and candidates are retrieved by pg_trgm through the GIN trigram index, so
+API / Celery workers hold no per-list index at all.
+
+Candidate retrieval
+  ``normalized_name % :q`` (trigram similarity) catches typo and
+  transliteration variants; ``:q <% normalized_name`` (word similarity)
+  catches the query appearing inside a longer listed name. Both operators
+  use the GIN index. The best ``SCREENING_PG_CANDIDATES`` rows are then
+  re-scored with RapidFuzz by public_data_service, so hit scores are the
+  same as with the in-memory engine.
+
+  Trigram similarity is not token_set_ratio: a listed name that is a short
+  subset of a long query ("bank melli" vs "bank melli iran head office")
+  can score 100 but fall under the similarity threshold. The thresholds
+  below are a recall / speed trade-off; scripts/benchmark_screening.py
+  reports both.
+"""
+
+import os
+import threading
+
+from sqlalchemy import text
+
+from app.core.normalization import NORMALIZER_VERSION
+from app.database import engine
+from app.models import SanctionsName
+from app.screening.sanctions_store import ListSnapshot, SanctionsRecord
+
+
+PG_SIMILARITY_THRESHOLD = os.getenv("SCREENING_PG_SIMILARITY", "0.3")
+PG_WORD_SIMILARITY_THRESHOLD = os.getenv("SCREENING_PG_WORD_SIMILARITY", "0.6")
+PG_CANDIDATES = int(os.getenv("SCREENING_PG_CANDIDATES", "50"))
+_INSERT_BATCH = 5000
+
+_synced: dict[str, str] = {}   # list name -> version known to be in sanctions_names
+_sync_lock = threading.Lock()
+
+
+def _list_version(snapshot: ListSnapshot) -> str:
+    # Same payload under a new normalizer must still reload the rows
+    return f"{snapshot.version}:n{NORMALIZER_VERSION}"
+
+
+# =====================================================
+# LOADING
+# =====================================================
+
+def sync_snapshot(snapshot: ListSnapshot):
+    """Replace the rows of ``snapshot.source`` unless that version is already loaded."""
+    list_version = _list_version(snapshot)
+    if _synced.get(snapshot.source) == list_version:
+        return
+
+    with _sync_lock:
+        if _synced.get(snapshot.source) == list_version:
+            return
+
+        table = SanctionsName.__table__
+        with engine.begin() as conn:
+            # Serialize loaders across processes; the loser sees the new version
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:l))"), {"l": snapshot.source})
+            current = conn.execute(
+                text("SELECT list_version FROM sanctions_names WHERE list_name = :l LIMIT 1"),
+                {"l": snapshot.source},
+            ).scalar()
+
+            if current != list_version:
+                conn.execute(table.delete().where(table.c.list_name == snapshot.source))
+                batch: list[dict] = []
+                for record in snapshot.records:
+                    batch.append({
+                        "list_name": snapshot.source,
+                        "list_version": list_version,
+                        "name": record.name,
+                        "normalized_name": record.normalized_name,
+                        "details": record.details,
+                    })
+                    if len(batch) >= _INSERT_BATCH:
+                        conn.execute(table.insert(), batch)
+                        batch = []
+                if batch:
+                    conn.execute(table.insert(), batch)
+                print(f"Loaded {len(snapshot.records)} {snapshot.source} names into sanctions_names")
+
+        _synced[snapshot.source] = list_version
+
+
+def handle_list_update(old: ListSnapshot, new: ListSnapshot):
+    """sanctions_store listener: load a new list version as soon as it is published."""
+    try:
+        sync_snapshot(new)
+    except Exception as e:
+        print(f"⚠️  Could not load {new.source} into sanctions_names: {e}")
+
+
+# =====================================================
+# CANDIDATE RETRIEVAL
+# =====================================================
+
+def _set_thresholds(conn):
+    conn.execute(
+        text(
+            "SELECT set_config('pg_trgm.similarity_threshold', :s, true), "
+            "set_config('pg_trgm.word_similarity_threshold', :w, true)"
+        ),
+        {"s": PG_SIMILARITY_THRESHOLD, "w": PG_WORD_SIMILARITY_THRESHOLD},
+    )
+
+
+def _record(row) -> SanctionsRecord:
+    return SanctionsRecord(name=row.name, normalized_name=row.normalized_name, details=row.details or {})
+
+
+def candidates(snapshot: ListSnapshot, query: str) -> list[SanctionsRecord]:
+    """Top trigram candidates for one normalized name."""
+    if not query:
+        return []
+    sync_snapshot(snapshot)
+
+    with engine.begin() as conn:
+        _set_thresholds(conn)
+        rows = conn.execute(
+            text(
+                """
+                SELECT name, normalized_name, details
+                FROM sanctions_names
+                WHERE list_name = :list_name
+                  AND (normalized_name % :q OR :q <% normalized_name)
+                ORDER BY GREATEST(similarity(normalized_name, :q), word_similarity(:q, normalized_name)) DESC
+                LIMIT :k
+                """
+            ),
+            {"list_name": snapshot.source, "q": query, "k": PG_CANDIDATES},
+        )
+        return [_record(row) for row in rows]
+
+
+def candidates_bulk(snapshot: ListSnapshot, queries: list[str]) -> list[list[SanctionsRecord]]:
+    """Top trigram candidates for many normalized names in one round-trip."""
+    results: list[list[SanctionsRecord]] = [[] for _ in queries]
+    if not queries:
+        return results
+    sync_snapshot(snapshot)
+
+    with engine.begin() as conn:
+        _set_thresholds(conn)
+        rows = conn.execute(
+            text(
+                """
+                SELECT q.pos, s.name, s.normalized_name, s.details
+                FROM unnest(CAST(:queries AS text[])) WITH ORDINALITY AS q(query, pos)
+                CROSS JOIN LATERAL (
+                    SELECT name, normalized_name, details
+                    FROM sanctions_names
+                    WHERE list_name = :list_name
+                      AND (normalized_name % q.query OR q.query <% normalized_name)
+                    ORDER BY GREATEST(similarity(normalized_name, q.query),
+                                      word_similarity(q.query, normalized_name)) DESC
+                    LIMIT :k
+                ) s
+                """
+            ),
+            {"list_name": snapshot.source, "queries": list(queries), "k": PG_CANDIDATES},
+        )
+        for row in rows:
+            results[row.pos - 1].append(_record(row))
+
+    return results
@@ -0,0 +1,138 @@
+"""
+Screening Result Cache
+======================
+Caches per-list screening outcomes keyed by (list, list version, normalized
+name). Shared parents such as ``PARENT-32`` are screened once per list
+version instead of once per subsidiary per assessment.
+
+Because the list version is part of the key, a new list version can never
+serve an old result; superseded entries simply age out of the LRU (and
+expire in Redis). Redis keys also carry the normalizer version, since a list
+version is a hash of the raw payload.
+
+Tiers
+  1. In-process LRU (always on, ``SCREENING_CACHE_SIZE`` entries)
+  2. Redis (optional, enabled by ``SCREENING_CACHE_REDIS_URL``), shared by
+     every API and Celery worker process
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.normalization import NORMALIZER_VERSION
+
+
+SCREENING_CACHE_SIZE = int(os.getenv("SCREENING_CACHE_SIZE", "50000"))
+SCREENING_CACHE_REDIS_URL = os.getenv("SCREENING_CACHE_REDIS_URL", "")
+REDIS_TTL_SECONDS = 7 * 86400
+REDIS_RETRY_SECONDS = 60  # back off after a Redis error instead of failing every lookup
+
+
+class ScreeningResultCache:
+    def __init__(self, maxsize: int = SCREENING_CACHE_SIZE, redis_url: str = SCREENING_CACHE_REDIS_URL):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_down_until = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.redis_errors = 0
+
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+            except Exception as e:
+                print(f"⚠️  Screening cache Redis tier disabled: {e}")
+
+    # ---------------------------------------------
+    # Keys
+    # ---------------------------------------------
+    @staticmethod
+    def _redis_key(key: tuple) -> str:
+        list_name, version, normalized_name = key
+        digest = hashlib.sha1(f"{list_name}|{normalized_name}".encode("utf-8")).hexdigest()
+        return f"screening:n{NORMALIZER_VERSION}:{version[:16]}:{digest}"
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, e: Exception):
+        self.redis_errors += 1
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        print(f"⚠️  Screening cache Redis error: {e}")
+
+    # ---------------------------------------------
+    # Reads / writes
+    # ---------------------------------------------
+    def get(self, list_name: str, version: str, normalized_name: str) -> list[dict] | None:
+        key = (list_name, version, normalized_name)
+
+        with self._lock:
+            hits = self._entries.get(key)
+            if hits is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return [dict(h) for h in hits]
+
+        if self._redis_available():
+            try:
+                cached = self._redis.get(self._redis_key(key))
+            except Exception as e:
+                self._redis_failed(e)
+                cached = None
+            if cached is not None:
+                hits = json.loads(cached)
+                self._remember(key, hits)
+                with self._lock:
+                    self.hits += 1
+                    self.redis_hits += 1
+                return [dict(h) for h in hits]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, list_name: str, version: str, normalized_name: str, hits: list[dict]):
+        key = (list_name, version, normalized_name)
+        self._remember(key, hits)
+
+        if self._redis_available():
+            try:
+                self._redis.setex(self._redis_key(key), REDIS_TTL_SECONDS, json.dumps(hits))
+            except Exception as e:
+                self._redis_failed(e)
+
+    def _remember(self, key: tuple, hits: list[dict]):
+        with self._lock:
+            self._entries[key] = [dict(h) for h in hits]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "redis_enabled": self._redis is not None,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+        }
+
+
+# Process-wide instance used by public_data_service
+screening_cache = ScreeningResultCache()
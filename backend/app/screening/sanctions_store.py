@@ -0,0 +1,372 @@
+"""
+Sanctions Snapshot Store
+========================
+Process-wide, versioned in-memory copy of the public sanctions lists.
+
+Each registered list is downloaded and parsed once per process. Parsed
+records keep a pre-normalized name so screeners never re-normalize the list
+side. Snapshots are immutable; a refresh builds a new snapshot and swaps it
+in atomically, so readers never observe a half-loaded list.
+
+Refreshes use conditional GETs (ETag / Last-Modified) and run on a daemon
+thread once a snapshot is older than ``REFRESH_INTERVAL_SECONDS``, so the
+screening path only ever reads from memory after the first load.
+
+Every new list version is also written to ``SANCTIONS_INDEX_DIR`` as a
+compact binary index (see app.screening.index_file). Other processes map
+that file instead of downloading and parsing the list themselves.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, BinaryIO
+
+import requests
+
+from app.screening.name_index import NameIndex
+
+
+# ─── Config ───────────────────────────────────────────
+
+REFRESH_INTERVAL_SECONDS = int(os.getenv("SANCTIONS_REFRESH_SECONDS", "21600"))  # 6h
+FETCH_TIMEOUT = 30
+RETRY_BACKOFF_SECONDS = 60  # don't hammer a list that just failed to load
+_CHUNK_SIZE = 1 << 16
+_SPOOL_MAX_BYTES = 8 << 20  # keep small payloads in memory, spill the rest to disk
+MIN_RECORD_RATIO = 0.5  # refuse a new version with fewer than half the current records
+
+SANCTIONS_INDEX_DIR = os.getenv(
+    "SANCTIONS_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "sanctions_index"),
+)
+
+
+# =====================================================
+# SNAPSHOT TYPES
+# =====================================================
+
+@dataclass(frozen=True)
+class SanctionsRecord:
+    """One listed name, with its list-specific hit fields (program, country…)."""
+    name: str
+    normalized_name: str
+    details: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ListSnapshot:
+    source: str
+    version: str                      # sha256 of the raw payload
+    records: tuple
+    fetched_at: datetime
+    etag: str | None = None
+    last_modified: str | None = None
+    index: NameIndex | None = None    # token-blocking index over normalized names
+    parse_seconds: float = 0.0        # time spent parsing + indexing this version
+
+    @property
+    def age_seconds(self) -> float:
+        return (datetime.utcnow() - self.fetched_at).total_seconds()
+
+
+@dataclass(frozen=True)
+class SanctionsSource:
+    name: str
+    url: str
+    parser: Callable[[BinaryIO], list]
+    reference_url: str = ""
+    verify: bool = True
+    timeout: int = FETCH_TIMEOUT
+
+
+# =====================================================
+# STORE
+# =====================================================
+
+class SanctionsStore:
+    """
+    Holds the latest ``ListSnapshot`` per registered source.
+
+    ``get()`` blocks only for the very first load of a list; afterwards it
+    returns the current snapshot immediately and schedules a background
+    refresh when the snapshot has gone stale.
+    """
+
+    def __init__(self, refresh_interval: int = REFRESH_INTERVAL_SECONDS):
+        self.refresh_interval = refresh_interval
+        self._sources: dict[str, SanctionsSource] = {}
+        self._snapshots: dict[str, ListSnapshot] = {}
+        self._load_locks: dict[str, threading.Lock] = {}
+        self._refreshing: set[str] = set()
+        self._failed_at: dict[str, float] = {}
+        self._listeners: list[Callable[[ListSnapshot, ListSnapshot], None]] = []
+        self._ingest_listeners: list[Callable[[ListSnapshot], None]] = []
+        self._state_lock = threading.Lock()
+
+    # ---------------------------------------------
+    # Registration
+    # ---------------------------------------------
+    def register(self, source: SanctionsSource):
+        self._sources[source.name] = source
+        self._load_locks.setdefault(source.name, threading.Lock())
+
+    def sources(self) -> list[str]:
+        return list(self._sources)
+
+    def source(self, name: str) -> SanctionsSource:
+        return self._sources[name]
+
+    def subscribe(self, listener: Callable[[ListSnapshot, ListSnapshot], None]):
+        """Call ``listener(old, new)`` whenever this process swaps in a new list version."""
+        self._listeners.append(listener)
+
+    def on_ingest(self, listener: Callable[[ListSnapshot], None]):
+        """Call ``listener(snapshot)`` for every list payload this process downloads and parses."""
+        self._ingest_listeners.append(listener)
+
+    def _notify_ingest(self, snapshot: ListSnapshot):
+        for listener in self._ingest_listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"⚠️  sanctions_store ingest listener failed for {snapshot.source}: {e}")
+
+    def _notify(self, old: ListSnapshot | None, new: ListSnapshot | None):
+        if not old or not new or old.version == new.version:
+            return
+        for listener in self._listeners:
+            try:
+                listener(old, new)
+            except Exception as e:
+                print(f"⚠️  sanctions_store listener failed for {new.source}: {e}")
+
+    # ---------------------------------------------
+    # Shared on-disk index
+    # ---------------------------------------------
+    def index_path(self, name: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+        return os.path.join(SANCTIONS_INDEX_DIR, f"{slug}.sidx")
+
+    def _load_from_disk(self, name: str, newer_than: datetime | None = None) -> ListSnapshot | None:
+        """Map the shared index file if it exists (and is newer than ``newer_than``)."""
+        from app.screening.index_file import open_index_file, read_index_meta
+
+        path = self.index_path(name)
+        meta = read_index_meta(path)
+        if not meta:
+            return None
+        if newer_than and datetime.fromisoformat(meta["fetched_at"]) <= newer_than:
+            return None
+
+        try:
+            snapshot = open_index_file(path)
+        except Exception as e:
+            print(f"⚠️  sanctions_store could not map {path}: {e}")
+            return None
+
+        if snapshot:
+            self._snapshots[name] = snapshot
+        return snapshot
+
+    def _write_to_disk(self, snapshot: ListSnapshot) -> ListSnapshot:
+        """Persist a freshly parsed snapshot and switch to the mapped copy."""
+        from app.screening.index_file import open_index_file, write_index_file
+
+        path = self.index_path(snapshot.source)
+        try:
+            write_index_file(snapshot, path)
+            return open_index_file(path) or snapshot
+        except Exception as e:
+            print(f"⚠️  sanctions_store could not write {path}: {e}")
+            return snapshot
+
+    # ---------------------------------------------
+    # Reads
+    # ---------------------------------------------
+    def peek(self, name: str) -> ListSnapshot | None:
+        """Current snapshot without triggering any load or refresh."""
+        return self._snapshots.get(name)
+
+    def get(self, name: str) -> ListSnapshot | None:
+        snapshot = self._snapshots.get(name)
+
+        if snapshot is None:
+            if time.monotonic() - self._failed_at.get(name, float("-inf")) < RETRY_BACKOFF_SECONDS:
+                return None
+
+            # First load: map the shared index if another process wrote one,
+            # otherwise every concurrent caller waits on the same download
+            with self._load_locks[name]:
+                snapshot = self._snapshots.get(name)
+                if snapshot is None:
+                    snapshot = self._load_from_disk(name)
+                if snapshot is None:
+                    snapshot = self.refresh(name)
+                elif snapshot.age_seconds > self.refresh_interval:
+                    self._refresh_in_background(name)
+            return snapshot
+
+        if snapshot.age_seconds > self.refresh_interval:
+            self._refresh_in_background(name)
+
+        return snapshot
+
+    def versions(self) -> dict:
+        return {
+            name: {
+                "version": snap.version,
+                "record_count": len(snap.records),
+                "fetched_at": snap.fetched_at.isoformat(),
+            }
+            for name, snap in self._snapshots.items()
+        }
+
+    # ---------------------------------------------
+    # Refresh
+    # ---------------------------------------------
+    def refresh(self, name: str) -> ListSnapshot | None:
+        """
+        Conditionally re-download one list and swap in a new snapshot.
+        Network or parse failures, and payloads that parse to no records or
+        to far fewer than the current snapshot (truncated or error pages),
+        keep serving the previous snapshot.
+        """
+        source = self._sources[name]
+        current = self._snapshots.get(name)
+
+        # Another process may already have ingested a newer version
+        if current:
+            adopted = self._load_from_disk(name, newer_than=current.fetched_at)
+            if adopted:
+                self._notify(current, adopted)
+                if adopted.age_seconds <= self.refresh_interval:
+                    return adopted
+            current = self._snapshots.get(name)
+
+        headers = {}
+        if current and current.etag:
+            headers["If-None-Match"] = current.etag
+        if current and current.last_modified:
+            headers["If-Modified-Since"] = current.last_modified
+
+        try:
+            if not source.verify:
+                import urllib3
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+            with requests.get(
+                source.url,
+                headers=headers,
+                timeout=source.timeout,
+                verify=source.verify,
+                stream=True,
+            ) as resp:
+                if resp.status_code == 304 and current:
+                    return self._touch(current, current.etag, current.last_modified)
+
+                resp.raise_for_status()
+
+                with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as payload:
+                    digest = hashlib.sha256()
+                    for chunk in resp.iter_content(_CHUNK_SIZE):
+                        digest.update(chunk)
+                        payload.write(chunk)
+
+                    # Same bytes as the current version (server ignored the
+                    # conditional headers): keep the parsed records and index
+                    if current and digest.hexdigest() == current.version:
+                        return self._touch(current, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+
+                    payload.seek(0)
+                    started = time.perf_counter()
+                    records = tuple(source.parser(payload))
+                    self._check_record_count(name, records, current)
+                    index = NameIndex([r.normalized_name for r in records])
+                    parse_seconds = time.perf_counter() - started
+
+                snapshot = ListSnapshot(
+                    source=name,
+                    version=digest.hexdigest(),
+                    records=records,
+                    fetched_at=datetime.utcnow(),
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                    index=index,
+                    parse_seconds=parse_seconds,
+                )
+
+        except Exception as e:
+            print(f"⚠️  sanctions_store refresh failed for {name}: {e}")
+            self._failed_at[name] = time.monotonic()
+            return current
+
+        snapshot = self._write_to_disk(snapshot)
+        self._snapshots[name] = snapshot
+        print(
+            f"sanctions_store loaded {name}: {len(snapshot.records)} records "
+            f"(parse {parse_seconds:.2f}s, version {snapshot.version[:12]})"
+        )
+        self._notify_ingest(snapshot)
+        self._notify(current, snapshot)
+        return snapshot
+
+    @staticmethod
+    def _check_record_count(name: str, records: tuple, current: ListSnapshot | None):
+        if not records:
+            raise ValueError(f"{name} payload parsed to no records")
+        if current and len(records) < len(current.records) * MIN_RECORD_RATIO:
+            raise ValueError(
+                f"{name} payload parsed to {len(records)} records, "
+                f"current version has {len(current.records)}"
+            )
+
+    def _touch(self, current: ListSnapshot, etag: str | None, last_modified: str | None) -> ListSnapshot:
+        """Mark an unchanged list as freshly checked, reusing its parsed records and index."""
+        snapshot = ListSnapshot(
+            source=current.source,
+            version=current.version,
+            records=current.records,
+            fetched_at=datetime.utcnow(),
+            etag=etag,
+            last_modified=last_modified,
+            index=current.index,
+            parse_seconds=current.parse_seconds,
+        )
+        self._snapshots[current.source] = snapshot
+        return snapshot
+
+    def refresh_all(self) -> dict:
+        return {name: self.refresh(name) for name in self._sources}
+
+    def _refresh_in_background(self, name: str):
+        with self._state_lock:
+            if name in self._refreshing:
+                return
+            self._refreshing.add(name)
+
+        def _run():
+            try:
+                self.refresh(name)
+            finally:
+                with self._state_lock:
+                    self._refreshing.discard(name)
+
+        threading.Thread(target=_run, name=f"sanctions-refresh-{name}", daemon=True).start()
+
+    def warm(self):
+        """Load every registered list in the background (startup hook)."""
+        for name in self._sources:
+            if name not in self._snapshots:
+                threading.Thread(
+                    target=self.get, args=(name,), name=f"sanctions-warm-{name}", daemon=True
+                ).start()
+
+
+# Process-wide instance shared by every screener
+sanctions_store = SanctionsStore()
@@ -0,0 +1,135 @@
+"""
+Screening Daemon
+================
+One long-lived process per node that holds the warm sanctions snapshots and
+blocking indexes and answers screening requests for every API and Celery
+worker on that node over localhost HTTP.
+
+    python -m app.screening.server
+
+Workers point at it with ``SCREENING_SERVICE_URL=http://127.0.0.1:8765``;
+``public_data_service.check_sanctions_lists`` / ``check_sanctions_lists_bulk``
+then become thin clients and fall back to in-process screening if the daemon
+is unreachable. Because every worker asks the same process, all of them see
+the same list versions. The daemon also owns list refreshes: its refresh
+loop downloads new versions and reverse-screens their deltas, and the API
+scheduler skips its own refresh job when SCREENING_SERVICE_URL is set.
+
+Endpoints
+  POST /screen   {"names": [...]}  ->  {"results": [...]}   (input order)
+  GET  /status   list versions, snapshot ages and result cache stats
+"""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.screening.result_cache import screening_cache
+from app.screening.sanctions_store import sanctions_store
+from app.services.public_data_service import screen_names_local
+from app.services.reverse_screening_service import handle_list_update
+
+
+SCREENING_SERVER_HOST = os.getenv("SCREENING_SERVER_HOST", "127.0.0.1")
+SCREENING_SERVER_PORT = int(os.getenv("SCREENING_SERVER_PORT", "8765"))
+MAX_BATCH_NAMES = 50000
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+def _status() -> dict:
+    lists = {}
+    for name in sanctions_store.sources():
+        snapshot = sanctions_store.peek(name)
+        lists[name] = {
+            "version": snapshot.version if snapshot else None,
+            "records": len(snapshot.records) if snapshot else 0,
+            "age_seconds": round(snapshot.age_seconds) if snapshot else None,
+        }
+    return {"lists": lists, "result_cache": screening_cache.stats()}
+
+
+class ScreeningRequestHandler(BaseHTTPRequestHandler):
+    server_version = "SanctionsScreening/1.0"
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/status":
+            self._send_json(200, _status())
+        else:
+            self._send_json(404, {"detail": "Not found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/screen":
+            self._send_json(404, {"detail": "Not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(413 if length > 0 else 400, {"detail": "Invalid request body size"})
+            return
+
+        try:
+            names = json.loads(self.rfile.read(length))["names"]
+            if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+                raise ValueError("names must be a list of strings")
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"detail": f"Invalid screening request: {e}"})
+            return
+
+        if len(names) > MAX_BATCH_NAMES:
+            self._send_json(413, {"detail": f"At most {MAX_BATCH_NAMES} names per request"})
+            return
+
+        try:
+            results = screen_names_local(names)
+        except Exception as e:
+            print(f"⚠️  Screening request failed: {e}")
+            self._send_json(500, {"detail": "Screening failed"})
+            return
+
+        self._send_json(200, {"results": results})
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate the output of a busy node
+        pass
+
+
+def _refresh_loop(stop: threading.Event):
+    while not stop.wait(sanctions_store.refresh_interval):
+        try:
+            sanctions_store.refresh_all()
+        except Exception as e:
+            print(f"⚠️  Sanctions refresh failed: {e}")
+
+
+def serve(host: str = SCREENING_SERVER_HOST, port: int = SCREENING_SERVER_PORT):
+    # API processes pointed at this daemon leave list updates (and the
+    # reverse screening of their deltas) to it
+    sanctions_store.subscribe(handle_list_update)
+    sanctions_store.warm()
+
+    stop = threading.Event()
+    threading.Thread(target=_refresh_loop, args=(stop,), name="sanctions-refresh", daemon=True).start()
+
+    httpd = ThreadingHTTPServer((host, port), ScreeningRequestHandler)
+    httpd.daemon_threads = True
+    print(f"✅ Screening service listening on http://{host}:{port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    serve()
@@ -16,7 +16,19 @@ def generate_executive_brief(overall_status: str):
     return "No material compliance risk detected based on current screening data."
 
 
-def run_assessment(supplier_id: int, db: Session, user_id: int | None = None):
+def run_assessment(
+    supplier_id: int,
+    db: Session,
+    user_id: int | None = None,
+    section889_result: dict | None = None,
+    trigger: dict | None = None,
+):
+    """
+    ``section889_result`` may be precomputed by a batch caller
+    (evaluate_section_889_bulk); otherwise it is evaluated here.
+    ``trigger`` records what started a system-initiated assessment (e.g. a
+    sanctions list update) in the snapshot; user-initiated ones pass user_id.
+    """
     # ------------------------------------------------------------------
     # Fetch Supplier
     # ------------------------------------------------------------------
@@ -31,7 +43,8 @@ def run_assessment(supplier_id: int, db: Session, user_id: int | None = None):
     # Run Individual Risk Modules
     # ------------------------------------------------------------------
     sanctions_result = check_sanctions(supplier_id, db)
-    section889_result = evaluate_section_889(supplier_id, db)
+    if section889_result is None:
+        section889_result = evaluate_section_889(supplier_id, db)
     
     news_score = news_risk_signal(supplier_name)
     graph_risk = propagate_risk(supplier_name)
@@ -41,6 +54,7 @@ def run_assessment(supplier_id: int, db: Session, user_id: int | None = None):
     # ------------------------------------------------------------------
     context = {
         "sanctions_hit": sanctions_result and sanctions_result.get("overall_status") == "FAIL",
+        "sanctions_incomplete": sanctions_result.get("lists_skipped", []) if sanctions_result else [],
         "section_889_status": section889_result.get("section_889_status") if section889_result else "PASS",
         "section_889_reason": section889_result.get("reason") if section889_result else None,
         "country": supplier.country,
@@ -107,10 +121,13 @@ def run_assessment(supplier_id: int, db: Session, user_id: int | None = None):
             "section_889": section889_result,
             "news_signal_score": context["news_signal_score"],
             "graph_risk_score": context["graph_risk_score"],
+            "list_versions": sanctions_result.get("list_versions", {}) if sanctions_result else {},
+            "list_status": sanctions_result.get("list_status", {}) if sanctions_result else {},
             "reasons": reasons,
             "config_version": config_version,
             "factors": breakdown_factors,
-            "context_used": context
+            "context_used": context,
+            "trigger": trigger,
         }
     )
 
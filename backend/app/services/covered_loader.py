@@ -1,15 +1,28 @@
 import csv
 from sqlalchemy.orm import Session
 from app.models import CoveredEntity
+from app.services.entity_resolution_service import resolve_entities_bulk
+from app.services.list_version_service import record_covered_entity_version
+
+
+DEFAULT_DESIGNATION = "Section 889(a)(1)(A)"
 
 
 def load_covered_entities(db: Session, filepath: str):
     with open(filepath, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            existing = db.query(CoveredEntity).filter_by(name=row["name"]).first()
-            if not existing:
-                entity = CoveredEntity(name=row["name"])
-                db.add(entity)
-
-        db.commit()
+        rows = [row for row in csv.DictReader(csvfile) if row.get("name")]
+
+    entities = resolve_entities_bulk([row["name"] for row in rows], db)
+
+    existing = {
+        (c.entity_id, c.designation)
+        for c in db.query(CoveredEntity.entity_id, CoveredEntity.designation)
+    }
+    for row, (entity, _) in zip(rows, entities):
+        designation = row.get("designation") or DEFAULT_DESIGNATION
+        if (entity.id, designation) not in existing:
+            existing.add((entity.id, designation))
+            db.add(CoveredEntity(entity_id=entity.id, designation=designation))
+
+    db.commit()
+    record_covered_entity_version(db)
@@ -0,0 +1,231 @@
+"""
+Entity Resolution Cache
+=======================
+Process-local LRU from normalized name to the GlobalEntity it resolves to,
+so repeated resolutions of the same supplier / parent / subsidiary name
+(profile views, sanctions checks, nightly rescoring) skip the canonical and
+alias lookups and the Neo4j ``MERGE``.
+
+Entries are dropped when the entity or one of its aliases is inserted,
+updated or deleted through the ORM (see the mapper listeners at the bottom)
+and otherwise expire after ``ENTITY_CACHE_TTL_SECONDS``.
+
+Other workers see deletes and renames through a generation counter in
+``job_watermarks``: the listeners (and bulk statements such as entity
+merges, via ``bump_generation``) increment it in the same transaction, and
+every lookup compares it with the generation the cache was filled under,
+clearing the cache when it moved. A cached id therefore never outlives the
+committed delete of its entity.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models import GlobalEntity, GlobalEntityAlias, JobWatermark
+
+
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "20000"))
+ENTITY_CACHE_TTL_SECONDS = int(os.getenv("ENTITY_CACHE_TTL_SECONDS", "600"))
+GENERATION_KEY = "entity_cache_generation"
+
+# Entity columns a resolution depends on (graph sync state is not one of them)
+_RESOLUTION_FIELDS = ("canonical_name", "normalized_name", "entity_type", "country")
+_ALIAS_FIELDS = ("entity_id", "normalized_alias")
+
+
+@dataclass(frozen=True)
+class CachedEntity:
+    """Detached, read-only view of a GlobalEntity (what resolution callers use)."""
+    id: int
+    canonical_name: str
+    normalized_name: str
+    entity_type: str | None
+    country: str | None
+
+    @classmethod
+    def from_entity(cls, entity: GlobalEntity) -> "CachedEntity":
+        return cls(
+            id=entity.id,
+            canonical_name=entity.canonical_name,
+            normalized_name=entity.normalized_name,
+            entity_type=entity.entity_type,
+            country=entity.country,
+        )
+
+
+class EntityResolutionCache:
+    def __init__(self, maxsize: int = ENTITY_CACHE_SIZE, ttl: int = ENTITY_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()   # normalized name -> (entity, confidence, expires)
+        self._names_by_entity: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+        self._generation: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def sync(self, db: Session):
+        """Clear the cache if any process deleted or renamed entities since it was filled."""
+        generation = current_generation(db)
+        with self._lock:
+            if generation == self._generation:
+                return
+            if self._generation is not None:
+                self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._names_by_entity.clear()
+            self._generation = generation
+
+    def get(self, normalized_name: str) -> tuple[CachedEntity, float] | None:
+        with self._lock:
+            entry = self._entries.get(normalized_name)
+            if entry is not None and entry[2] > time.monotonic():
+                self._entries.move_to_end(normalized_name)
+                self.hits += 1
+                return entry[0], entry[1]
+            if entry is not None:
+                self._drop(normalized_name)
+            self.misses += 1
+            return None
+
+    def set(self, normalized_name: str, entity: CachedEntity, confidence: float):
+        with self._lock:
+            self._drop(normalized_name)
+            self._entries[normalized_name] = (entity, confidence, time.monotonic() + self.ttl)
+            self._names_by_entity.setdefault(entity.id, set()).add(normalized_name)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, normalized_name: str):
+        entry = self._entries.pop(normalized_name, None)
+        if entry is None:
+            return
+        names = self._names_by_entity.get(entry[0].id)
+        if names is not None:
+            names.discard(normalized_name)
+            if not names:
+                del self._names_by_entity[entry[0].id]
+
+    # ---------------------------------------------
+    # Invalidation
+    # ---------------------------------------------
+    def invalidate_names(self, normalized_names):
+        with self._lock:
+            for name in normalized_names:
+                if name in self._entries:
+                    self._drop(name)
+                    self.invalidations += 1
+
+    def invalidate_entities(self, entity_ids):
+        with self._lock:
+            for entity_id in entity_ids:
+                for name in list(self._names_by_entity.get(entity_id, ())):
+                    self._drop(name)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._names_by_entity.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "generation": self._generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+# Process-wide instance used by entity_resolution_service
+entity_cache = EntityResolutionCache()
+
+
+# =====================================================
+# CROSS-PROCESS GENERATION
+# =====================================================
+
+def current_generation(db: Session) -> int:
+    return db.query(JobWatermark.value).filter(JobWatermark.job_name == GENERATION_KEY).scalar() or 0
+
+
+def bump_generation(connection):
+    """Invalidate every process's cache once the caller's transaction commits."""
+    table = JobWatermark.__table__
+    now = datetime.utcnow()
+    updated = connection.execute(
+        table.update()
+        .where(table.c.job_name == GENERATION_KEY)
+        .values(value=table.c.value + 1, updated_at=now)
+    )
+    if not updated.rowcount:
+        connection.execute(table.insert().values(job_name=GENERATION_KEY, value=1, updated_at=now))
+
+
+def _changed(target, fields) -> bool:
+    state = inspect(target)
+    return any(state.attrs[f].history.has_changes() for f in fields)
+
+
+# =====================================================
+# ORM INVALIDATION HOOKS
+# =====================================================
+
+@event.listens_for(GlobalEntity, "after_insert")
+@event.listens_for(GlobalEntity, "after_update")
+@event.listens_for(GlobalEntity, "after_delete")
+def _entity_changed(mapper, connection, target: GlobalEntity):
+    # A new canonical name outranks any alias match cached under it
+    if target.id is not None:
+        entity_cache.invalidate_entities([target.id])
+    if target.normalized_name:
+        entity_cache.invalidate_names([target.normalized_name])
+
+
+@event.listens_for(GlobalEntityAlias, "after_insert")
+@event.listens_for(GlobalEntityAlias, "after_update")
+@event.listens_for(GlobalEntityAlias, "after_delete")
+def _alias_changed(mapper, connection, target: GlobalEntityAlias):
+    if target.entity_id is not None:
+        entity_cache.invalidate_entities([target.entity_id])
+    if target.normalized_alias:
+        entity_cache.invalidate_names([target.normalized_alias])
+
+
+# Other workers only need to hear about ids or names that stop resolving
+@event.listens_for(GlobalEntity, "after_delete")
+@event.listens_for(GlobalEntityAlias, "after_delete")
+def _row_deleted(mapper, connection, target):
+    bump_generation(connection)
+
+
+@event.listens_for(GlobalEntity, "before_update")
+def _stamp_resolution_change(mapper, connection, target: GlobalEntity):
+    # Lets entity clustering re-compare renamed / re-homed entities
+    if _changed(target, _RESOLUTION_FIELDS):
+        target.resolution_changed_at = datetime.utcnow()
+
+
+@event.listens_for(GlobalEntity, "after_update")
+def _entity_renamed(mapper, connection, target: GlobalEntity):
+    if _changed(target, _RESOLUTION_FIELDS):
+        bump_generation(connection)
+
+
+@event.listens_for(GlobalEntityAlias, "after_update")
+def _alias_moved(mapper, connection, target: GlobalEntityAlias):
+    if _changed(target, _ALIAS_FIELDS):
+        bump_generation(connection)
@@ -0,0 +1,351 @@
+"""
+Entity Clustering Service
+=========================
+Incremental de-duplication of ``global_entities``. Ingestion feeds, NLP
+extraction and supplier creation all create entities, so near-duplicates
+("Huawei Technologies Co Ltd", "HUAWEI TECHNOLOGIES") accumulate despite
+the fuzzy resolution tier.
+
+Each run clusters the entities created since the last id watermark and
+the entities whose name, type or country changed since the last change
+watermark (``resolution_changed_at``, stamped by the entity cache's ORM
+listener; both watermarks live in ``job_watermarks``) against the whole
+table:
+
+  1. Blocking: the fuzzy tier's candidate lookup (pg_trgm on Postgres,
+     the in-process NameIndex elsewhere), one batched call per batch
+  2. Scoring: ``match_score`` at the auto-link bar (FUZZY_AUTO_LINK_SCORE)
+  3. Union-find over the qualifying pairs; the oldest entity of a cluster
+     survives. Entities of different countries or types are never joined,
+     even transitively.
+  4. Merge: supplier links, sanctions hits, covered-entity designations,
+     aliases, match candidates and trust history move to the survivor in
+     bulk, merged names become aliases, the duplicates are deleted and
+     their Neo4j nodes are merged into the survivor's.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models import (
+    CoveredEntity,
+    EntityMatchCandidate,
+    GlobalEntity,
+    GlobalEntityAlias,
+    JobWatermark,
+    SanctionedEntity,
+    SupplierEntityLink,
+    TrustScoreHistory,
+)
+from app.graph.supplier_graph_service import merge_global_entity_nodes
+from app.services.entity_cache import bump_generation, entity_cache
+from app.services.list_version_service import record_covered_entity_version
+from app.services.entity_matching_service import (
+    FUZZY_AUTO_LINK_SCORE,
+    entity_candidates,
+    match_score,
+)
+
+
+CLUSTERING_JOB = "entity_clustering"
+CLUSTERING_CHANGES_JOB = "entity_clustering_changes"   # value: resolution_changed_at, epoch microseconds
+CLUSTER_BATCH_SIZE = 1000
+
+
+@dataclass
+class MergeDecision:
+    survivor_id: int
+    merged_ids: list[int]
+
+
+# =====================================================
+# UNION-FIND
+# =====================================================
+
+def _same(a: str | None, b: str | None) -> bool:
+    return not a or not b or a.strip().lower() == b.strip().lower()
+
+
+class _UnionFind:
+    """Disjoint sets of entity ids; the smallest (oldest) id is each set's root."""
+
+    def __init__(self):
+        self._parent: dict[int, int] = {}
+        self._profile: dict[int, tuple[str | None, str | None]] = {}  # root -> (entity_type, country)
+
+    def add(self, entity_id: int, entity_type: str | None, country: str | None):
+        if entity_id not in self._parent:
+            self._parent[entity_id] = entity_id
+            self._profile[entity_id] = (entity_type, country)
+
+    def find(self, entity_id: int) -> int:
+        root = entity_id
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[entity_id] != root:
+            self._parent[entity_id], entity_id = root, self._parent[entity_id]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """Join the sets of ``a`` and ``b`` unless their types or countries conflict."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return True
+
+        (type_a, country_a), (type_b, country_b) = self._profile[ra], self._profile[rb]
+        if not _same(type_a, type_b) or not _same(country_a, country_b):
+            return False
+
+        root, child = min(ra, rb), max(ra, rb)
+        self._parent[child] = root
+        self._profile[root] = (type_a or type_b, country_a or country_b)
+        del self._profile[child]
+        return True
+
+    def clusters(self) -> list[MergeDecision]:
+        members: dict[int, list[int]] = {}
+        for entity_id in self._parent:
+            members.setdefault(self.find(entity_id), []).append(entity_id)
+        return [
+            MergeDecision(survivor_id=root, merged_ids=sorted(i for i in ids if i != root))
+            for root, ids in sorted(members.items())
+            if len(ids) > 1
+        ]
+
+
+# =====================================================
+# CLUSTERING
+# =====================================================
+
+def _cluster_batch(batch: list, db: Session) -> list[MergeDecision]:
+    per_name = entity_candidates([r.normalized_name for r in batch], db)
+
+    candidate_ids = {entity_id for candidates in per_name for entity_id, _ in candidates}
+    profiles = {
+        r.id: r
+        for r in db.query(GlobalEntity.id, GlobalEntity.entity_type, GlobalEntity.country)
+        .filter(GlobalEntity.id.in_(candidate_ids))
+    } if candidate_ids else {}
+
+    uf = _UnionFind()
+    for row, candidates in zip(batch, per_name):
+        uf.add(row.id, row.entity_type, row.country)
+        scored = [
+            (100.0 if name == row.normalized_name else match_score(row.normalized_name, name), entity_id)
+            for entity_id, name in candidates
+            if entity_id != row.id and entity_id in profiles
+        ]
+        # Best (then oldest) match first, so a conflicting weaker pair cannot claim the set
+        for score, entity_id in sorted(scored, key=lambda m: (-m[0], m[1])):
+            if score < FUZZY_AUTO_LINK_SCORE:
+                break
+            profile = profiles[entity_id]
+            uf.add(entity_id, profile.entity_type, profile.country)
+            uf.union(row.id, entity_id)
+
+    return uf.clusters()
+
+
+# =====================================================
+# MERGING
+# =====================================================
+
+def _repoint(db: Session, model, survivor_of: dict[int, int], unique_on: tuple[str, ...] = ()) -> int:
+    """
+    Move ``model`` rows from merged entities to their survivor in bulk.
+    Rows that would duplicate one the survivor already has on ``unique_on``
+    are deleted instead. Returns the number of rows moved or deleted.
+    """
+    entity_ids = set(survivor_of) | set(survivor_of.values())
+    rows = (
+        db.query(model.id, model.entity_id, *[getattr(model, c) for c in unique_on])
+        .filter(model.entity_id.in_(entity_ids))
+        .order_by(model.id)
+        .all()
+    )
+
+    seen: set[tuple] = set()
+    updates: list[dict] = []
+    duplicates: list[int] = []
+    # Rows already on the survivor claim their keys first
+    for r in sorted(rows, key=lambda r: r.entity_id in survivor_of):
+        target = survivor_of.get(r.entity_id, r.entity_id)
+        key = (target, *(getattr(r, c) for c in unique_on)) if unique_on else (r.id,)
+        if key in seen:
+            duplicates.append(r.id)
+            continue
+        seen.add(key)
+        if target != r.entity_id:
+            updates.append({"id": r.id, "entity_id": target})
+
+    if updates:
+        db.bulk_update_mappings(model, updates)
+    if duplicates:
+        db.query(model).filter(model.id.in_(duplicates)).delete(synchronize_session=False)
+    return len(updates) + len(duplicates)
+
+
+def _repoint_match_candidates(db: Session, survivor_of: dict[int, int]):
+    rows = (
+        db.query(EntityMatchCandidate)
+        .filter(
+            EntityMatchCandidate.entity_id.in_(survivor_of)
+            | EntityMatchCandidate.candidate_entity_id.in_(survivor_of)
+        )
+        .all()
+    )
+    now = datetime.utcnow()
+    for candidate in rows:
+        candidate.entity_id = survivor_of.get(candidate.entity_id, candidate.entity_id)
+        candidate.candidate_entity_id = survivor_of.get(candidate.candidate_entity_id, candidate.candidate_entity_id)
+        # The queued pair has just been merged
+        if candidate.entity_id == candidate.candidate_entity_id and candidate.status == "PENDING":
+            candidate.status = "ACCEPTED"
+            candidate.reviewed_at = now
+
+
+def apply_merges(decisions: list[MergeDecision], db: Session) -> int:
+    """Merge each decision's entities into its survivor; returns the number of entities removed."""
+    survivor_of = {m: d.survivor_id for d in decisions for m in d.merged_ids}
+    if not survivor_of:
+        return 0
+
+    entities = {
+        e.id: e
+        for e in db.query(GlobalEntity.id, GlobalEntity.canonical_name, GlobalEntity.normalized_name)
+        .filter(GlobalEntity.id.in_(set(survivor_of) | set(survivor_of.values())))
+    }
+
+    _repoint(db, SupplierEntityLink, survivor_of, ("supplier_id",))
+    _repoint(db, SanctionedEntity, survivor_of, ("source", "program"))
+    covered_changed = _repoint(db, CoveredEntity, survivor_of, ("designation", "source"))
+    _repoint(db, GlobalEntityAlias, survivor_of, ("normalized_alias",))
+    _repoint(db, TrustScoreHistory, survivor_of)
+    _repoint_match_candidates(db, survivor_of)
+
+    # Merged names keep resolving to the survivor
+    known = {
+        (a.entity_id, a.normalized_alias)
+        for a in db.query(GlobalEntityAlias.entity_id, GlobalEntityAlias.normalized_alias)
+        .filter(GlobalEntityAlias.entity_id.in_(set(survivor_of.values())))
+    }
+    for merged_id, survivor_id in survivor_of.items():
+        merged, survivor = entities[merged_id], entities[survivor_id]
+        key = (survivor_id, merged.normalized_name)
+        if merged.normalized_name != survivor.normalized_name and key not in known:
+            known.add(key)
+            db.add(GlobalEntityAlias(
+                entity_id=survivor_id,
+                alias=merged.canonical_name,
+                normalized_alias=merged.normalized_name,
+            ))
+
+    db.flush()
+    db.query(GlobalEntity).filter(GlobalEntity.id.in_(survivor_of)).delete(synchronize_session=False)
+    # Bulk statements bypass the cache's ORM hooks; other workers drop their
+    # caches when the delete commits
+    bump_generation(db.connection())
+    db.commit()
+
+    entity_cache.invalidate_entities(entities)
+    entity_cache.invalidate_names(entities[m].normalized_name for m in survivor_of)
+    if covered_changed:
+        record_covered_entity_version(db)
+
+    # A node shared with a surviving entity of the same name stays
+    merged_names = {entities[m].canonical_name for m in survivor_of}
+    still_used = {
+        r.canonical_name
+        for r in db.query(GlobalEntity.canonical_name).filter(GlobalEntity.canonical_name.in_(merged_names))
+    }
+    graph_rows = [
+        {"old": entities[m].canonical_name, "new": entities[s].canonical_name}
+        for m, s in survivor_of.items()
+        if entities[m].canonical_name not in still_used
+    ]
+    try:
+        merge_global_entity_nodes(graph_rows)
+    except Exception as e:
+        # RESOLVES_TO edges are repaired by reconcile_graph; stale nodes remain
+        print(f"⚠️ Graph merge failed for {len(graph_rows)} entities: {e}")
+
+    for d in decisions:
+        print(f"Merged entities {d.merged_ids} into {d.survivor_id} ({entities[d.survivor_id].canonical_name})")
+    return len(survivor_of)
+
+
+# =====================================================
+# SCHEDULED JOB
+# =====================================================
+
+def _watermark(db: Session, job_name: str = CLUSTERING_JOB) -> JobWatermark:
+    watermark = db.query(JobWatermark).filter(JobWatermark.job_name == job_name).first()
+    if not watermark:
+        watermark = JobWatermark(job_name=job_name, value=0)
+        db.add(watermark)
+        db.commit()
+    return watermark
+
+
+_ENTITY_COLUMNS = (GlobalEntity.id, GlobalEntity.normalized_name, GlobalEntity.entity_type, GlobalEntity.country)
+
+
+def _cluster_changed_entities(db: Session) -> int:
+    """Re-cluster entities renamed or re-homed since the last run; returns entities merged."""
+    watermark = _watermark(db, CLUSTERING_CHANGES_JOB)
+    since = datetime.utcfromtimestamp(watermark.value / 1_000_000)
+    cutoff = datetime.utcnow()
+    merged = 0
+    last_id = 0
+
+    while True:
+        batch = (
+            db.query(*_ENTITY_COLUMNS)
+            .filter(
+                GlobalEntity.resolution_changed_at > since,
+                GlobalEntity.resolution_changed_at <= cutoff,
+                GlobalEntity.id > last_id,
+            )
+            .order_by(GlobalEntity.id)
+            .limit(CLUSTER_BATCH_SIZE)
+            .all()
+        )
+        if not batch:
+            break
+
+        # Entities merged away by an earlier batch are simply not found again
+        merged += apply_merges(_cluster_batch(batch, db), db)
+        last_id = batch[-1].id
+
+    watermark.value = int((cutoff - datetime(1970, 1, 1)).total_seconds() * 1_000_000)
+    db.commit()
+    return merged
+
+
+def cluster_new_entities(db: Session) -> int:
+    """
+    Cluster entities created since the last run, then entities changed since
+    the last run, into the existing set; returns entities merged.
+    """
+    watermark = _watermark(db)
+    merged = 0
+
+    while True:
+        batch = (
+            db.query(*_ENTITY_COLUMNS)
+            .filter(GlobalEntity.id > watermark.value)
+            .order_by(GlobalEntity.id)
+            .limit(CLUSTER_BATCH_SIZE)
+            .all()
+        )
+        if not batch:
+            break
+
+        merged += apply_merges(_cluster_batch(batch, db), db)
+
+        watermark.value = batch[-1].id
+        db.commit()
+
+    return merged + _cluster_changed_entities(db)
@@ -0,0 +1,168 @@
+"""
+Fuzzy Entity Matching
+=====================
+Third resolution tier, after the exact canonical and alias lookups: finds
+an existing GlobalEntity that is a near-duplicate of a new name
+("Huawei Technologies Co Ltd" vs "Huawei Technologies") so it can be linked
+as an alias instead of becoming a separate entity.
+
+Candidate blocking
+  - Postgres: pg_trgm ``%`` on ``global_entities.normalized_name`` through
+    the GIN trigram index, best ``FUZZY_CANDIDATES`` per name.
+  - Other databases: in-process NameIndex segments (app.screening.name_index)
+    over every normalized name. New rows are indexed as a new segment and
+    equal-sized segments are merged, so seeding n entities costs
+    O(n log n) index building rather than a rebuild per call; deletes and
+    renames (the entity cache generation) rebuild from scratch.
+
+Scoring
+  Mean of RapidFuzz ``token_set_ratio`` and ``token_sort_ratio``.
+  token_set alone scores 100 whenever one name's tokens are a subset of the
+  other's ("bank" vs "bank of china"); averaging with token_sort keeps
+  extra legal-form tokens cheap ("co ltd") but extra distinctive tokens
+  expensive.
+"""
+
+import os
+import threading
+
+from rapidfuzz import fuzz
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models import GlobalEntity
+from app.screening.name_index import NameIndex
+from app.services.entity_cache import current_generation
+
+
+FUZZY_AUTO_LINK_SCORE = float(os.getenv("ENTITY_FUZZY_AUTO_LINK", "92"))   # link as alias
+FUZZY_REVIEW_SCORE = float(os.getenv("ENTITY_FUZZY_REVIEW", "85"))         # queue for review
+FUZZY_CONFIDENCE = 0.8        # link confidence for an auto-linked fuzzy match (alias = 0.9)
+FUZZY_CANDIDATES = 20
+PG_SIMILARITY_THRESHOLD = "0.3"
+
+
+def match_score(a: str, b: str) -> float:
+    return (fuzz.token_set_ratio(a, b) + fuzz.token_sort_ratio(a, b)) / 2
+
+
+# =====================================================
+# CANDIDATE BLOCKING
+# =====================================================
+
+class _EntityNameIndex:
+    """NameIndex segments over global_entities, oldest ids first."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._max_id = 0
+        self._segments: list[tuple[list[int], NameIndex]] = []
+
+    def invalidate(self):
+        """Rebuild from the table on the next lookup."""
+        with self._lock:
+            self._generation = None
+
+    def _refresh(self, db: Session):
+        generation = current_generation(db)
+        if generation != self._generation:
+            # Rows were deleted or renamed: segments may name entities that are gone
+            self._segments = []
+            self._max_id = 0
+            self._generation = generation
+
+        rows = (
+            db.query(GlobalEntity.id, GlobalEntity.normalized_name)
+            .filter(GlobalEntity.id > self._max_id)
+            .order_by(GlobalEntity.id)
+            .all()
+        )
+        if not rows:
+            return
+
+        ids = [r.id for r in rows]
+        names = [r.normalized_name for r in rows]
+        while self._segments and len(self._segments[-1][0]) <= len(ids):
+            older_ids, older = self._segments.pop()
+            ids = older_ids + ids
+            names = list(older.names) + names
+        self._segments.append((ids, NameIndex(names)))
+        self._max_id = rows[-1].id
+
+    def candidates(self, normalized_names: list[str], db: Session) -> list[list[tuple[int, str]]]:
+        with self._lock:
+            self._refresh(db)
+            segments = list(self._segments)
+
+        # token_set_ratio >= the blended score, so blocking at the review
+        # threshold cannot drop a candidate that would have qualified
+        results: list[list[tuple[int, str]]] = [[] for _ in normalized_names]
+        for ids, index in segments:
+            for found, norm in zip(results, normalized_names):
+                found.extend((ids[i], index.names[i]) for i in index.candidates(norm, FUZZY_REVIEW_SCORE))
+        return results
+
+
+_memory_index = _EntityNameIndex()
+
+
+def _pg_candidates(normalized_names: list[str], db: Session) -> list[list[tuple[int, str]]]:
+    db.execute(text("SELECT set_config('pg_trgm.similarity_threshold', :t, true)"), {"t": PG_SIMILARITY_THRESHOLD})
+    rows = db.execute(
+        text(
+            """
+            SELECT q.pos, g.id, g.normalized_name
+            FROM unnest(CAST(:names AS text[])) WITH ORDINALITY AS q(name, pos)
+            CROSS JOIN LATERAL (
+                SELECT id, normalized_name
+                FROM global_entities
+                WHERE normalized_name % q.name
+                ORDER BY similarity(normalized_name, q.name) DESC
+                LIMIT :k
+            ) g
+            """
+        ),
+        {"names": normalized_names, "k": FUZZY_CANDIDATES},
+    )
+
+    results: list[list[tuple[int, str]]] = [[] for _ in normalized_names]
+    for pos, entity_id, normalized_name in rows:
+        results[pos - 1].append((entity_id, normalized_name))
+    return results
+
+
+def entity_candidates(normalized_names: list[str], db: Session) -> list[list[tuple[int, str]]]:
+    """Blocked (entity_id, normalized_name) candidates per name, exact matches included."""
+    if db.get_bind().dialect.name == "postgresql":
+        return _pg_candidates(normalized_names, db)
+    return _memory_index.candidates(normalized_names, db)
+
+
+# =====================================================
+# MATCHING
+# =====================================================
+
+def fuzzy_match_bulk(normalized_names: list[str], db: Session) -> dict[str, tuple[int, float]]:
+    """
+    Best existing entity per name scoring at least FUZZY_REVIEW_SCORE:
+    normalized name -> (entity_id, score). Names without one are omitted.
+    """
+    names = [n for n in dict.fromkeys(normalized_names) if n]
+    if not names:
+        return {}
+
+    per_name = entity_candidates(names, db)
+
+    matches: dict[str, tuple[int, float]] = {}
+    for norm, candidates in zip(names, per_name):
+        best = None
+        for entity_id, candidate in candidates:
+            if candidate == norm:
+                continue
+            score = match_score(norm, candidate)
+            if score >= FUZZY_REVIEW_SCORE and (best is None or score > best[1]):
+                best = (entity_id, score)
+        if best:
+            matches[norm] = best
+    return matches
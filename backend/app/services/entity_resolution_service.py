@@ -1,31 +1,37 @@
-import re
 from sqlalchemy.orm import Session
 
+from app.core.normalization import normalize_name, normalize_names
+
 from app.models import (
     GlobalEntity,
     GlobalEntityAlias,
     SupplierEntityLink,
+    EntityMatchCandidate,
+)
+from app.services.graph_sync_service import (
+    sync_entity_node,
+    sync_entity_nodes_bulk,
+    sync_supplier_link,
+    link_graph_hash,
 )
-from app.graph.supplier_graph_service import (
-    create_global_entity_node,
-    link_supplier_to_entity,
+from app.services.entity_cache import CachedEntity, entity_cache
+from app.services.entity_matching_service import (
+    FUZZY_AUTO_LINK_SCORE,
+    FUZZY_CONFIDENCE,
+    fuzzy_match_bulk,
 )
 
 
 # =====================================================
-# NORMALIZATION
+# RESOLVE OR CREATE GLOBAL ENTITY
 # =====================================================
 
-def normalize(name: str) -> str:
-    name = name.lower().strip()
-    name = re.sub(r"[^\w\s]", "", name)
-    name = re.sub(r"\s+", " ", name)
-    return name
-
+def _auto_link(score: float, candidate: GlobalEntity, country: str | None) -> bool:
+    # A near-identical name in another country is a review case, not an alias
+    if country and candidate.country and country.strip().lower() != candidate.country.strip().lower():
+        return False
+    return score >= FUZZY_AUTO_LINK_SCORE
 
-# =====================================================
-# RESOLVE OR CREATE GLOBAL ENTITY
-# =====================================================
 
 def resolve_or_create_entity(
     name: str,
@@ -33,8 +39,32 @@ def resolve_or_create_entity(
     entity_type: str = "COMPANY",
     country: str = None,
 ):
-    normalized_name = normalize(name)
+    """
+    Returns (entity, confidence). The entity is a detached ``CachedEntity``;
+    repeat resolutions of a name are served from the process-local cache
+    with a single generation read instead of the canonical / alias lookups
+    and the Neo4j write.
+    """
+    normalized_name = normalize_name(name)
+
+    entity_cache.sync(db)
+    cached = entity_cache.get(normalized_name)
+    if cached:
+        return cached
+
+    entity, confidence = _resolve_or_create_uncached(name, normalized_name, db, entity_type, country)
+    resolved = CachedEntity.from_entity(entity)
+    entity_cache.set(normalized_name, resolved, confidence)
+    return resolved, confidence
+
 
+def _resolve_or_create_uncached(
+    name: str,
+    normalized_name: str,
+    db: Session,
+    entity_type: str,
+    country: str | None,
+):
     # ---------------------------------------------
     # 1️⃣ Canonical match
     # ---------------------------------------------
@@ -45,12 +75,8 @@ def resolve_or_create_entity(
     )
 
     if entity:
-        # Ensure graph node exists (idempotent MERGE)
-        create_global_entity_node(
-            canonical_name=entity.canonical_name,
-            entity_type=entity.entity_type,
-            country=entity.country,
-        )
+        # Graph write only if the node is new / changed since the last sync
+        sync_entity_node(entity, db)
         return entity, 1.0
 
     # ---------------------------------------------
@@ -65,16 +91,23 @@ def resolve_or_create_entity(
     if alias:
         entity = alias.entity
 
-        # Ensure graph node exists
-        create_global_entity_node(
-            canonical_name=entity.canonical_name,
-            entity_type=entity.entity_type,
-            country=entity.country,
-        )
+        sync_entity_node(entity, db)
         return entity, 0.9
 
     # ---------------------------------------------
-    # 3️⃣ Create new canonical entity
+    # 3️⃣ Fuzzy match: near-duplicate of an existing entity
+    # ---------------------------------------------
+    match = fuzzy_match_bulk([normalized_name], db).get(normalized_name)
+    if match:
+        candidate = db.get(GlobalEntity, match[0])
+        if _auto_link(match[1], candidate, country):
+            db.add(GlobalEntityAlias(entity_id=candidate.id, alias=name, normalized_alias=normalized_name))
+            db.commit()
+            sync_entity_node(candidate, db)
+            return candidate, FUZZY_CONFIDENCE
+
+    # ---------------------------------------------
+    # 4️⃣ Create new canonical entity
     # ---------------------------------------------
     entity = GlobalEntity(
         canonical_name=name,
@@ -84,19 +117,144 @@ def resolve_or_create_entity(
     )
 
     db.add(entity)
+    db.flush()
+
+    # Borderline fuzzy match: keep the new entity, queue the pair for review
+    if match:
+        db.add(EntityMatchCandidate(
+            name=name,
+            normalized_name=normalized_name,
+            entity_id=entity.id,
+            candidate_entity_id=match[0],
+            score=round(match[1], 2),
+        ))
+
     db.commit()
     db.refresh(entity)
 
     # Sync to Neo4j (MERGE = safe)
-    create_global_entity_node(
-        canonical_name=entity.canonical_name,
-        entity_type=entity.entity_type,
-        country=entity.country,
-    )
+    sync_entity_node(entity, db)
 
     return entity, 1.0
 
 
+# =====================================================
+# BULK RESOLVE OR CREATE
+# =====================================================
+
+def resolve_entities_bulk(
+    names: list[str],
+    db: Session,
+    entity_type: str = "COMPANY",
+    country: str | dict | None = None,
+) -> list[tuple[CachedEntity, float]]:
+    """
+    Batched ``resolve_or_create_entity``: one canonical ``IN`` query, one
+    alias ``IN`` query, one batched fuzzy-candidate lookup, one insert
+    transaction for the missing entities and one graph write for new /
+    changed nodes, whatever the number of names.
+
+    ``country`` is either applied to every created entity or a mapping of
+    input name -> country. Returns (entity, confidence) per input name, in
+    input order.
+    """
+    countries = country if isinstance(country, dict) else {}
+    default_country = None if isinstance(country, dict) else country
+
+    normalized = normalize_names(names)
+    resolved: dict[str, tuple[CachedEntity, float]] = {}
+
+    entity_cache.sync(db)
+    pending: dict[str, str] = {}  # normalized -> first input name
+    for name, norm in zip(names, normalized):
+        if norm in resolved or norm in pending:
+            continue
+        cached = entity_cache.get(norm)
+        if cached:
+            resolved[norm] = cached
+        else:
+            pending[norm] = name
+
+    if pending:
+        found: dict[str, tuple[GlobalEntity, float]] = {}
+
+        # 1️⃣ Canonical matches (lowest id wins, as with a single lookup)
+        for entity in (
+            db.query(GlobalEntity)
+            .filter(GlobalEntity.normalized_name.in_(list(pending)))
+            .order_by(GlobalEntity.id.desc())
+        ):
+            found[entity.normalized_name] = (entity, 1.0)
+
+        # 2️⃣ Alias matches
+        remaining = [n for n in pending if n not in found]
+        if remaining:
+            for alias, entity in (
+                db.query(GlobalEntityAlias, GlobalEntity)
+                .join(GlobalEntity, GlobalEntityAlias.entity_id == GlobalEntity.id)
+                .filter(GlobalEntityAlias.normalized_alias.in_(remaining))
+                .order_by(GlobalEntityAlias.id.desc())
+            ):
+                found[alias.normalized_alias] = (entity, 0.9)
+
+        # 3️⃣ Fuzzy matches: auto-link as aliases, keep borderline ones for review
+        remaining = [n for n in pending if n not in found]
+        fuzzy = fuzzy_match_bulk(remaining, db) if remaining else {}
+        borderline: dict[str, tuple[int, float]] = {}
+        if fuzzy:
+            candidates = {
+                e.id: e
+                for e in db.query(GlobalEntity).filter(GlobalEntity.id.in_({m[0] for m in fuzzy.values()}))
+            }
+            for norm, (entity_id, score) in fuzzy.items():
+                candidate = candidates[entity_id]
+                if _auto_link(score, candidate, countries.get(pending[norm], default_country)):
+                    db.add(GlobalEntityAlias(entity_id=entity_id, alias=pending[norm], normalized_alias=norm))
+                    found[norm] = (candidate, FUZZY_CONFIDENCE)
+                else:
+                    borderline[norm] = (entity_id, score)
+
+        # 4️⃣ Create the rest in one transaction
+        created = [
+            GlobalEntity(
+                canonical_name=pending[norm],
+                normalized_name=norm,
+                entity_type=entity_type,
+                country=countries.get(pending[norm], default_country),
+            )
+            for norm in pending
+            if norm not in found
+        ]
+        if created:
+            db.add_all(created)
+            db.flush()
+            for entity in created:
+                found[entity.normalized_name] = (entity, 1.0)
+
+            db.add_all([
+                EntityMatchCandidate(
+                    name=pending[norm],
+                    normalized_name=norm,
+                    entity_id=found[norm][0].id,
+                    candidate_entity_id=entity_id,
+                    score=round(score, 2),
+                )
+                for norm, (entity_id, score) in borderline.items()
+            ])
+
+        sync_entity_nodes_bulk([entity for entity, _ in found.values()])
+
+        # Snapshot before commit expires the loaded rows
+        fresh = {norm: (CachedEntity.from_entity(e), c) for norm, (e, c) in found.items()}
+        db.commit()
+
+        for norm, (entity, confidence) in fresh.items():
+            resolved[norm] = (entity, confidence)
+            entity_cache.set(norm, entity, confidence)
+
+    return [resolved[norm] for norm in normalized]
+
+
 # =====================================================
 # RESOLVE SUPPLIER → ENTITY (STRICT 1:1 ENFORCED)
 # =====================================================
@@ -106,7 +264,7 @@ def resolve_supplier_entity(supplier, db: Session):
     Enforces:
     - Each supplier resolves to exactly one canonical GlobalEntity
     - SQL link always exists
-    - Graph RESOLVES_TO relationship always exists
+    - Graph RESOLVES_TO relationship exists (written only when it changed)
     - Idempotent (safe to call multiple times)
     """
 
@@ -118,7 +276,8 @@ def resolve_supplier_entity(supplier, db: Session):
     )
 
     # ---------------------------------------------
-    # Ensure exactly ONE link per supplier
+    # Fast path: already linked to the right entity
+    # (one indexed query, no writes)
     # ---------------------------------------------
     existing_links = (
         db.query(SupplierEntityLink)
@@ -126,41 +285,39 @@ def resolve_supplier_entity(supplier, db: Session):
         .all()
     )
 
-    # Remove incorrect links (hard enforcement of 1:1)
+    if len(existing_links) == 1 and existing_links[0].entity_id == entity.id:
+        link = existing_links[0]
+        if link.graph_sync_hash == link_graph_hash(
+            supplier.name, entity.canonical_name, link.confidence_score, link.resolution_method
+        ):
+            return entity
+
+    # ---------------------------------------------
+    # Enforce exactly ONE link per supplier
+    # ---------------------------------------------
+    correct_link = None
     for link in existing_links:
-        if link.entity_id != entity.id:
+        if link.entity_id == entity.id and correct_link is None:
+            correct_link = link
+        else:
+            # Incorrect or duplicate link (hard enforcement of 1:1)
             db.delete(link)
 
-    db.commit()
-
-    # Check correct link exists
-    correct_link = (
-        db.query(SupplierEntityLink)
-        .filter(
-            SupplierEntityLink.supplier_id == supplier.id,
-            SupplierEntityLink.entity_id == entity.id,
-        )
-        .first()
-    )
-
     if not correct_link:
-        new_link = SupplierEntityLink(
+        correct_link = SupplierEntityLink(
             supplier_id=supplier.id,
             entity_id=entity.id,
             confidence_score=confidence,
             resolution_method="AUTO",
         )
-        db.add(new_link)
+        db.add(correct_link)
+
+    if db.new or db.deleted:
         db.commit()
 
     # ---------------------------------------------
-    # Always sync graph relationship (MERGE safe)
+    # Sync graph relationship when the link changed
     # ---------------------------------------------
-    link_supplier_to_entity(
-        supplier_name=supplier.name,
-        canonical_name=entity.canonical_name,
-        confidence_score=confidence,
-        resolution_method="AUTO",
-    )
+    sync_supplier_link(correct_link, supplier.name, entity.canonical_name, db)
 
     return entity
\ No newline at end of file
@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 from rapidfuzz import fuzz
 
+from app.core.normalization import normalize_name
 from app.models import GlobalEntity, SanctionedEntity, CoveredEntity
+from app.services.list_version_service import record_covered_entity_version
 
 
 OFAC_SDN_URL = "https://www.treasury.gov/ofac/downloads/sdn.csv"
@@ -13,10 +15,6 @@ BIS_ENTITY_LIST_URL = "https://www.bis.doc.gov/index.php/documents/consolidated-
 MATCH_THRESHOLD = 88
 
 
-def normalize(text: str) -> str:
-    return text.lower().replace(",", "").replace(".", "").strip()
-
-
 # =====================================================
 # OFAC LIVE INGESTION
 # =====================================================
@@ -36,7 +34,7 @@ def refresh_ofac_data(db: Session):
         if not name:
             continue
 
-        normalized = normalize(name)
+        normalized = normalize_name(name)
 
         entity = db.query(GlobalEntity).filter_by(normalized_name=normalized).first()
 
@@ -83,7 +81,7 @@ def refresh_bis_entity_list(db: Session):
         if not name:
             continue
 
-        normalized = normalize(name)
+        normalized = normalize_name(name)
 
         entity = db.query(GlobalEntity).filter_by(normalized_name=normalized).first()
 
@@ -97,13 +95,18 @@ def refresh_bis_entity_list(db: Session):
             db.commit()
             db.refresh(entity)
 
-        existing = db.query(CoveredEntity).filter_by(name=name).first()
+        existing = db.query(CoveredEntity).filter_by(entity_id=entity.id, source="BIS").first()
 
         if not existing:
-            covered = CoveredEntity(name=name)
+            covered = CoveredEntity(
+                entity_id=entity.id,
+                designation="BIS Entity List",
+                source="BIS",
+            )
             db.add(covered)
 
     db.commit()
+    record_covered_entity_version(db)
 
 
 # =====================================================
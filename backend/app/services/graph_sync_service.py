@@ -0,0 +1,229 @@
+"""
+Graph Sync Service
+==================
+Keeps Neo4j in step with the SQL entity model without writing to the graph
+on every read. ``GlobalEntity`` and ``SupplierEntityLink`` rows carry a hash
+of the properties last written to their graph node / relationship; the
+resolution path only issues a ``MERGE`` when that hash no longer matches
+(new row, renamed entity, changed country / confidence…) or the previous
+write failed.
+
+``reconcile_graph`` is the scheduled repair pass: it re-syncs every dirty
+row and every row whose node or relationship has gone missing from the
+graph, in UNWIND batches.
+"""
+
+import hashlib
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models import GlobalEntity, Supplier, SupplierEntityLink
+from app.graph.supplier_graph_service import (
+    create_global_entity_node,
+    link_supplier_to_entity,
+    bulk_upsert_global_entity_nodes,
+    bulk_link_suppliers_to_entities,
+    existing_global_entity_names,
+    existing_supplier_links,
+)
+
+
+RECONCILE_BATCH_SIZE = 1000
+
+
+def _digest(*values) -> str:
+    return hashlib.sha1("\x1f".join("" if v is None else str(v) for v in values).encode("utf-8")).hexdigest()
+
+
+def entity_graph_hash(canonical_name: str, entity_type: str | None, country: str | None) -> str:
+    return _digest(canonical_name, entity_type, country)
+
+
+def link_graph_hash(supplier_name: str, canonical_name: str, confidence: float, method: str | None) -> str:
+    return _digest(supplier_name, canonical_name, round(confidence or 0, 4), method)
+
+
+# =====================================================
+# PER-ROW SYNC (RESOLUTION PATH)
+# =====================================================
+
+def sync_entity_node(entity: GlobalEntity, db: Session):
+    """MERGE the entity's graph node only if its graph-visible properties changed."""
+    graph_hash = entity_graph_hash(entity.canonical_name, entity.entity_type, entity.country)
+    if entity.graph_sync_hash == graph_hash:
+        return
+
+    try:
+        create_global_entity_node(
+            canonical_name=entity.canonical_name,
+            entity_type=entity.entity_type,
+            country=entity.country,
+        )
+    except Exception as e:
+        # Left dirty; reconcile_graph retries it
+        print(f"⚠️ Graph sync failed for entity {entity.canonical_name}: {e}")
+        return
+
+    entity.graph_sync_hash = graph_hash
+    entity.graph_synced_at = datetime.utcnow()
+    db.commit()
+
+
+def sync_supplier_link(link: SupplierEntityLink, supplier_name: str, canonical_name: str, db: Session):
+    """MERGE the Supplier -[:RESOLVES_TO]-> GlobalEntity relationship only if it changed."""
+    graph_hash = link_graph_hash(supplier_name, canonical_name, link.confidence_score, link.resolution_method)
+    if link.graph_sync_hash == graph_hash:
+        return
+
+    try:
+        link_supplier_to_entity(
+            supplier_name=supplier_name,
+            canonical_name=canonical_name,
+            confidence_score=link.confidence_score,
+            resolution_method=link.resolution_method,
+        )
+    except Exception as e:
+        print(f"⚠️ Graph sync failed for supplier link {supplier_name} -> {canonical_name}: {e}")
+        return
+
+    link.graph_sync_hash = graph_hash
+    link.graph_synced_at = datetime.utcnow()
+    db.commit()
+
+
+def sync_entity_nodes_bulk(entities: list[GlobalEntity]):
+    """
+    Batched ``sync_entity_node``: one UNWIND write for every changed entity.
+    Marks the entities synced in the session; the caller commits.
+    """
+    hashes = {e.id: entity_graph_hash(e.canonical_name, e.entity_type, e.country) for e in entities}
+    dirty = list({e.id: e for e in entities if e.graph_sync_hash != hashes[e.id]}.values())
+    if not dirty:
+        return
+
+    try:
+        bulk_upsert_global_entity_nodes([
+            {"name": e.canonical_name, "type": e.entity_type, "country": e.country}
+            for e in dirty
+        ])
+    except Exception as e:
+        print(f"⚠️ Graph sync failed for {len(dirty)} entities: {e}")
+        return
+
+    now = datetime.utcnow()
+    for entity in dirty:
+        entity.graph_sync_hash = hashes[entity.id]
+        entity.graph_synced_at = now
+
+
+# =====================================================
+# BULK RECONCILIATION (SCHEDULED)
+# =====================================================
+
+def _reconcile_entities(db: Session) -> int:
+    repaired = 0
+    last_id = 0
+
+    while True:
+        rows = (
+            db.query(
+                GlobalEntity.id,
+                GlobalEntity.canonical_name,
+                GlobalEntity.entity_type,
+                GlobalEntity.country,
+                GlobalEntity.graph_sync_hash,
+            )
+            .filter(GlobalEntity.id > last_id)
+            .order_by(GlobalEntity.id)
+            .limit(RECONCILE_BATCH_SIZE)
+            .all()
+        )
+        if not rows:
+            return repaired
+        last_id = rows[-1].id
+
+        hashes = {r.id: entity_graph_hash(r.canonical_name, r.entity_type, r.country) for r in rows}
+        clean = [r for r in rows if r.graph_sync_hash == hashes[r.id]]
+        present = existing_global_entity_names([r.canonical_name for r in clean])
+        stale = [
+            r for r in rows
+            if r.graph_sync_hash != hashes[r.id] or r.canonical_name not in present
+        ]
+        if not stale:
+            continue
+
+        bulk_upsert_global_entity_nodes([
+            {"name": r.canonical_name, "type": r.entity_type, "country": r.country}
+            for r in stale
+        ])
+
+        now = datetime.utcnow()
+        db.bulk_update_mappings(GlobalEntity, [
+            {"id": r.id, "graph_sync_hash": hashes[r.id], "graph_synced_at": now}
+            for r in stale
+        ])
+        db.commit()
+        repaired += len(stale)
+
+
+def _reconcile_links(db: Session) -> int:
+    repaired = 0
+    last_id = 0
+
+    while True:
+        rows = (
+            db.query(
+                SupplierEntityLink.id,
+                SupplierEntityLink.confidence_score,
+                SupplierEntityLink.resolution_method,
+                SupplierEntityLink.graph_sync_hash,
+                Supplier.name.label("supplier_name"),
+                GlobalEntity.canonical_name,
+            )
+            .join(Supplier, SupplierEntityLink.supplier_id == Supplier.id)
+            .join(GlobalEntity, SupplierEntityLink.entity_id == GlobalEntity.id)
+            .filter(SupplierEntityLink.id > last_id)
+            .order_by(SupplierEntityLink.id)
+            .limit(RECONCILE_BATCH_SIZE)
+            .all()
+        )
+        if not rows:
+            return repaired
+        last_id = rows[-1].id
+
+        hashes = {
+            r.id: link_graph_hash(r.supplier_name, r.canonical_name, r.confidence_score, r.resolution_method)
+            for r in rows
+        }
+        clean = [r for r in rows if r.graph_sync_hash == hashes[r.id]]
+        present = existing_supplier_links([(r.supplier_name, r.canonical_name) for r in clean])
+        stale = [
+            r for r in rows
+            if r.graph_sync_hash != hashes[r.id] or (r.supplier_name, r.canonical_name) not in present
+        ]
+        if not stale:
+            continue
+
+        bulk_link_suppliers_to_entities([
+            {
+                "supplier": r.supplier_name,
+                "entity": r.canonical_name,
+                "confidence": r.confidence_score,
+                "method": r.resolution_method,
+            }
+            for r in stale
+        ])
+
+        now = datetime.utcnow()
+        db.bulk_update_mappings(SupplierEntityLink, [
+            {"id": r.id, "graph_sync_hash": hashes[r.id], "graph_synced_at": now}
+            for r in stale
+        ])
+        db.commit()
+        repaired += len(stale)
+
+
+def reconcile_graph(db: Session) -> int:
+    """Repair graph drift in bulk; returns the number of nodes + relationships re-synced."""
+    return _reconcile_entities(db) + _reconcile_links(db)
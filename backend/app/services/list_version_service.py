@@ -0,0 +1,84 @@
+"""
+Sanctions List Version Registry
+===============================
+Records every distinct payload of each sanctions list (content hash, fetch
+time, record count, parse duration) so screening results and assessment
+snapshots can name the exact list versions they were computed against.
+
+The Section 889 covered-entity set is versioned the same way (source
+"Section 889"), by a hash of its rows, whenever covered-entity ingestion
+or entity clustering changes it.
+"""
+
+import hashlib
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import CoveredEntity, GlobalEntity, SanctionsListVersion
+from app.screening.covered_matcher import COVERED_ENTITY_SOURCE, covered_matcher
+from app.screening.sanctions_store import ListSnapshot
+
+
+def record_list_version(snapshot: ListSnapshot):
+    """sanctions_store ingest listener: insert the version unless it is already known."""
+    db: Session = SessionLocal()
+    try:
+        exists = (
+            db.query(SanctionsListVersion.id)
+            .filter_by(source=snapshot.source, content_hash=snapshot.version)
+            .first()
+        )
+        if exists:
+            return
+
+        db.add(SanctionsListVersion(
+            source=snapshot.source,
+            content_hash=snapshot.version,
+            fetched_at=snapshot.fetched_at,
+            record_count=len(snapshot.records),
+            parse_duration=round(snapshot.parse_seconds, 3),
+        ))
+        db.commit()
+    except IntegrityError:
+        # Another process recorded the same payload first
+        db.rollback()
+    finally:
+        db.close()
+
+
+def record_covered_entity_version(db: Session) -> str:
+    """
+    Hash the covered-entity set and record it as the current "Section 889"
+    version (a previously seen hash is re-stamped as current). Returns the hash.
+    """
+    rows = (
+        db.query(GlobalEntity.normalized_name, CoveredEntity.designation, CoveredEntity.source)
+        .join(CoveredEntity, CoveredEntity.entity_id == GlobalEntity.id)
+        .all()
+    )
+    digest = hashlib.sha256(
+        "\n".join(sorted("\x1f".join(v or "" for v in r) for r in rows)).encode("utf-8")
+    ).hexdigest()
+
+    version = (
+        db.query(SanctionsListVersion)
+        .filter_by(source=COVERED_ENTITY_SOURCE, content_hash=digest)
+        .first()
+    )
+    if version:
+        version.fetched_at = datetime.utcnow()
+        version.record_count = len(rows)
+    else:
+        db.add(SanctionsListVersion(
+            source=COVERED_ENTITY_SOURCE,
+            content_hash=digest,
+            fetched_at=datetime.utcnow(),
+            record_count=len(rows),
+        ))
+    db.commit()
+
+    covered_matcher.invalidate()
+    return digest
@@ -11,11 +11,18 @@ Aggregates freely available public data for supplier due diligence:
 import os
 import csv
 import io
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from datetime import datetime, timedelta
 from typing import Optional
 import requests
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+
+from app.core.normalization import normalize_name, normalize_names
+from app.screening.sanctions_store import ListSnapshot, SanctionsRecord, SanctionsSource, sanctions_store
+from app.screening.result_cache import screening_cache
+from app.services.list_version_service import record_list_version
 
 # ─── Config ───────────────────────────────────────────
 
@@ -23,12 +30,17 @@ GNEWS_API_KEY = os.getenv("GNEWS_API_KEY", "")
 SEC_EDGAR_UA = os.getenv("SEC_EDGAR_USER_AGENT", "VDashboard admin@example.com")
 
 MATCH_THRESHOLD = 82  # fuzzy-match cutoff for sanctions screening
+CDIST_CHUNK_ROWS = 512  # query rows per cdist matrix (bounds matrix memory)
+BULK_SCREEN_MIN_NAMES = int(os.getenv("BULK_SCREEN_MIN_NAMES", "300"))  # smaller batches use the blocking index
+SCREEN_POOL_WORKERS = int(os.getenv("SANCTIONS_SCREEN_WORKERS", "6"))
+SCREENING_ENGINE = os.getenv("SCREENING_ENGINE", "memory")  # memory | postgres
 
-# ─── Helpers ──────────────────────────────────────────
-
-def _normalize(text: str) -> str:
-    return text.lower().replace(",", "").replace(".", "").replace("-", "").strip()
+# Optional screening daemon (python -m app.screening.server); empty = screen in-process
+SCREENING_SERVICE_URL = os.getenv("SCREENING_SERVICE_URL", "").rstrip("/")
+SCREENING_SERVICE_TIMEOUT = int(os.getenv("SCREENING_SERVICE_TIMEOUT", "30"))
+SCREENING_SERVICE_RETRY_SECONDS = 30  # fall back in-process for this long after a failed call
 
+# ─── Helpers ──────────────────────────────────────────
 
 def _safe_get(url: str, headers: dict | None = None, params: dict | None = None,
               timeout: int = 20, verify: bool = True) -> requests.Response | None:
@@ -60,118 +72,453 @@ _EU_SANCTIONS_URL = (
     "xmlFullSanctionsList_1_1/content?token=dG9rZW4tMjAxNw"
 )
 
+OFAC_LIST = "OFAC SDN"
+BIS_LIST = "BIS Entity List"
+EU_LIST = "EU Consolidated Sanctions"
 
-def _screen_ofac(name: str) -> list[dict]:
-    """Download OFAC SDN CSV and fuzzy-match against supplier name."""
-    hits: list[dict] = []
-    resp = _safe_get(_OFAC_SDN_URL, timeout=30)
-    if not resp:
-        return hits
 
-    norm = _normalize(name)
-    reader = csv.reader(io.StringIO(resp.text))
+def _text_rows(payload) -> csv.reader:
+    return csv.reader(io.TextIOWrapper(payload, encoding="utf-8", errors="replace", newline=""))
 
-    for row in reader:
+
+def _parse_ofac(payload) -> list[SanctionsRecord]:
+    """OFAC SDN CSV (no header): ent_num, SDN_Name, SDN_Type, Program, …"""
+    records: list[SanctionsRecord] = []
+    for row in _text_rows(payload):
         if len(row) < 2:
             continue
         sdn_name = row[1].strip()
         if not sdn_name:
             continue
-        score = fuzz.token_set_ratio(norm, _normalize(sdn_name))
-        if score >= MATCH_THRESHOLD:
-            hits.append({
-                "list": "OFAC SDN",
-                "matched_name": sdn_name,
-                "match_score": score,
+        records.append(SanctionsRecord(
+            name=sdn_name,
+            normalized_name=normalize_name(sdn_name),
+            details={
                 "sdn_type": row[2].strip() if len(row) > 2 else "",
                 "program": row[3].strip() if len(row) > 3 else "",
-                "reference_url": "https://sanctionssearch.ofac.treas.gov/",
-            })
-    return hits
-
-
-def _screen_bis(name: str) -> list[dict]:
-    """Download BIS Entity List CSV and fuzzy-match."""
-    hits: list[dict] = []
-    resp = _safe_get(_BIS_ENTITY_URL, timeout=30, verify=False)
-    if not resp:
-        return hits
+            },
+        ))
+    return records
 
-    norm = _normalize(name)
-    reader = csv.reader(io.StringIO(resp.text))
-    header = next(reader, None)
 
+def _parse_bis(payload) -> list[SanctionsRecord]:
+    """BIS Entity List CSV (with header): Name, Country, License Requirement, …"""
+    records: list[SanctionsRecord] = []
+    reader = _text_rows(payload)
+    next(reader, None)
     for row in reader:
         if not row:
             continue
         entity_name = row[0].strip()
         if not entity_name:
             continue
-        score = fuzz.token_set_ratio(norm, _normalize(entity_name))
-        if score >= MATCH_THRESHOLD:
-            hits.append({
-                "list": "BIS Entity List",
-                "matched_name": entity_name,
-                "match_score": score,
+        records.append(SanctionsRecord(
+            name=entity_name,
+            normalized_name=normalize_name(entity_name),
+            details={
                 "country": row[1].strip() if len(row) > 1 else "",
                 "license_requirement": row[2].strip() if len(row) > 2 else "",
-                "reference_url": "https://www.bis.doc.gov/index.php/the-denied-persons-list",
-            })
+            },
+        ))
+    return records
+
+
+def _local_tag(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_eu(payload) -> list[SanctionsRecord]:
+    """
+    Stream the EU Consolidated Sanctions XML with iterparse.
+
+    Only nameAlias/@wholeName (or legacy <wholeName> text), the regulation
+    programme and the EU reference number are kept. Each <sanctionEntity>
+    is cleared as soon as it has been read, so memory stays flat regardless
+    of file size. A malformed document raises ``ET.ParseError`` instead of
+    returning the entities read so far, so the store keeps serving the last
+    good snapshot.
+    """
+    records: list[SanctionsRecord] = []
+    root = None
+    reference = ""
+    programme = ""
+    names: list[str] = []
+
+    for event, elem in ET.iterparse(payload, events=("start", "end")):
+        tag = _local_tag(elem.tag)
+
+        if event == "start":
+            if root is None:
+                root = elem
+            if tag == "sanctionEntity":
+                reference = elem.get("euReferenceNumber", "")
+                programme = ""
+                names = []
+            continue
+
+        if tag == "regulation" and not programme:
+            programme = elem.get("programme", "")
+        elif tag == "nameAlias":
+            if elem.get("wholeName"):
+                names.append(elem.get("wholeName"))
+            elif elem.text and elem.text.strip():
+                names.append(elem.text.strip())
+        elif tag == "wholeName" and elem.text:
+            names.append(elem.text.strip())
+        elif tag == "sanctionEntity":
+            for eu_name in dict.fromkeys(names):
+                records.append(SanctionsRecord(
+                    name=eu_name,
+                    normalized_name=normalize_name(eu_name),
+                    details={"program": programme, "eu_reference": reference},
+                ))
+            names = []
+            root.clear()
+
+    # Legacy exports without <sanctionEntity> wrappers
+    for eu_name in dict.fromkeys(names):
+        records.append(SanctionsRecord(name=eu_name, normalized_name=normalize_name(eu_name)))
+
+    return records
+
+
+sanctions_store.register(SanctionsSource(
+    name=OFAC_LIST,
+    url=_OFAC_SDN_URL,
+    parser=_parse_ofac,
+    reference_url="https://sanctionssearch.ofac.treas.gov/",
+))
+sanctions_store.register(SanctionsSource(
+    name=BIS_LIST,
+    url=_BIS_ENTITY_URL,
+    parser=_parse_bis,
+    reference_url="https://www.bis.doc.gov/index.php/the-denied-persons-list",
+    verify=False,
+))
+sanctions_store.register(SanctionsSource(
+    name=EU_LIST,
+    url=_EU_SANCTIONS_URL,
+    parser=_parse_eu,
+    reference_url="https://data.europa.eu/data/datasets/consolidated-list-of-persons-groups-and-entities-subject-to-eu-financial-sanctions",
+))
+
+
+def _hit(list_name: str, record: SanctionsRecord, score: float) -> dict:
+    return {
+        "list": list_name,
+        "matched_name": record.name,
+        "match_score": score,
+        **record.details,
+        "reference_url": sanctions_store.source(list_name).reference_url,
+    }
+
+
+def _screen_list(list_name: str, name: str) -> list[dict]:
+    """
+    Fuzzy-match a name against the in-memory snapshot of one list.
+    Only candidates the blocking index cannot rule out (shared rare tokens,
+    enough shared bigrams) are scored — see app.screening.name_index (or app.screening.pg_engine
+    with SCREENING_ENGINE=postgres). Outcomes are cached per list version.
+    """
+    return _screen_list_versioned(list_name, name)[0]
+
+
+def _screen_list_versioned(list_name: str, name: str) -> tuple[list[dict], ListSnapshot | None]:
+    """``_screen_list`` plus the snapshot the hits were computed against (None if unavailable)."""
+    snapshot = sanctions_store.get(list_name)
+    if not snapshot:
+        return [], None
+
+    norm = normalize_name(name)
+    cached = screening_cache.get(list_name, snapshot.version, norm)
+    if cached is not None:
+        return cached, snapshot
+
+    hits = _screen_snapshot(list_name, snapshot, norm)
+    screening_cache.set(list_name, snapshot.version, norm, hits)
+    return hits, snapshot
+
+
+def _screen_snapshot(list_name: str, snapshot: ListSnapshot, norm: str) -> list[dict]:
+    """Score one normalized name against the blocking candidates of one snapshot."""
+    if SCREENING_ENGINE == "postgres":
+        candidates = pg_engine.candidates(snapshot, norm)
+    else:
+        records = snapshot.records
+        candidates = (records[idx] for idx in snapshot.index.candidates(norm, MATCH_THRESHOLD))
+
+    hits: list[dict] = []
+    for record in candidates:
+        score = fuzz.token_set_ratio(norm, record.normalized_name)
+        if score >= MATCH_THRESHOLD:
+            hits.append(_hit(list_name, record, score))
     return hits
 
 
-def _screen_eu(name: str) -> list[dict]:
-    """Download EU Consolidated Sanctions XML and fuzzy-match."""
+def _screen_list_exhaustive(list_name: str, name: str) -> list[dict]:
+    """Brute-force reference path: scores every record. Used to verify index recall."""
     hits: list[dict] = []
-    resp = _safe_get(_EU_SANCTIONS_URL, timeout=30)
-    if not resp:
+    snapshot = sanctions_store.get(list_name)
+    if not snapshot:
         return hits
 
-    norm = _normalize(name)
-    try:
-        root = ET.fromstring(resp.content)
-        # EU XML namespace
-        ns = {"eu": "http://eu.europa.ec/fpi/fsd/export"}
-        for entity in root.iter():
-            if entity.tag.endswith("nameAlias") or entity.tag.endswith("wholeName"):
-                eu_name = entity.text or entity.get("wholeName", "")
-                if not eu_name:
-                    continue
-                score = fuzz.token_set_ratio(norm, _normalize(eu_name))
-                if score >= MATCH_THRESHOLD:
-                    hits.append({
-                        "list": "EU Consolidated Sanctions",
-                        "matched_name": eu_name,
-                        "match_score": score,
-                        "reference_url": "https://data.europa.eu/data/datasets/consolidated-list-of-persons-groups-and-entities-subject-to-eu-financial-sanctions",
-                    })
-    except ET.ParseError:
-        print("⚠️  Failed to parse EU sanctions XML")
-
+    norm = normalize_name(name)
+    for record in snapshot.records:
+        score = fuzz.token_set_ratio(norm, record.normalized_name)
+        if score >= MATCH_THRESHOLD:
+            hits.append(_hit(list_name, record, score))
     return hits
 
 
-def check_sanctions_lists(name: str, country: str = "") -> dict:
+def _screen_ofac(name: str) -> list[dict]:
+    """Fuzzy-match a supplier name against the OFAC SDN snapshot."""
+    return _screen_list(OFAC_LIST, name)
+
+
+def _screen_bis(name: str) -> list[dict]:
+    """Fuzzy-match a supplier name against the BIS Entity List snapshot."""
+    return _screen_list(BIS_LIST, name)
+
+
+def _screen_eu(name: str) -> list[dict]:
+    """Fuzzy-match a supplier name against the EU Consolidated Sanctions snapshot."""
+    return _screen_list(EU_LIST, name)
+
+
+sanctions_store.on_ingest(record_list_version)
+
+if SCREENING_ENGINE == "postgres":
+    from app.screening import pg_engine
+    sanctions_store.subscribe(pg_engine.handle_list_update)
+
+
+# Shared, bounded pool: one task per list per screening call
+_screen_pool = ThreadPoolExecutor(max_workers=SCREEN_POOL_WORKERS, thread_name_prefix="sanctions-screen")
+
+SANCTIONS_LISTS = [OFAC_LIST, BIS_LIST, EU_LIST]
+
+
+def _list_status(snapshot: ListSnapshot | None) -> str:
+    if snapshot is None:
+        return "unavailable"
+    if snapshot.age_seconds > sanctions_store.refresh_interval:
+        return "stale"
+    return "ok"
+
+
+def _screen_all_lists(screen_fn, arg, empty) -> tuple[dict, dict, dict]:
     """
-    Screen supplier name against OFAC SDN, BIS Entity List, and EU sanctions.
-    Returns structured results with match details.
+    Run ``screen_fn(list_name, arg)`` for every list concurrently; it returns
+    (results, snapshot screened), so a list refreshed mid-call is reported
+    under the version the results actually came from.
+    Each list gets its own deadline (the source's fetch timeout) measured from
+    the start of the call, so wall time is the slowest list, not the sum.
+    Returns (results per list, status per list: ok | stale | timeout | unavailable,
+    version per list: content hash of the snapshot screened, None if none was).
     """
-    ofac_hits = _screen_ofac(name)
-    bis_hits = _screen_bis(name)
-    eu_hits = _screen_eu(name)
+    started = time.monotonic()
+    futures = {name: _screen_pool.submit(screen_fn, name, arg) for name in SANCTIONS_LISTS}
+
+    results: dict = {}
+    status: dict = {}
+    versions: dict = {}
+    for list_name, future in futures.items():
+        deadline = sanctions_store.source(list_name).timeout
+        remaining = max(0.0, deadline - (time.monotonic() - started))
+        try:
+            results[list_name], snapshot = future.result(timeout=remaining)
+            status[list_name] = _list_status(snapshot)
+            versions[list_name] = snapshot.version if snapshot else None
+        except FuturesTimeout:
+            print(f"⚠️  {list_name} screening exceeded {deadline}s deadline")
+            results[list_name] = empty()
+            status[list_name] = "timeout"
+            versions[list_name] = None
+        except Exception as e:
+            print(f"⚠️  {list_name} screening failed: {e}")
+            results[list_name] = empty()
+            status[list_name] = "unavailable"
+            versions[list_name] = None
+
+    return results, status, versions
+
+
+_service_down_until = 0.0
+
+
+def _screen_remote(names: list[str]) -> list[dict] | None:
+    """
+    Screen names through the screening daemon. Returns None (caller screens
+    in-process) when no daemon is configured or it cannot answer.
+    """
+    global _service_down_until
+    if not SCREENING_SERVICE_URL or time.monotonic() < _service_down_until:
+        return None
+
+    try:
+        resp = requests.post(
+            f"{SCREENING_SERVICE_URL}/screen",
+            json={"names": names},
+            timeout=SCREENING_SERVICE_TIMEOUT,
+        )
+        resp.raise_for_status()
+        results = resp.json()["results"]
+        if len(results) != len(names):
+            raise ValueError(f"expected {len(names)} results, got {len(results)}")
+        return results
+    except Exception as e:
+        _service_down_until = time.monotonic() + SCREENING_SERVICE_RETRY_SECONDS
+        print(f"⚠️  Screening service unavailable, screening in-process: {e}")
+        return None
+
+
+def screen_names_local(names: list[str]) -> list[dict]:
+    """In-process screening entry point (also what the screening daemon serves)."""
+    if len(names) == 1:
+        return [_check_sanctions_lists_local(names[0])]
+    return _check_sanctions_lists_bulk_local(names)
 
-    all_hits = ofac_hits + bis_hits + eu_hits
+
+def _check_sanctions_lists_local(name: str) -> dict:
+    per_list, list_status, list_versions = _screen_all_lists(_screen_list_versioned, name, list)
+
+    all_hits = [hit for list_name in SANCTIONS_LISTS for hit in per_list[list_name]]
     flagged = len(all_hits) > 0
 
     return {
         "flagged": flagged,
         "total_hits": len(all_hits),
         "hits": all_hits,
-        "lists_checked": ["OFAC SDN", "BIS Entity List", "EU Consolidated Sanctions"],
+        "lists_checked": list(SANCTIONS_LISTS),
+        "list_status": list_status,
+        "list_versions": list_versions,
         "checked_at": datetime.utcnow().isoformat(),
     }
 
 
+def check_sanctions_lists(name: str, country: str = "") -> dict:
+    """
+    Screen supplier name against OFAC SDN, BIS Entity List, and EU sanctions.
+    Lists are read from the process-wide snapshot store, never downloaded per call,
+    and the three lists are screened concurrently.
+    When SCREENING_SERVICE_URL is set the node's screening daemon answers instead,
+    falling back to in-process screening if it is unreachable.
+    Returns structured results with match details and per-list status.
+    """
+    remote = _screen_remote([name])
+    if remote is not None:
+        return remote[0]
+    return _check_sanctions_lists_local(name)
+
+
+def _screen_list_bulk(list_name: str, norms: list[str]) -> tuple[list[list[dict]], ListSnapshot | None]:
+    """
+    Score many normalized names against one list in a single vectorized pass.
+    cdist pre-filters just below the threshold (float32 scores), then the few
+    surviving pairs are re-scored exactly so hits match the single-name path.
+    Names already in the result cache skip the matrix entirely, and fewer
+    than BULK_SCREEN_MIN_NAMES uncached names (a supplier and its parents /
+    subsidiaries) are screened one by one through the blocking index, which
+    is far cheaper than a matrix over every list entry. With
+    SCREENING_ENGINE=postgres, one batched pg_trgm query replaces the matrix.
+    Returns the hits per name and the snapshot they were computed against.
+    """
+    results: list[list[dict]] = [[] for _ in norms]
+    snapshot = sanctions_store.get(list_name)
+    if not snapshot or not snapshot.records or not norms:
+        return results, snapshot
+
+    misses: list[int] = []
+    for i, norm in enumerate(norms):
+        cached = screening_cache.get(list_name, snapshot.version, norm)
+        if cached is None:
+            misses.append(i)
+        else:
+            results[i] = cached
+
+    if SCREENING_ENGINE == "postgres":
+        per_query = pg_engine.candidates_bulk(snapshot, [norms[i] for i in misses])
+        for i, candidates in zip(misses, per_query):
+            for record in candidates:
+                score = fuzz.token_set_ratio(norms[i], record.normalized_name)
+                if score >= MATCH_THRESHOLD:
+                    results[i].append(_hit(list_name, record, score))
+            screening_cache.set(list_name, snapshot.version, norms[i], results[i])
+        return results, snapshot
+
+    if len(misses) < BULK_SCREEN_MIN_NAMES:
+        for i in misses:
+            results[i] = _screen_snapshot(list_name, snapshot, norms[i])
+            screening_cache.set(list_name, snapshot.version, norms[i], results[i])
+        return results, snapshot
+
+    records = snapshot.records
+    # Decoded once for this pass; a mapped index does not keep the list around
+    choices = list(snapshot.index.names)
+
+    for start in range(0, len(misses), CDIST_CHUNK_ROWS):
+        positions = misses[start:start + CDIST_CHUNK_ROWS]
+        chunk = [norms[i] for i in positions]
+        matrix = process.cdist(
+            chunk,
+            choices,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=MATCH_THRESHOLD - 0.5,
+            workers=-1,
+        )
+        rows, cols = matrix.nonzero()
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            score = fuzz.token_set_ratio(chunk[row], choices[col])
+            if score >= MATCH_THRESHOLD:
+                results[positions[row]].append(_hit(list_name, records[col], score))
+
+        for i in positions:
+            screening_cache.set(list_name, snapshot.version, norms[i], results[i])
+
+    return results, snapshot
+
+
+def _check_sanctions_lists_bulk_local(names: list[str]) -> list[dict]:
+    normalized = normalize_names(names)
+    norms = list(dict.fromkeys(normalized))
+    position = {norm: i for i, norm in enumerate(norms)}
+
+    per_list, list_status, list_versions = _screen_all_lists(
+        _screen_list_bulk, norms, lambda: [[] for _ in norms]
+    )
+    checked_at = datetime.utcnow().isoformat()
+
+    results: list[dict] = []
+    for norm in normalized:
+        i = position[norm]
+        all_hits = [hit for list_name in SANCTIONS_LISTS for hit in per_list[list_name][i]]
+        results.append({
+            "flagged": len(all_hits) > 0,
+            "total_hits": len(all_hits),
+            "hits": all_hits,
+            "lists_checked": list(SANCTIONS_LISTS),
+            "list_status": list_status,
+            "list_versions": list_versions,
+            "checked_at": checked_at,
+        })
+    return results
+
+
+def check_sanctions_lists_bulk(names: list[str]) -> list[dict]:
+    """
+    Screen many names at once (portfolio imports, nightly rescoring).
+    Returns one result per input name, in input order, with the same shape
+    as check_sanctions_lists.
+    """
+    if not names:
+        return []
+
+    remote = _screen_remote(list(names))
+    if remote is not None:
+        return remote
+    return _check_sanctions_lists_bulk_local(names)
+
+
 # =====================================================
 # 2.  TRADE / IMPORT RECORDS
 # =====================================================
@@ -0,0 +1,198 @@
+"""
+Reverse Screening Service
+=========================
+When a sanctions list publishes a new version, screen only the added and
+removed entries against every known GlobalEntity name and alias, then
+enqueue reassessment for the suppliers those entities touch. A daily list
+change of a few dozen names costs seconds instead of a full portfolio
+rescore.
+"""
+
+from datetime import datetime
+
+from rapidfuzz import fuzz
+from sqlalchemy.orm import Session
+
+from app.core.normalization import normalize_name
+from app.database import SessionLocal
+from app.models import GlobalEntity, GlobalEntityAlias, SupplierEntityLink, Supplier, IngestionRun
+from app.screening.feed_diff import FeedDelta, diff_snapshots
+from app.screening.name_index import NameIndex
+from app.screening.sanctions_store import ListSnapshot
+from app.services.public_data_service import MATCH_THRESHOLD
+from app.graph.graph_client import get_session
+
+
+# =====================================================
+# ENTITY NAME INDEX
+# =====================================================
+
+def build_entity_name_index(db: Session) -> tuple[NameIndex, list[int]]:
+    """Blocking index over every canonical name and alias, with the owning entity id per row."""
+    names: list[str] = []
+    entity_ids: list[int] = []
+
+    for entity_id, normalized_name in db.query(GlobalEntity.id, GlobalEntity.normalized_name):
+        names.append(normalized_name)
+        entity_ids.append(entity_id)
+
+    for entity_id, normalized_alias in db.query(GlobalEntityAlias.entity_id, GlobalEntityAlias.normalized_alias):
+        names.append(normalized_alias)
+        entity_ids.append(entity_id)
+
+    return NameIndex(names), entity_ids
+
+
+# =====================================================
+# DELTA → AFFECTED ENTITIES → AFFECTED SUPPLIERS
+# =====================================================
+
+def match_delta_entities(delta: FeedDelta, db: Session) -> set[int]:
+    index, entity_ids = build_entity_name_index(db)
+    matched: set[int] = set()
+
+    for record in delta.changed:
+        query = normalize_name(record.name)
+        for idx in index.candidates(query, MATCH_THRESHOLD):
+            if fuzz.token_set_ratio(query, index.names[idx]) >= MATCH_THRESHOLD:
+                matched.add(entity_ids[idx])
+
+    return matched
+
+
+def _related_entity_names(canonical_names: list[str]) -> set[str]:
+    """Parents and subsidiaries of the hit entities (sanctions checks screen both)."""
+    related: set[str] = set()
+    if not canonical_names:
+        return related
+
+    try:
+        with get_session() as session:
+            result = session.run(
+                """
+                UNWIND $names AS name
+                MATCH (e:GlobalEntity {canonical_name: name})
+                      -[:RELATION {type:'SUBSIDIARY_OF'}]-
+                      (other:GlobalEntity)
+                RETURN DISTINCT other.canonical_name AS name
+                """,
+                names=canonical_names,
+            )
+            related = {r["name"] for r in result if r["name"]}
+    except Exception as e:
+        print(f"⚠️ Graph relation fetch failed for reverse screening: {e}")
+
+    return related
+
+
+def affected_supplier_ids(entity_ids: set[int], db: Session) -> set[int]:
+    if not entity_ids:
+        return set()
+
+    hit_entities = (
+        db.query(GlobalEntity.canonical_name, GlobalEntity.normalized_name)
+        .filter(GlobalEntity.id.in_(entity_ids))
+        .all()
+    )
+    canonical_names = [c for c, _ in hit_entities]
+
+    related = _related_entity_names(canonical_names)
+    if related:
+        entity_ids = entity_ids | {
+            entity_id
+            for (entity_id,) in db.query(GlobalEntity.id).filter(GlobalEntity.canonical_name.in_(related))
+        }
+
+    supplier_ids = {
+        supplier_id
+        for (supplier_id,) in (
+            db.query(SupplierEntityLink.supplier_id)
+            .filter(SupplierEntityLink.entity_id.in_(entity_ids))
+            .distinct()
+        )
+    }
+
+    # Suppliers that only reference the hit entity through parent_company
+    parent_names = set(canonical_names) | related
+    if parent_names:
+        supplier_ids |= {
+            supplier_id
+            for (supplier_id,) in db.query(Supplier.id).filter(Supplier.parent_company.in_(parent_names))
+        }
+
+    return supplier_ids
+
+
+def list_update_trigger(delta: FeedDelta) -> dict:
+    """Snapshot marker for assessments queued by a list update (they have no initiating user)."""
+    return {
+        "type": "sanctions_list_update",
+        "list": delta.source,
+        "old_version": delta.old_version,
+        "new_version": delta.new_version,
+    }
+
+
+def enqueue_reassessments(supplier_ids: set[int], trigger: dict | None = None) -> int:
+    from app.worker.tasks import run_assessment_task
+
+    queued = 0
+    for supplier_id in sorted(supplier_ids):
+        try:
+            run_assessment_task.delay(supplier_id, None, trigger)
+            queued += 1
+        except Exception as e:
+            print(f"⚠️ Could not enqueue reassessment for supplier {supplier_id}: {e}")
+    return queued
+
+
+# =====================================================
+# LIST UPDATE HANDLER
+# =====================================================
+
+def reverse_screen_delta(delta: FeedDelta, db: Session) -> dict:
+    entity_ids = match_delta_entities(delta, db)
+    supplier_ids = affected_supplier_ids(entity_ids, db)
+    queued = enqueue_reassessments(supplier_ids, list_update_trigger(delta))
+
+    return {
+        "source": delta.source,
+        "added": len(delta.added),
+        "removed": len(delta.removed),
+        "matched_entities": len(entity_ids),
+        "affected_suppliers": sorted(supplier_ids),
+        "queued": queued,
+    }
+
+
+def handle_list_update(old: ListSnapshot, new: ListSnapshot):
+    """sanctions_store listener: diff the two versions and reverse-screen the delta."""
+    delta = diff_snapshots(old, new)
+    if not len(delta):
+        return
+
+    db: Session = SessionLocal()
+
+    ingestion = IngestionRun(
+        feed_name=f"{delta.source} DELTA",
+        status="RUNNING",
+        started_at=datetime.utcnow(),
+    )
+    db.add(ingestion)
+    db.commit()
+
+    try:
+        summary = reverse_screen_delta(delta, db)
+        ingestion.status = "SUCCESS"
+        ingestion.record_count = len(delta)
+        print(
+            f"Reverse screening {delta.source}: +{summary['added']} / -{summary['removed']} entries, "
+            f"{len(summary['affected_suppliers'])} suppliers queued for reassessment"
+        )
+    except Exception as e:
+        ingestion.status = "FAILED"
+        ingestion.error_message = str(e)
+
+    ingestion.completed_at = datetime.utcnow()
+    db.commit()
+    db.close()
@@ -1,11 +1,47 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app.models import Supplier, SanctionedEntity
-from app.services.entity_resolution_service import resolve_supplier_entity, resolve_or_create_entity
-from app.services.public_data_service import check_sanctions_lists
+from app.services.entity_resolution_service import resolve_supplier_entity, resolve_entities_bulk
+from app.services.public_data_service import check_sanctions_lists_bulk
 from app.graph.graph_client import get_session
 
 
 MATCH_THRESHOLD = 85
+SKIPPED_LIST_STATUSES = ("timeout", "unavailable")  # list not screened at all
+
+
+def _upsert_sanctioned_entities(rows: list[dict], db: Session):
+    """
+    Insert (entity_id, source, program) hits in one statement, skipping
+    rows already recorded (uq_sanctioned_entity_source_program).
+    """
+    if not rows:
+        return
+
+    # Several checked names can hit the same list entry
+    rows = list({(r["entity_id"], r["source"], r["program"]): r for r in rows}.values())
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(SanctionedEntity).values(rows).on_conflict_do_nothing(
+            index_elements=["entity_id", "source", "program"]
+        )
+        db.execute(stmt)
+        return
+
+    # Other backends: one existence query for the whole batch
+    existing = {
+        (e, s, p)
+        for e, s, p in db.query(
+            SanctionedEntity.entity_id, SanctionedEntity.source, SanctionedEntity.program
+        ).filter(SanctionedEntity.entity_id.in_({r["entity_id"] for r in rows}))
+    }
+    db.bulk_insert_mappings(
+        SanctionedEntity,
+        [r for r in rows if (r["entity_id"], r["source"], r["program"]) not in existing],
+    )
 
 
 def check_sanctions(supplier_id: int, db: Session):
@@ -19,6 +55,7 @@ def check_sanctions(supplier_id: int, db: Session):
     entities_to_check = {primary_entity.canonical_name: primary_entity}
 
     # 2. Extract related entities via Graph
+    related_countries = {}
     try:
         with get_session() as session:
             # Parents
@@ -32,10 +69,7 @@ def check_sanctions(supplier_id: int, db: Session):
                 name=primary_entity.canonical_name,
             )
             for r in parent_result:
-                name = r["name"]
-                if name not in entities_to_check:
-                    ent, _ = resolve_or_create_entity(name, db, country=r.get("country"))
-                    entities_to_check[name] = ent
+                related_countries.setdefault(r["name"], r.get("country"))
 
             # Subsidiaries
             child_result = session.run(
@@ -48,43 +82,44 @@ def check_sanctions(supplier_id: int, db: Session):
                 name=primary_entity.canonical_name,
             )
             for r in child_result:
-                name = r["name"]
-                if name not in entities_to_check:
-                    ent, _ = resolve_or_create_entity(name, db, country=r.get("country"))
-                    entities_to_check[name] = ent
+                related_countries.setdefault(r["name"], r.get("country"))
     except Exception as e:
         print(f"⚠️ Graph relation fetch failed for sanctions: {e}")
 
     # 3. Check direct parent_company attribute if present
-    if supplier.parent_company and supplier.parent_company not in entities_to_check:
-        ent, _ = resolve_or_create_entity(supplier.parent_company, db)
-        entities_to_check[supplier.parent_company] = ent
+    if supplier.parent_company:
+        related_countries.setdefault(supplier.parent_company, None)
+
+    related_names = [
+        name for name in related_countries
+        if name and name not in entities_to_check
+    ]
+    for name, (ent, _) in zip(related_names, resolve_entities_bulk(related_names, db, country=related_countries)):
+        entities_to_check[name] = ent
 
     all_matches = []
+    new_sanctions = []
     highest_score = 0
 
-    # 4. Check all entities against live Sanctions APIs
-    for name, entity in entities_to_check.items():
-        results = check_sanctions_lists(name, entity.country or "")
-        
+    # 4. Screen all entities against the sanctions lists in one batch
+    names = list(entities_to_check)
+    screening_results = check_sanctions_lists_bulk(names)
+    list_versions = screening_results[0].get("list_versions", {}) if screening_results else {}
+    list_status = screening_results[0].get("list_status", {}) if screening_results else {}
+    lists_skipped = [name for name, status in list_status.items() if status in SKIPPED_LIST_STATUSES]
+
+    for name, results in zip(names, screening_results):
+        entity = entities_to_check[name]
+
         if results.get("flagged"):
             for hit in results.get("hits", []):
                 score = hit.get("match_score", 0)
                 if score >= MATCH_THRESHOLD:
-                    # Idempotent save to DB
-                    existing_sanction = db.query(SanctionedEntity).filter_by(
-                        entity_id=entity.id,
-                        source=hit.get("list", "Unknown"),
-                        program=hit.get("program", "")
-                    ).first()
-
-                    if not existing_sanction:
-                        new_sanction = SanctionedEntity(
-                            source=hit.get("list", "Unknown"),
-                            program=hit.get("program", ""),
-                            entity_id=entity.id
-                        )
-                        db.add(new_sanction)
+                    new_sanctions.append({
+                        "entity_id": entity.id,
+                        "source": hit.get("list") or "Unknown",
+                        "program": hit.get("program") or "",
+                    })
 
                     all_matches.append({
                         "checked_name": name,
@@ -95,7 +130,9 @@ def check_sanctions(supplier_id: int, db: Session):
                         "reference_url": hit.get("reference_url", "")
                     })
                     highest_score = max(highest_score, score)
-    
+
+    # Idempotent save to DB
+    _upsert_sanctioned_entities(new_sanctions, db)
     db.commit()
 
     if all_matches:
@@ -106,7 +143,23 @@ def check_sanctions(supplier_id: int, db: Session):
             "overall_status": "FAIL",
             "risk_score": 100,
             "reason": reason,
-            "matches": all_matches
+            "matches": all_matches,
+            "list_versions": list_versions,
+            "list_status": list_status,
+            "lists_skipped": lists_skipped,
+        }
+
+    # No hit, but a list that was never screened cannot clear the supplier
+    if lists_skipped:
+        return {
+            "supplier": supplier.name,
+            "overall_status": "INCOMPLETE",
+            "risk_score": 0,
+            "reason": f"Not screened against: {', '.join(lists_skipped)}",
+            "matches": [],
+            "list_versions": list_versions,
+            "list_status": list_status,
+            "lists_skipped": lists_skipped,
         }
 
     return {
@@ -114,5 +167,8 @@ def check_sanctions(supplier_id: int, db: Session):
         "overall_status": "PASS",
         "risk_score": 0,
         "reason": "No sanctions match found",
-        "matches": []
+        "matches": [],
+        "list_versions": list_versions,
+        "list_status": list_status,
+        "lists_skipped": [],
     }
@@ -9,6 +9,11 @@ from app.services.external_intelligence_service import (
     refresh_bis_entity_list,
 )
 from app.services.assessment_service import run_assessment
+from app.services.section889_service import evaluate_section_889_bulk
+from app.services.public_data_service import SCREENING_SERVICE_URL, sanctions_store
+from app.services.reverse_screening_service import handle_list_update
+from app.services.graph_sync_service import reconcile_graph
+from app.services.entity_clustering_service import cluster_new_entities
 
 
 scheduler = BackgroundScheduler()
@@ -49,13 +54,21 @@ def run_feed_with_tracking(feed_name: str, feed_function):
 # =====================================================
 # SUPPLIER RESCORING JOB
 # =====================================================
+RESCORE_BATCH_SIZE = 500
+
+
 def rescore_all_suppliers():
     db: Session = SessionLocal()
 
-    suppliers = db.query(Supplier).all()
+    supplier_ids = [supplier_id for (supplier_id,) in db.query(Supplier.id).order_by(Supplier.id)]
 
-    for supplier in suppliers:
-        run_assessment(supplier.id, db)
+    # Section 889 is evaluated per batch, not per supplier
+    for start in range(0, len(supplier_ids), RESCORE_BATCH_SIZE):
+        batch = supplier_ids[start:start + RESCORE_BATCH_SIZE]
+        section889_results = evaluate_section_889_bulk(batch, db)
+
+        for supplier_id in batch:
+            run_assessment(supplier_id, db, section889_result=section889_results.get(supplier_id))
 
     db.close()
 
@@ -83,6 +96,38 @@ def start_scheduler():
         replace_existing=True,
     )
 
+    # Sanctions snapshot refresh: a new list version is diffed against the
+    # previous one and only the delta is reverse-screened against the portfolio.
+    # With a screening daemon on the node, its refresh loop does both, so API
+    # processes never download, parse or index the lists themselves.
+    if not SCREENING_SERVICE_URL:
+        sanctions_store.subscribe(handle_list_update)
+        scheduler.add_job(
+            sanctions_store.refresh_all,
+            trigger="interval",
+            hours=24,
+            id="sanctions_snapshot_refresh",
+            replace_existing=True,
+        )
+
+    # Graph drift repair (resolution only writes Neo4j on change)
+    scheduler.add_job(
+        lambda: run_feed_with_tracking("GRAPH SYNC", reconcile_graph),
+        trigger="interval",
+        hours=6,
+        id="graph_sync_reconcile",
+        replace_existing=True,
+    )
+
+    # Incremental duplicate-entity clustering (entities created or renamed since the last run)
+    scheduler.add_job(
+        lambda: run_feed_with_tracking("ENTITY CLUSTERING", cluster_new_entities),
+        trigger="interval",
+        hours=1,
+        id="entity_clustering",
+        replace_existing=True,
+    )
+
     # Nightly Supplier Rescoring
     scheduler.add_job(
         rescore_all_suppliers,
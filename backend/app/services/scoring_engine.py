@@ -1,16 +1,126 @@
 import yaml
 import os
-from typing import Dict, Any, Tuple, List
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Dict, Any, Tuple, List, Mapping, Optional, Sequence
+
+import numpy as np
 
 # Define the absolute path to the configuration file (root of backend)
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "scoring_rules.yaml")
 
+# How often the YAML mtime / active DB config version are checked for changes
+RELOAD_CHECK_SECONDS = float(os.getenv("SCORING_RELOAD_CHECK_SECONDS", "5"))
+
+NEWS_LEVELS = ("severe", "moderate", "minor")
+NETWORK_LEVELS = ("high_impact", "medium_impact")
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    """
+    The YAML rules and the active DB weights, compiled once into lookup
+    structures: a country -> level table, threshold tiers sorted highest
+    first and resolved weights. Immutable, so it can be shared across
+    threads and swapped atomically on reload.
+    """
+    version: str
+    config_version: Optional[str]
+    max_score: int
+    fail_threshold: float
+    conditional_threshold: float
+
+    sanctions_hit: Tuple[int, str]
+    section_889_fail: Tuple[int, str]
+    section_889_conditional: Tuple[int, str]
+
+    countries: Mapping[str, Tuple[int, str]]      # country code -> (weight, reason), first level wins
+
+    unknown_sub_tiers: Tuple[int, str]
+    missing_address: Tuple[int, str]
+    missing_industry: Tuple[int, str]
+
+    news_tiers: Tuple[Tuple[float, int, str], ...]      # (threshold, weight, reason), highest threshold first
+    news_max_points: int
+    network_tiers: Tuple[Tuple[float, int, str], ...]
+    network_max_points: int
+
+    def with_weights(self, config) -> "ScoringRules":
+        """These rules under another ScoringConfig's weights (a row or a ScoringConfigUpdate)."""
+        return replace(
+            self,
+            config_version=getattr(config, "version", None),
+            sanctions_hit=(config.sanctions_weight, self.sanctions_hit[1]),
+            section_889_fail=(config.section889_fail_weight, self.section_889_fail[1]),
+            section_889_conditional=(config.section889_conditional_weight, self.section_889_conditional[1]),
+        )
+
+
+def _rule(rules: Dict[str, Any], key: str, weight: int, reason: str) -> Tuple[int, str]:
+    data = rules.get(key, {})
+    return data.get("weight", weight), data.get("reason", reason)
+
+
+def _tiers(rules: Dict[str, Any], levels: Tuple[str, ...], reason: str) -> Tuple[Tuple[float, int, str], ...]:
+    tiers = [
+        (data.get("threshold", 999), data.get("weight", 0), data.get("reason", reason))
+        for data in (rules.get(level, {}) for level in levels)
+    ]
+    return tuple(sorted(tiers, key=lambda tier: tier[0], reverse=True))
+
+
+def compile_rules(yaml_config: Dict[str, Any], db_config=None) -> ScoringRules:
+    """Build the immutable rule set from the YAML document and the active ScoringConfig row (if any)."""
+    rules = yaml_config.get("rules", {})
+    sanctions_rules = rules.get("sanctions", {})
+    data_gaps_rules = rules.get("data_gaps", {})
+    news_rules = rules.get("adverse_news", {})
+    network_rules = rules.get("network_risk", {})
+
+    countries: Dict[str, Tuple[int, str]] = {}
+    for level, data in rules.get("geographic_risk", {}).items():
+        for country in data.get("countries", []):
+            countries.setdefault(country, (data.get("weight", 0), data.get("reason")))
+
+    thresholds = yaml_config.get("thresholds", {})
+    compiled = ScoringRules(
+        version=yaml_config.get("version", "unknown"),
+        config_version=None,
+        max_score=yaml_config.get("max_score", 100),
+        fail_threshold=thresholds.get("fail", 75),
+        conditional_threshold=thresholds.get("conditional", 40),
+        sanctions_hit=_rule(sanctions_rules, "hit", 70, "Active sanctions match"),
+        section_889_fail=_rule(sanctions_rules, "section_889_fail", 30, "Section 889 Fail"),
+        section_889_conditional=_rule(sanctions_rules, "section_889_conditional", 15, "Section 889 Conditional"),
+        countries=MappingProxyType(countries),
+        unknown_sub_tiers=_rule(data_gaps_rules, "unknown_sub_tiers", 15, "Unknown sub-tiers"),
+        missing_address=_rule(data_gaps_rules, "missing_address", 5, "Missing address"),
+        missing_industry=_rule(data_gaps_rules, "missing_industry", 5, "Missing industry"),
+        news_tiers=_tiers(news_rules, NEWS_LEVELS, "Adverse news found"),
+        news_max_points=news_rules.get("severe", {}).get("weight", 50),
+        network_tiers=_tiers(network_rules, NETWORK_LEVELS, "Network exposure detected"),
+        network_max_points=network_rules.get("high_impact", {}).get("weight", 50),
+    )
+    # DB weights override the YAML ones
+    return compiled.with_weights(db_config) if db_config else compiled
+
+
 class ScoringEngine:
     """
     Engine that evaluates risk scores based on an externalized YAML configuration.
-    Features live-reload capabilities (loads fresh from disk on each evaluation or dynamically).
+    The YAML and the active DB weights are compiled into a ``ScoringRules``
+    object, recompiled when the file's mtime or the active config version
+    changes (checked at most every RELOAD_CHECK_SECONDS); scoring itself is
+    a pure in-memory function of (context, rules).
     """
 
+    _rules: Optional[ScoringRules] = None
+    _source: Optional[Tuple] = None          # (yaml mtime, active config version) of _rules
+    _checked_at: float = float("-inf")
+    _lock = threading.Lock()
+
     @staticmethod
     def _load_config() -> Dict[str, Any]:
         """Loads the YAML configuration file."""
@@ -22,249 +132,331 @@ class ScoringEngine:
                 "thresholds": {"fail": 75, "conditional": 40},
                 "rules": {}
             }
-        
+
         with open(CONFIG_PATH, "r") as config_file:
             return yaml.safe_load(config_file)
 
     @staticmethod
-    def calculate_risk_score(context: Dict[str, Any]) -> Tuple[int, str, List[Dict[str, Any]], str]:
+    def _config_mtime() -> Optional[float]:
+        try:
+            return os.stat(CONFIG_PATH).st_mtime
+        except OSError:
+            return None
+
+    @classmethod
+    def rules(cls) -> ScoringRules:
+        """Current compiled rules, recompiled if the YAML or the active DB config changed."""
+        if cls._rules is not None and time.monotonic() - cls._checked_at < RELOAD_CHECK_SECONDS:
+            return cls._rules
+
+        with cls._lock:
+            if cls._rules is not None and time.monotonic() - cls._checked_at < RELOAD_CHECK_SECONDS:
+                return cls._rules
+
+            from app.database import SessionLocal
+            from app.models import ScoringConfig
+
+            try:
+                db = SessionLocal()
+                try:
+                    db_config = db.query(ScoringConfig).filter(ScoringConfig.active == True).first()
+                    source = (cls._config_mtime(), db_config.version if db_config else None)
+                    if source != cls._source:
+                        cls._rules = compile_rules(cls._load_config(), db_config)
+                        cls._source = source
+                finally:
+                    db.close()
+            except Exception as e:
+                if cls._rules is None:
+                    raise
+                print(f"⚠️ Scoring rules reload check failed, keeping {cls._rules.version}: {e}")
+
+            cls._checked_at = time.monotonic()
+            return cls._rules
+
+    @classmethod
+    def invalidate(cls):
+        """Force a reload check on the next scoring call (e.g. after a config update)."""
+        cls._checked_at = float("-inf")
+
+    @staticmethod
+    def calculate_risk_score(
+        context: Dict[str, Any],
+        rules: Optional[ScoringRules] = None,
+    ) -> Tuple[int, str, List[Dict[str, Any]], str]:
         """
         Calculates the risk score given a context of extracted intelligence.
         Returns: (total_score, status, detailed_breakdown, version)
         """
-        from app.database import SessionLocal
-        from app.models import ScoringConfig
-        
-        # 1. Load active config from DB if available
-        db = SessionLocal()
-        db_config = db.query(ScoringConfig).filter(ScoringConfig.active == True).first()
-        db.close()
-        
-        # 2. Load YAML config as fallback/defaults
-        yaml_config = ScoringEngine._load_config()
-        rules = yaml_config.get("rules", {})
-        sanctions_rules = rules.get("sanctions", {})
-        
-        # Override weights if DB config exists
-        sanctions_hit_weight = db_config.sanctions_weight if db_config else sanctions_rules.get("hit", {}).get("weight", 70)
-        s889_fail_weight = db_config.section889_fail_weight if db_config else sanctions_rules.get("section_889_fail", {}).get("weight", 30)
-        s889_cond_weight = db_config.section889_conditional_weight if db_config else sanctions_rules.get("section_889_conditional", {}).get("weight", 15)
-        
-        version = db_config.version if db_config else yaml_config.get("version", "unknown")
-        
-        total_score = 0
-        factors = []
-        
-        # 3. Sanctions Risk
-        if context.get("sanctions_hit"):
-            weight = sanctions_hit_weight
-            reason = sanctions_rules.get("hit", {}).get("reason", "Active sanctions match")
-            total_score += weight
-            factors.append({
-                "key": "sanctions",
-                "label": "Sanctions & Watchlists",
-                "weight": weight,
-                "max_points": weight,
-                "points": weight,
-                "triggered": True,
-                "reason": reason
-            })
-            
-        # Section 889
-        s889_status = context.get("section_889_status")
-        if s889_status == "FAIL":
-            weight = s889_fail_weight
-            reason = context.get("section_889_reason") or sanctions_rules.get("section_889_fail", {}).get("reason", "Section 889 Fail")
-            total_score += weight
-            factors.append({
-                "key": "section_889",
-                "label": "Section 889 Compliance",
-                "weight": weight,
-                "max_points": weight,
-                "points": weight,
-                "triggered": True,
-                "reason": reason
-            })
-        elif s889_status == "CONDITIONAL":
-            weight = s889_cond_weight
-            reason = context.get("section_889_reason") or sanctions_rules.get("section_889_conditional", {}).get("reason", "Section 889 Conditional")
+        return _score(context, rules or ScoringEngine.rules())
+
+    @staticmethod
+    def calculate_risk_scores_batch(
+        contexts: Sequence[Dict[str, Any]],
+        rules: Optional[ScoringRules] = None,
+    ) -> "ScoreBatch":
+        """
+        Vectorized ``calculate_risk_score`` for many contexts (portfolio
+        rescoring, what-if analysis). Scores and statuses are computed over
+        NumPy arrays; factor breakdowns are only built for the rows asked for.
+        """
+        return score_batch(contexts, rules or ScoringEngine.rules())
+
+
+def _score(context: Dict[str, Any], rules: ScoringRules) -> Tuple[int, str, List[Dict[str, Any]], str]:
+    total_score = 0
+    factors = []
+
+    # 1. Sanctions Risk
+    if context.get("sanctions_hit"):
+        weight, reason = rules.sanctions_hit
+        total_score += weight
+        factors.append({
+            "key": "sanctions",
+            "label": "Sanctions & Watchlists",
+            "weight": weight,
+            "max_points": weight,
+            "points": weight,
+            "triggered": True,
+            "reason": reason
+        })
+
+    # Lists that could not be screened (timeout / unavailable)
+    skipped = context.get("sanctions_incomplete")
+    if skipped:
+        factors.append({
+            "key": "sanctions_coverage",
+            "label": "Sanctions Screening Coverage",
+            "weight": 0,
+            "max_points": 0,
+            "points": 0,
+            "triggered": True,
+            "reason": f"Not screened against: {', '.join(skipped)}"
+        })
+
+    # Section 889
+    s889_status = context.get("section_889_status")
+    if s889_status in ("FAIL", "CONDITIONAL"):
+        weight, default_reason = rules.section_889_fail if s889_status == "FAIL" else rules.section_889_conditional
+        total_score += weight
+        factors.append({
+            "key": "section_889",
+            "label": "Section 889 Compliance",
+            "weight": weight,
+            "max_points": weight,
+            "points": weight,
+            "triggered": True,
+            "reason": context.get("section_889_reason") or default_reason
+        })
+
+    # 2. Geographic Risk
+    country = (context.get("country") or "").upper()
+    if country:
+        level = rules.countries.get(country)
+        if level:
+            weight, reason = level
             total_score += weight
             factors.append({
-                "key": "section_889",
-                "label": "Section 889 Compliance",
+                "key": "geographic_risk",
+                "label": "Geographic Risk",
                 "weight": weight,
                 "max_points": weight,
                 "points": weight,
                 "triggered": True,
-                "reason": reason
+                "reason": f"({country}) {reason or f'Risk from jurisdiction {country}'}"
             })
-
-        # 2. Geographic Risk
-        geo_rules = rules.get("geographic_risk", {})
-        country = context.get("country", "").upper()
-        if country:
-            country_matched = False
-            for level, data in geo_rules.items():
-                if country in data.get("countries", []):
-                    weight = data.get("weight", 0)
-                    reason = data.get("reason", f"Risk from jurisdiction {country}")
-                    total_score += weight
-                    factors.append({
-                        "key": "geographic_risk",
-                        "label": "Geographic Risk",
-                        "weight": weight,
-                        "max_points": weight,
-                        "points": weight,
-                        "triggered": True,
-                        "reason": f"({country}) {reason}"
-                    })
-                    country_matched = True
-                    break
-            
-            if not country_matched:
-                factors.append({
-                    "key": "geographic_risk",
-                    "label": "Geographic Risk",
-                    "weight": 0,
-                    "max_points": 40,
-                    "points": 0,
-                    "triggered": False,
-                    "reason": "Entity not in a high or medium risk jurisdiction"
-                })
         else:
-             factors.append({
+            factors.append({
                 "key": "geographic_risk",
                 "label": "Geographic Risk",
                 "weight": 0,
                 "max_points": 40,
                 "points": 0,
                 "triggered": False,
-                "reason": "Country information unavailable"
+                "reason": "Entity not in a high or medium risk jurisdiction"
             })
+    else:
+        factors.append({
+            "key": "geographic_risk",
+            "label": "Geographic Risk",
+            "weight": 0,
+            "max_points": 40,
+            "points": 0,
+            "triggered": False,
+            "reason": "Country information unavailable"
+        })
 
-        # 3. Data Gaps
-        data_gaps_rules = rules.get("data_gaps", {})
-        gap_points = 0
-        gap_reasons = []
-        
-        if context.get("unknown_sub_tiers"):
-            weight = data_gaps_rules.get("unknown_sub_tiers", {}).get("weight", 15)
-            gap_points += weight
-            gap_reasons.append(data_gaps_rules.get("unknown_sub_tiers", {}).get("reason", "Unknown sub-tiers"))
-            
-        if not context.get("address"):
-            weight = data_gaps_rules.get("missing_address", {}).get("weight", 5)
-            gap_points += weight
-            gap_reasons.append(data_gaps_rules.get("missing_address", {}).get("reason", "Missing address"))
-            
-        if not context.get("industry"):
-            weight = data_gaps_rules.get("missing_industry", {}).get("weight", 5)
-            gap_points += weight
-            gap_reasons.append(data_gaps_rules.get("missing_industry", {}).get("reason", "Missing industry"))
-            
-        if gap_points > 0:
-            total_score += gap_points
-            factors.append({
-                "key": "data_gaps",
-                "label": "Data Gaps",
-                "weight": gap_points,
-                "max_points": 25,
-                "points": gap_points,
-                "triggered": True,
-                "reason": "; ".join(gap_reasons)
-            })
-        else:
-             factors.append({
-                "key": "data_gaps",
-                "label": "Data Gaps",
-                "weight": 0,
-                "max_points": 25,
-                "points": 0,
-                "triggered": False,
-                "reason": "Sufficient data profile available"
-            })
+    # 3. Data Gaps
+    gaps = []
+    if context.get("unknown_sub_tiers"):
+        gaps.append(rules.unknown_sub_tiers)
+    if not context.get("address"):
+        gaps.append(rules.missing_address)
+    if not context.get("industry"):
+        gaps.append(rules.missing_industry)
+    gap_points = sum(weight for weight, _ in gaps)
 
-        # 4. Adverse News
-        news_rules = rules.get("adverse_news", {})
-        news_signal_score = context.get("news_signal_score", 0)
-        
-        if news_signal_score > 0:
-            assigned_weight = 0
-            assigned_reason = ""
-            for level in ["severe", "moderate", "minor"]:
-                data = news_rules.get(level, {})
-                if news_signal_score >= data.get("threshold", 999):
-                    assigned_weight = data.get("weight", 0)
-                    assigned_reason = data.get("reason", "Adverse news found")
-                    break
-            
-            if assigned_weight > 0:
-                total_score += assigned_weight
-                factors.append({
-                    "key": "adverse_news",
-                    "label": "Negative Media Signal",
-                    "weight": assigned_weight,
-                    "max_points": news_rules.get("severe", {}).get("weight", 50),
-                    "points": assigned_weight,
-                    "triggered": True,
-                    "reason": f"(Raw Signal: {news_signal_score}) {assigned_reason}"
-                })
-        else:
+    if gap_points > 0:
+        total_score += gap_points
+        factors.append({
+            "key": "data_gaps",
+            "label": "Data Gaps",
+            "weight": gap_points,
+            "max_points": 25,
+            "points": gap_points,
+            "triggered": True,
+            "reason": "; ".join(reason for _, reason in gaps)
+        })
+    else:
+        factors.append({
+            "key": "data_gaps",
+            "label": "Data Gaps",
+            "weight": 0,
+            "max_points": 25,
+            "points": 0,
+            "triggered": False,
+            "reason": "Sufficient data profile available"
+        })
+
+    # 4. Adverse News
+    news_signal_score = context.get("news_signal_score", 0)
+    if news_signal_score > 0:
+        tier = next((t for t in rules.news_tiers if news_signal_score >= t[0]), None)
+        if tier and tier[1] > 0:
+            _, weight, reason = tier
+            total_score += weight
             factors.append({
                 "key": "adverse_news",
                 "label": "Negative Media Signal",
-                "weight": 0,
-                "max_points": news_rules.get("severe", {}).get("weight", 50),
-                "points": 0,
-                "triggered": False,
-                "reason": "No adverse media signaling detected"
+                "weight": weight,
+                "max_points": rules.news_max_points,
+                "points": weight,
+                "triggered": True,
+                "reason": f"(Raw Signal: {news_signal_score}) {reason}"
             })
+    else:
+        factors.append({
+            "key": "adverse_news",
+            "label": "Negative Media Signal",
+            "weight": 0,
+            "max_points": rules.news_max_points,
+            "points": 0,
+            "triggered": False,
+            "reason": "No adverse media signaling detected"
+        })
 
-        # 5. Network Risk (Graph)
-        network_rules = rules.get("network_risk", {})
-        graph_risk_score = context.get("graph_risk_score", 0)
-        
-        if graph_risk_score > 0:
-            assigned_weight = 0
-            assigned_reason = ""
-            for level in ["high_impact", "medium_impact"]:
-                data = network_rules.get(level, {})
-                if graph_risk_score >= data.get("threshold", 999):
-                    assigned_weight = data.get("weight", 0)
-                    assigned_reason = data.get("reason", "Network exposure detected")
-                    break
-                    
-            if assigned_weight > 0:
-                 total_score += assigned_weight
-                 factors.append({
-                     "key": "network_risk",
-                     "label": "Network & Graph Risk",
-                     "weight": assigned_weight,
-                     "max_points": network_rules.get("high_impact", {}).get("weight", 50),
-                     "points": assigned_weight,
-                     "triggered": True,
-                     "reason": f"(Graph Risk: {graph_risk_score}) {assigned_reason}"
-                 })
-        else:
+    # 5. Network Risk (Graph)
+    graph_risk_score = context.get("graph_risk_score", 0)
+    if graph_risk_score > 0:
+        tier = next((t for t in rules.network_tiers if graph_risk_score >= t[0]), None)
+        if tier and tier[1] > 0:
+            _, weight, reason = tier
+            total_score += weight
             factors.append({
-                 "key": "network_risk",
-                 "label": "Network & Graph Risk",
-                 "weight": 0,
-                 "max_points": network_rules.get("high_impact", {}).get("weight", 50),
-                 "points": 0,
-                 "triggered": False,
-                 "reason": "No elevated risk from entity network relationships"
-             })
-
-        # Cap the total score
-        max_score = yaml_config.get("max_score", 100)
-        total_score = min(total_score, max_score)
-
-        # Determine overall status
-        status = "PASS"
-        if total_score >= yaml_config.get("thresholds", {}).get("fail", 75):
-            status = "FAIL"
-        elif total_score >= yaml_config.get("thresholds", {}).get("conditional", 40):
-            status = "CONDITIONAL"
-
-        return total_score, status, factors, yaml_config.get("version", "unknown")
+                "key": "network_risk",
+                "label": "Network & Graph Risk",
+                "weight": weight,
+                "max_points": rules.network_max_points,
+                "points": weight,
+                "triggered": True,
+                "reason": f"(Graph Risk: {graph_risk_score}) {reason}"
+            })
+    else:
+        factors.append({
+            "key": "network_risk",
+            "label": "Network & Graph Risk",
+            "weight": 0,
+            "max_points": rules.network_max_points,
+            "points": 0,
+            "triggered": False,
+            "reason": "No elevated risk from entity network relationships"
+        })
+
+    # Cap the total score
+    total_score = min(total_score, rules.max_score)
+
+    # Determine overall status
+    status = "PASS"
+    if total_score >= rules.fail_threshold:
+        status = "FAIL"
+    elif total_score >= rules.conditional_threshold:
+        status = "CONDITIONAL"
+
+    # An incomplete sanctions screening never clears a supplier
+    if status == "PASS" and skipped:
+        status = "CONDITIONAL"
+
+    return total_score, status, factors, rules.version
+
+
+# =====================================================
+# BATCH SCORING
+# =====================================================
+
+@dataclass(frozen=True)
+class ScoreBatch:
+    """Scores and statuses of a batch, aligned with ``contexts``; ``batch[i]`` is the full result of row i."""
+    contexts: Sequence[Dict[str, Any]]
+    rules: ScoringRules
+    scores: np.ndarray
+    statuses: np.ndarray
+    _results: Dict[int, Tuple] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.contexts)
+
+    def __getitem__(self, i: int) -> Tuple[int, str, List[Dict[str, Any]], str]:
+        """(total_score, status, detailed_breakdown, version), identical to calculate_risk_score."""
+        if i not in self._results:
+            self._results[i] = _score(self.contexts[i], self.rules)
+        return self._results[i]
+
+    def breakdown(self, i: int) -> List[Dict[str, Any]]:
+        return self[i][2]
+
+
+def _tier_points(values: np.ndarray, tiers: Tuple[Tuple[float, int, str], ...]) -> np.ndarray:
+    # Tiers are sorted highest threshold first, so np.select's first match is the right tier
+    points = np.select([values >= threshold for threshold, _, _ in tiers], [w for _, w, _ in tiers], default=0)
+    return np.where(values > 0, points, 0)
+
+
+def score_batch(contexts: Sequence[Dict[str, Any]], rules: ScoringRules) -> ScoreBatch:
+    countries = rules.countries
+    s889_weights = {
+        "FAIL": rules.section_889_fail[0],
+        "CONDITIONAL": rules.section_889_conditional[0],
+    }
+
+    # Pack the context fields into arrays
+    sanctions = np.fromiter((bool(c.get("sanctions_hit")) for c in contexts), bool, len(contexts))
+    s889 = np.fromiter((s889_weights.get(c.get("section_889_status"), 0) for c in contexts), float, len(contexts))
+    geographic = np.fromiter(
+        (countries.get((c.get("country") or "").upper(), (0,))[0] for c in contexts), float, len(contexts)
+    )
+    unknown_sub_tiers = np.fromiter((bool(c.get("unknown_sub_tiers")) for c in contexts), bool, len(contexts))
+    missing_address = np.fromiter((not c.get("address") for c in contexts), bool, len(contexts))
+    missing_industry = np.fromiter((not c.get("industry") for c in contexts), bool, len(contexts))
+    news = np.fromiter((c.get("news_signal_score") or 0 for c in contexts), float, len(contexts))
+    graph = np.fromiter((c.get("graph_risk_score") or 0 for c in contexts), float, len(contexts))
+
+    totals = (
+        sanctions * rules.sanctions_hit[0]
+        + s889
+        + geographic
+        + unknown_sub_tiers * rules.unknown_sub_tiers[0]
+        + missing_address * rules.missing_address[0]
+        + missing_industry * rules.missing_industry[0]
+        + _tier_points(news, rules.news_tiers)
+        + _tier_points(graph, rules.network_tiers)
+    )
+    scores = np.minimum(totals, rules.max_score)
+
+    incomplete = np.fromiter((bool(c.get("sanctions_incomplete")) for c in contexts), bool, len(contexts))
+    statuses = np.where(
+        scores >= rules.fail_threshold,
+        "FAIL",
+        np.where((scores >= rules.conditional_threshold) | incomplete, "CONDITIONAL", "PASS"),
+    )
+    return ScoreBatch(contexts, rules, scores, statuses)
+
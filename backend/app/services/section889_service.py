@@ -1,43 +1,183 @@
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from rapidfuzz import fuzz
-from app.models import Supplier, CoveredEntity
+from app.models import Supplier, SupplierEntityLink, GlobalEntity, CoveredEntity
+from app.graph.graph_client import get_session
+from app.screening.covered_matcher import covered_matcher
 
 
 HIGH_RISK_COUNTRIES = ["China", "Russia", "Iran", "North Korea"]
 
 
-def evaluate_section_889(supplier_id: int, db: Session):
-    supplier = db.query(Supplier).filter_by(id=supplier_id).first()
+# =====================================================
+# RELATIONAL LOOKUPS
+# =====================================================
 
-    if not supplier:
-        return {"error": "Supplier not found"}
+def _linked_entities(supplier_ids: list[int], db: Session) -> dict[int, str]:
+    """supplier_id -> canonical name of the GlobalEntity it resolves to."""
+    return {
+        supplier_id: canonical_name
+        for supplier_id, canonical_name in (
+            db.query(SupplierEntityLink.supplier_id, GlobalEntity.canonical_name)
+            .join(GlobalEntity, SupplierEntityLink.entity_id == GlobalEntity.id)
+            .filter(SupplierEntityLink.supplier_id.in_(supplier_ids))
+        )
+    }
 
-    # Rule 1: Covered Entity Match
-    covered_entities = db.query(CoveredEntity).all()
 
-    for entity in covered_entities:
-        score = fuzz.token_set_ratio(
-            supplier.name.lower(),
-            entity.name.lower()
-        )
+def _related_entities(canonical_names: list[str]) -> dict[str, dict[str, str]]:
+    """Graph parents / subsidiaries per entity: {name: {related name: "parent" | "subsidiary"}}."""
+    related: dict[str, dict[str, str]] = {}
+    if not canonical_names:
+        return related
+    try:
+        with get_session() as session:
+            result = session.run(
+                """
+                UNWIND $names AS name
+                MATCH (e:GlobalEntity {canonical_name: name})
+                      -[r:RELATION {type:'SUBSIDIARY_OF'}]-
+                      (other:GlobalEntity)
+                RETURN name,
+                       other.canonical_name AS related,
+                       CASE WHEN startNode(r) = e THEN 'parent' ELSE 'subsidiary' END AS relation
+                """,
+                names=canonical_names,
+            )
+            for r in result:
+                if r["related"] != r["name"]:
+                    related.setdefault(r["name"], {}).setdefault(r["related"], r["relation"])
+    except Exception as e:
+        print(f"⚠️ Graph relation fetch failed for Section 889: {e}")
+    return related
+
+
+def _covered_designations(supplier_ids: list[int], related_names: set[str], db: Session):
+    """
+    One indexed query for the covered designations of every supplier's linked
+    entity and of every related entity: rows of
+    (canonical_name, designation, supplier_id or None).
+    """
+    link_match = and_(
+        SupplierEntityLink.entity_id == GlobalEntity.id,
+        SupplierEntityLink.supplier_id.in_(supplier_ids),
+    )
+    conditions = [SupplierEntityLink.id.isnot(None)]
+    if related_names:
+        conditions.append(GlobalEntity.canonical_name.in_(related_names))
+
+    return (
+        db.query(GlobalEntity.canonical_name, CoveredEntity.designation, SupplierEntityLink.supplier_id)
+        .join(CoveredEntity, CoveredEntity.entity_id == GlobalEntity.id)
+        .outerjoin(SupplierEntityLink, link_match)
+        .filter(or_(*conditions))
+        .order_by(CoveredEntity.id)
+        .all()
+    )
+
+
+# =====================================================
+# SECTION 889 EVALUATION
+# =====================================================
+
+def _fail(supplier: Supplier, reason: str, designation: str, matched_via: str) -> dict:
+    return {
+        "supplier": supplier.name,
+        "section_889_status": "FAIL",
+        "reason": reason,
+        "designation": designation,
+        "matched_via": matched_via,
+    }
+
+
+def _evaluate(suppliers: list[Supplier], db: Session) -> dict[int, dict]:
+    """
+    Section 889 results for a batch of suppliers: one link query, one graph
+    query, one covered-entity join and one in-memory fuzzy pass for the
+    suppliers the joins did not flag.
+    """
+    supplier_ids = [s.id for s in suppliers]
+
+    # Rule 1a: Covered Entity via the resolved entity and its graph
+    # parents / subsidiaries (indexed joins)
+    linked = _linked_entities(supplier_ids, db)
+    related = _related_entities(list(set(linked.values())))
+    related_names = {name for relations in related.values() for name in relations}
 
-        if score > 80:
-            return {
+    direct: dict[int, tuple] = {}
+    covered_by_name: dict[str, tuple] = {}
+    for row in _covered_designations(supplier_ids, related_names, db):
+        if row.supplier_id is not None:
+            direct.setdefault(row.supplier_id, row)
+        covered_by_name.setdefault(row.canonical_name, row)
+
+    results: dict[int, dict] = {}
+    for supplier in suppliers:
+        row = direct.get(supplier.id)
+        if row:
+            results[supplier.id] = _fail(
+                supplier, f"Matches covered entity: {row.canonical_name}", row.designation, "entity_link"
+            )
+            continue
+
+        relations = related.get(linked.get(supplier.id), {})
+        name = next((n for n in relations if n in covered_by_name), None)
+        if name:
+            relation = relations[name]
+            results[supplier.id] = _fail(
+                supplier,
+                f"{relation.capitalize()} entity is a covered entity: {name}",
+                covered_by_name[name].designation,
+                relation,
+            )
+
+    # Rule 1b: Fuzzy covered-entity match for every supplier the joins did not
+    # flag; a supplier can resolve to a different entity than the covered
+    # one its name resembles
+    remaining = [s for s in suppliers if s.id not in results]
+    matches = covered_matcher.match_bulk([s.name for s in remaining], db) if remaining else []
+
+    for supplier, match in zip(remaining, matches):
+        if match:
+            results[supplier.id] = _fail(
+                supplier, f"Matches covered entity: {match.name}", match.designation, "fuzzy"
+            )
+            continue
+
+        # Rule 2: High Risk Country
+        if supplier.country in HIGH_RISK_COUNTRIES:
+            results[supplier.id] = {
                 "supplier": supplier.name,
-                "section_889_status": "FAIL",
-                "reason": f"Matches covered entity: {entity.name}"
+                "section_889_status": "CONDITIONAL",
+                "reason": f"Supplier located in high-risk country: {supplier.country}"
             }
+            continue
 
-    # Rule 2: High Risk Country
-    if supplier.country in HIGH_RISK_COUNTRIES:
-        return {
+        results[supplier.id] = {
             "supplier": supplier.name,
-            "section_889_status": "CONDITIONAL",
-            "reason": f"Supplier located in high-risk country: {supplier.country}"
+            "section_889_status": "PASS",
+            "reason": "No Section 889 risk indicators found"
         }
 
-    return {
-        "supplier": supplier.name,
-        "section_889_status": "PASS",
-        "reason": "No Section 889 risk indicators found"
-    }
+    return results
+
+
+def evaluate_section_889(supplier_id: int, db: Session):
+    supplier = db.query(Supplier).filter_by(id=supplier_id).first()
+
+    if not supplier:
+        return {"error": "Supplier not found"}
+
+    return _evaluate([supplier], db)[supplier.id]
+
+
+def evaluate_section_889_bulk(supplier_ids: list[int], db: Session) -> dict[int, dict]:
+    """
+    Batched ``evaluate_section_889`` (portfolio rescoring): suppliers are
+    loaded in one query and evaluated together. Returns supplier_id ->
+    result; unknown ids are omitted.
+    """
+    if not supplier_ids:
+        return {}
+
+    suppliers = db.query(Supplier).filter(Supplier.id.in_(set(supplier_ids))).all()
+    return _evaluate(suppliers, db)
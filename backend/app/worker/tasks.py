@@ -1,21 +1,32 @@
 import json
 import logging
 import time
+from celery.signals import worker_process_init
 from app.worker.celery_app import celery_app, redis_client
 from app.database import SessionLocal
 from app.services.assessment_service import run_assessment
+from app.services.public_data_service import sanctions_store, SCREENING_SERVICE_URL
 
 logger = logging.getLogger(__name__)
 
+
+@worker_process_init.connect
+def warm_sanctions_snapshots(**kwargs):
+    # Each forked worker loads the sanctions lists once, not once per screening.
+    # With a screening daemon the lists are only loaded here if it goes away.
+    if not SCREENING_SERVICE_URL:
+        sanctions_store.warm()
+
+
 @celery_app.task(bind=True, name="run_assessment_task")
-def run_assessment_task(self, supplier_id: int, user_id: int):
+def run_assessment_task(self, supplier_id: int, user_id: int | None, trigger: dict | None = None):
     # This task gets executed in the background for <= 2-3 mins SLA
     db = SessionLocal()
     try:
         # We can add an artificial delay to simulate heavy scraping or crawling here,
         # but the real system implies run_assessment carries out network tasks
         
-        result = run_assessment(supplier_id=supplier_id, db=db, user_id=user_id)
+        result = run_assessment(supplier_id=supplier_id, db=db, user_id=user_id, trigger=trigger)
         
         # Once complete, cache the payload in Redis to fulfill the <= 1 second response SLA
         cache_key = f"assessment:cached:{supplier_id}"
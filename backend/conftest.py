@@ -0,0 +1,57 @@
+import os
+import tempfile
+from datetime import datetime
+
+import pytest
+
+# Tests never touch the app's own database, index files or Redis
+_TEST_DIR = tempfile.mkdtemp(prefix="vdashboard-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}"
+os.environ["SANCTIONS_INDEX_DIR"] = os.path.join(_TEST_DIR, "sanctions_index")
+os.environ["SCREENING_CACHE_REDIS_URL"] = ""
+os.environ["SCREENING_SERVICE_URL"] = ""
+
+
+@pytest.fixture
+def install_list(monkeypatch):
+    """Serve ``names`` as the current snapshot of ``list_name`` without downloading anything."""
+    from app.core.normalization import normalize_name
+    from app.screening.name_index import NameIndex
+    from app.screening.sanctions_store import ListSnapshot, SanctionsRecord, sanctions_store
+
+    def install(list_name: str, names: list[str], version: str = "test") -> ListSnapshot:
+        records = tuple(
+            SanctionsRecord(name=name, normalized_name=normalize_name(name), details={"program": "TEST"})
+            for name in names
+        )
+        snapshot = ListSnapshot(
+            source=list_name,
+            version=f"{version}-{len(records)}",
+            records=records,
+            fetched_at=datetime.utcnow(),
+            index=NameIndex([r.normalized_name for r in records]),
+        )
+        monkeypatch.setitem(sanctions_store._snapshots, list_name, snapshot)
+        return snapshot
+
+    return install
+
+
+@pytest.fixture
+def db():
+    """Session on a freshly created schema; process-local caches start empty."""
+    import app.models  # noqa: F401  (register every table)
+    from app.database import Base, SessionLocal, engine
+    from app.screening.covered_matcher import covered_matcher
+    from app.services.entity_cache import entity_cache
+    from app.services.entity_matching_service import _memory_index
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    entity_cache.clear()
+    covered_matcher.invalidate()
+    _memory_index.invalidate()
+
+    session = SessionLocal()
+    yield session
+    session.close()
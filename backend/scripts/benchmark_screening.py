@@ -0,0 +1,183 @@
+"""
+Benchmark the in-memory and Postgres (pg_trgm) screening engines.
+
+Builds synthetic sanctions lists of 10k, 100k and 1M names (override with
+``--sizes``), screens the same query set through both engines and reports
+build / load time, per-query latency (p50 / p95) and each engine's recall
+at MATCH_THRESHOLD against brute force: every record scored, as
+public_data_service._screen_list_exhaustive does (cdist pre-filter, exact
+re-score; the slowest step at 1M names). Queries are listed names,
+single-edit variants of them, and names not on the list.
+
+The Postgres engine is only benchmarked when DATABASE_URL points at
+Postgres (with the sanctions_names migration applied); its benchmark rows
+are removed afterwards.
+
+    PYTHONPATH=. python scripts/benchmark_screening.py --sizes 10000 100000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from rapidfuzz import fuzz, process
+
+from app.core.normalization import normalize_name
+from app.database import DATABASE_URL, engine
+from app.screening.name_index import NameIndex
+from app.screening.sanctions_store import ListSnapshot, SanctionsRecord
+from app.services.public_data_service import MATCH_THRESHOLD
+
+QUERIES = 300
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+_SUFFIXES = ["co", "ltd", "llc", "inc", "group", "trading", "bank", "industries", "holdings", "company"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(3, 9)))
+
+
+def _perturb(name: str, rng: random.Random) -> str:
+    chars = list(name)
+    pos = rng.randrange(len(chars))
+    chars[pos] = rng.choice(_ALPHABET)
+    return "".join(chars)
+
+
+def build_snapshot(size: int, rng: random.Random) -> ListSnapshot:
+    # Zipf-like vocabulary so common tokens behave like real lists
+    vocab = [_word(rng) for _ in range(max(1000, size // 4))]
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(len(vocab))]
+
+    records = []
+    for i in range(size):
+        tokens = rng.choices(vocab, weights=weights, k=rng.randint(1, 4))
+        if rng.random() < 0.6:
+            tokens.append(rng.choice(_SUFFIXES))
+        name = " ".join(tokens).upper()
+        records.append(SanctionsRecord(name=name, normalized_name=normalize_name(name), details={"program": f"P{i % 40}"}))
+
+    return ListSnapshot(
+        source=f"BENCH {size}",
+        version=f"bench-{size}-{rng.random():.6f}",
+        records=records,
+        fetched_at=datetime.utcnow(),
+    )
+
+
+def build_queries(snapshot: ListSnapshot, rng: random.Random) -> list[str]:
+    sample = rng.sample(list(snapshot.records), QUERIES // 3)
+    queries = [r.normalized_name for r in sample]
+    queries += [_perturb(r.normalized_name, rng) for r in sample]
+    queries += [f"{_word(rng)} {_word(rng)} {rng.choice(_SUFFIXES)}" for _ in range(QUERIES - len(queries))]
+    return queries
+
+
+def _latency(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"p50 {statistics.median(ordered) * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms"
+
+
+def _score(query: str, records) -> set[tuple[str, float]]:
+    hits = set()
+    for record in records:
+        score = fuzz.token_set_ratio(query, record.normalized_name)
+        if score >= MATCH_THRESHOLD:
+            hits.add((record.normalized_name, score))
+    return hits
+
+
+def exhaustive_hits(snapshot: ListSnapshot, queries: list[str]) -> dict[str, set]:
+    """Brute-force reference: the hits _screen_list_exhaustive finds for each query."""
+    started = time.perf_counter()
+    choices = [r.normalized_name for r in snapshot.records]
+    matrix = process.cdist(queries, choices, scorer=fuzz.token_set_ratio, score_cutoff=MATCH_THRESHOLD - 0.5, workers=-1)
+
+    reference: dict[str, set] = {q: set() for q in queries}
+    rows, cols = matrix.nonzero()
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        score = fuzz.token_set_ratio(queries[row], choices[col])
+        if score >= MATCH_THRESHOLD:
+            reference[queries[row]].add((choices[col], score))
+
+    print(f"  exhaustive {time.perf_counter() - started:6.2f} s  hits {sum(len(h) for h in reference.values())}")
+    return reference
+
+
+def _recall(reference: dict[str, set], results: dict[str, set]) -> float:
+    expected = sum(len(h) for h in reference.values())
+    found = sum(len(reference[q] & results[q]) for q in reference)
+    return found / expected if expected else 1.0
+
+
+def bench_memory(snapshot: ListSnapshot, queries: list[str], reference: dict[str, set]):
+    started = time.perf_counter()
+    index = NameIndex([r.normalized_name for r in snapshot.records])
+    print(f"  memory   build {time.perf_counter() - started:8.2f} s")
+
+    records = snapshot.records
+    results, timings = {}, []
+    for query in queries:
+        started = time.perf_counter()
+        results[query] = _score(query, (records[i] for i in index.candidates(query, MATCH_THRESHOLD)))
+        timings.append(time.perf_counter() - started)
+
+    print(f"  memory   {_latency(timings)}  hits {sum(len(h) for h in results.values())}  "
+          f"recall {_recall(reference, results):.3f}")
+
+
+def bench_postgres(snapshot: ListSnapshot, queries: list[str], reference: dict[str, set]):
+    from sqlalchemy import text
+    from app.screening import pg_engine
+
+    try:
+        started = time.perf_counter()
+        pg_engine.sync_snapshot(snapshot)
+        print(f"  postgres load  {time.perf_counter() - started:8.2f} s")
+
+        results, timings = {}, []
+        for query in queries:
+            started = time.perf_counter()
+            results[query] = _score(query, pg_engine.candidates(snapshot, query))
+            timings.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        pg_engine.candidates_bulk(snapshot, queries)
+        bulk = time.perf_counter() - started
+
+        print(f"  postgres {_latency(timings)}  hits {sum(len(h) for h in results.values())}  "
+              f"recall {_recall(reference, results):.3f}  bulk {bulk:.2f} s / {len(queries)} names")
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM sanctions_names WHERE list_name = :l"), {"l": snapshot.source})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    use_postgres = "postgresql" in DATABASE_URL
+    if not use_postgres:
+        print("DATABASE_URL is not Postgres: benchmarking the in-memory engine only")
+
+    for size in args.sizes:
+        rng = random.Random(size)
+        snapshot = build_snapshot(size, rng)
+        queries = build_queries(snapshot, rng)
+        print(f"\n{size:,} names, {len(queries)} queries")
+
+        reference = exhaustive_hits(snapshot, queries)
+        bench_memory(snapshot, queries, reference)
+        if use_postgres:
+            bench_postgres(snapshot, queries, reference)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Re-normalize stored names after a change to app.core.normalization.
+
+Recomputes suppliers.normalized_name, global_entities.normalized_name,
+global_entity_aliases.normalized_alias and
+entity_match_candidates.normalized_name with the current normalizer and
+writes back only the rows that changed, in batches.
+
+Suppliers whose new name would collide with another supplier of the same
+organization and country (uq_supplier_org_normalized) are left unchanged
+and reported. Global entities that now share a normalized name are
+reported too; merging them is left to entity clustering.
+
+Usage:
+    PYTHONPATH=. python scripts/renormalize_names.py [--dry-run]
+"""
+
+import sys
+from collections import defaultdict
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.core.normalization import NORMALIZER_VERSION, normalize_names
+from app.database import SessionLocal
+from app.models import EntityMatchCandidate, GlobalEntity, GlobalEntityAlias, Supplier
+from app.services.entity_cache import entity_cache
+
+
+BATCH_SIZE = 1000
+
+
+def _changed(rows, name_attr: str, stored_attr: str) -> list[dict]:
+    normalized = normalize_names([getattr(r, name_attr) for r in rows])
+    return [
+        {"id": r.id, stored_attr: norm}
+        for r, norm in zip(rows, normalized)
+        if norm != getattr(r, stored_attr)
+    ]
+
+
+def _write(db, model, updates: list[dict], dry_run: bool):
+    if dry_run:
+        return
+    for i in range(0, len(updates), BATCH_SIZE):
+        db.bulk_update_mappings(model, updates[i:i + BATCH_SIZE])
+        db.commit()
+
+
+def renormalize_suppliers(db, dry_run: bool) -> int:
+    rows = db.query(
+        Supplier.id, Supplier.name, Supplier.normalized_name, Supplier.organization_id, Supplier.country
+    ).all()
+    by_id = {r.id: r for r in rows}
+    updates = _changed(rows, "name", "normalized_name")
+    new_names = {u["id"]: u["normalized_name"] for u in updates}
+
+    # A supplier keeps its old name when its new key would collide
+    owners = defaultdict(list)
+    for r in rows:
+        owners[(r.organization_id, new_names.get(r.id, r.normalized_name), r.country)].append(r.id)
+
+    collisions = {
+        supplier_id
+        for ids in owners.values() if len(ids) > 1
+        for supplier_id in ids if supplier_id in new_names
+    }
+    for supplier_id in sorted(collisions):
+        r = by_id[supplier_id]
+        print(f"  ⚠️ supplier {r.id} '{r.name}': '{new_names[r.id]}' collides in org {r.organization_id} / {r.country}, skipped")
+
+    updates = [u for u in updates if u["id"] not in collisions]
+    _write(db, Supplier, updates, dry_run)
+    return len(updates)
+
+
+def renormalize_entities(db, dry_run: bool) -> int:
+    rows = db.query(GlobalEntity.id, GlobalEntity.canonical_name, GlobalEntity.normalized_name).all()
+    updates = _changed(rows, "canonical_name", "normalized_name")
+    new_names = {u["id"]: u["normalized_name"] for u in updates}
+
+    groups = defaultdict(list)
+    for r in rows:
+        groups[new_names.get(r.id, r.normalized_name)].append(r.id)
+    for norm, ids in groups.items():
+        if len(ids) > 1 and any(i in new_names for i in ids):
+            print(f"  ℹ️ entities {ids} now share '{norm}' (left for entity clustering)")
+
+    _write(db, GlobalEntity, updates, dry_run)
+    return len(updates)
+
+
+def renormalize_aliases(db, dry_run: bool) -> int:
+    rows = db.query(GlobalEntityAlias.id, GlobalEntityAlias.alias, GlobalEntityAlias.normalized_alias).all()
+    updates = _changed(rows, "alias", "normalized_alias")
+    _write(db, GlobalEntityAlias, updates, dry_run)
+    return len(updates)
+
+
+def renormalize_match_candidates(db, dry_run: bool) -> int:
+    rows = db.query(EntityMatchCandidate.id, EntityMatchCandidate.name, EntityMatchCandidate.normalized_name).all()
+    updates = _changed(rows, "name", "normalized_name")
+    _write(db, EntityMatchCandidate, updates, dry_run)
+    return len(updates)
+
+
+def main(dry_run: bool = False):
+    db = SessionLocal()
+    try:
+        print(f"Re-normalizing stored names (normalizer v{NORMALIZER_VERSION}{', dry run' if dry_run else ''})")
+        print(f"suppliers:               {renormalize_suppliers(db, dry_run)} updated")
+        print(f"global_entities:         {renormalize_entities(db, dry_run)} updated")
+        print(f"global_entity_aliases:   {renormalize_aliases(db, dry_run)} updated")
+        print(f"entity_match_candidates: {renormalize_match_candidates(db, dry_run)} updated")
+    finally:
+        db.close()
+
+    # Bulk updates bypass the ORM invalidation hooks
+    entity_cache.clear()
+
+
+if __name__ == "__main__":
+    main(dry_run="--dry-run" in sys.argv)
@@ -2,7 +2,7 @@ import pandas as pd
 from sqlalchemy.exc import IntegrityError
 from app.database import SessionLocal
 from app.models import Supplier
-from app.services.entity_resolution_service import normalize
+from app.core.normalization import normalize_names
 
 
 def seed():
@@ -14,12 +14,14 @@ def seed():
         print(f"Failed to read CSV: {e}")
         return
 
+    df["normalized_name"] = normalize_names(df["name"])
+
     inserted = 0
     skipped = 0
 
     for _, row in df.iterrows():
 
-        normalized_name = normalize(row["name"])
+        normalized_name = row["normalized_name"]
 
         # Prevent duplicates (based on name + country)
         exists = (
@@ -0,0 +1,85 @@
+"""
+Recall check for the sanctions blocking index.
+
+Screens a set of query names through both the indexed path
+(public_data_service._screen_list) and the brute-force path
+(_screen_list_exhaustive) and reports every hit the index missed at
+MATCH_THRESHOLD. Queries are the supplier dataset, the local sanctions /
+covered-entity seed files, and single-edit variants of names sampled from
+each live list. Exits non-zero when any hit is missed.
+"""
+
+import random
+import sys
+
+import pandas as pd
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.services.public_data_service import (
+    sanctions_store,
+    _screen_list,
+    _screen_list_exhaustive,
+)
+
+SAMPLES_PER_LIST = 500
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _perturb(name: str, rng: random.Random) -> str:
+    chars = list(name)
+    if not chars:
+        return name
+    pos = rng.randrange(len(chars))
+    op = rng.random()
+    if op < 0.33:
+        chars.insert(pos, rng.choice(_ALPHABET))
+    elif op < 0.66 and len(chars) > 1:
+        del chars[pos]
+    else:
+        chars[pos] = rng.choice(_ALPHABET)
+    return "".join(chars)
+
+
+def build_queries(rng: random.Random) -> list[str]:
+    queries: list[str] = []
+    for path in ("data/supplier_dataset_750.csv", "data/sanctions.csv", "data/covered_entities.csv"):
+        try:
+            queries.extend(pd.read_csv(path)["name"].dropna().astype(str).tolist())
+        except Exception as e:
+            print(f"Skipping {path}: {e}")
+
+    for list_name in sanctions_store.sources():
+        snapshot = sanctions_store.get(list_name)
+        if not snapshot or not snapshot.records:
+            continue
+        sample = rng.sample(snapshot.records, min(SAMPLES_PER_LIST, len(snapshot.records)))
+        queries.extend(r.name for r in sample)
+        queries.extend(_perturb(r.name, rng) for r in sample)
+
+    return queries
+
+
+def verify() -> int:
+    rng = random.Random(889)
+    queries = build_queries(rng)
+    print(f"Checking {len(queries)} queries against {sanctions_store.sources()}")
+
+    total_hits = 0
+    missed = 0
+
+    for list_name in sanctions_store.sources():
+        for query in queries:
+            expected = {(h["matched_name"], h["match_score"]) for h in _screen_list_exhaustive(list_name, query)}
+            found = {(h["matched_name"], h["match_score"]) for h in _screen_list(list_name, query)}
+            total_hits += len(expected)
+            for name, score in sorted(expected - found):
+                missed += 1
+                print(f"MISS [{list_name}] {query!r} -> {name!r} ({score:.1f})")
+
+    print(f"Brute-force hits: {total_hits}  missed by index: {missed}")
+    return 1 if missed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(verify())
@@ -0,0 +1,74 @@
+"""Entity resolution cache: what another worker's deletes and renames do to it."""
+
+from app.models import GlobalEntity, Supplier, SupplierEntityLink
+from app.services.entity_cache import bump_generation, current_generation, entity_cache
+from app.services.entity_resolution_service import (
+    resolve_entities_bulk,
+    resolve_or_create_entity,
+    resolve_supplier_entity,
+)
+
+
+def _delete_elsewhere(db, entity_id: int):
+    """What another worker's merge does: a bulk delete, invisible to this process's ORM hooks."""
+    # A later row keeps SQLite from handing the deleted id out again
+    db.add(GlobalEntity(canonical_name="Zeta Corp", normalized_name="zeta"))
+    db.flush()
+    db.execute(GlobalEntity.__table__.delete().where(GlobalEntity.__table__.c.id == entity_id))
+    bump_generation(db.connection())
+    db.commit()
+
+
+def test_cached_id_is_not_served_after_another_worker_deletes_it(db):
+    entity, _ = resolve_or_create_entity("Acme Widgets", db)
+    assert resolve_or_create_entity("Acme Widgets", db)[0] == entity
+    assert entity_cache.stats()["size"] == 1
+
+    _delete_elsewhere(db, entity.id)
+
+    fresh, _ = resolve_or_create_entity("Acme Widgets", db)
+    assert fresh.id != entity.id
+    assert db.get(GlobalEntity, fresh.id) is not None
+
+
+def test_bulk_resolution_rechecks_the_generation(db):
+    (entity, _), = resolve_entities_bulk(["Acme Widgets"], db)
+    _delete_elsewhere(db, entity.id)
+
+    (fresh, _), = resolve_entities_bulk(["Acme Widgets"], db)
+    assert fresh.id != entity.id
+    assert db.get(GlobalEntity, fresh.id) is not None
+
+
+def test_supplier_link_never_points_at_a_deleted_entity(db):
+    supplier = Supplier(name="Acme Widgets", normalized_name="acme widgets", country="US")
+    db.add(supplier)
+    db.commit()
+
+    entity = resolve_supplier_entity(supplier, db)
+    db.query(SupplierEntityLink).delete()
+    _delete_elsewhere(db, entity.id)
+
+    linked = resolve_supplier_entity(supplier, db)
+    link = db.query(SupplierEntityLink).filter_by(supplier_id=supplier.id).one()
+    assert link.entity_id == linked.id
+    assert db.get(GlobalEntity, linked.id) is not None
+
+
+def test_only_resolution_changes_bump_the_generation(db):
+    entity = GlobalEntity(canonical_name="Acme Widgets", normalized_name="acme widgets")
+    db.add(entity)
+    db.commit()
+    assert current_generation(db) == 0
+
+    entity.graph_sync_hash = "abc"
+    db.commit()
+    assert current_generation(db) == 0
+
+    entity.country = "US"
+    db.commit()
+    assert current_generation(db) == 1
+
+    db.delete(entity)
+    db.commit()
+    assert current_generation(db) == 2
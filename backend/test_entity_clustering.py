@@ -0,0 +1,138 @@
+"""Entity clustering: union-find decisions and how merges repoint rows onto the survivor."""
+
+import pytest
+
+from app.models import (
+    CoveredEntity,
+    GlobalEntity,
+    GlobalEntityAlias,
+    SanctionedEntity,
+    Supplier,
+    SupplierEntityLink,
+)
+from app.services import entity_clustering_service
+from app.services.entity_cache import current_generation
+from app.services.entity_clustering_service import MergeDecision, _UnionFind, apply_merges, cluster_new_entities
+
+
+@pytest.fixture
+def graph_merges(monkeypatch):
+    calls = []
+    monkeypatch.setattr(entity_clustering_service, "merge_global_entity_nodes", calls.append)
+    monkeypatch.setattr(entity_clustering_service, "record_covered_entity_version", lambda db: None)
+    return calls
+
+
+def _entity(db, name, normalized, country="CN", entity_type="COMPANY"):
+    entity = GlobalEntity(canonical_name=name, normalized_name=normalized, country=country, entity_type=entity_type)
+    db.add(entity)
+    db.flush()
+    return entity
+
+
+def _supplier(db, name):
+    supplier = Supplier(name=name, normalized_name=name.lower(), country="CN")
+    db.add(supplier)
+    db.flush()
+    return supplier
+
+
+# =====================================================
+# UNION-FIND
+# =====================================================
+
+def test_oldest_entity_is_the_root():
+    uf = _UnionFind()
+    for entity_id in (5, 3, 9):
+        uf.add(entity_id, "COMPANY", "CN")
+    uf.union(5, 9)
+    uf.union(9, 3)
+
+    assert uf.clusters() == [MergeDecision(survivor_id=3, merged_ids=[5, 9])]
+
+
+def test_conflicting_countries_are_never_joined_transitively():
+    uf = _UnionFind()
+    uf.add(1, "COMPANY", "CN")
+    uf.add(2, "COMPANY", None)
+    uf.add(3, "COMPANY", "US")
+
+    assert uf.union(1, 2)
+    assert not uf.union(2, 3)
+    assert uf.clusters() == [MergeDecision(survivor_id=1, merged_ids=[2])]
+
+
+# =====================================================
+# MERGING
+# =====================================================
+
+def test_merge_repoints_rows_to_the_survivor(db, graph_merges):
+    survivor = _entity(db, "Huawei Technologies Co., Ltd.", "huawei technologies")
+    merged = _entity(db, "Huawei Technologies Company", "huawei technologies company")
+    both, only_merged = _supplier(db, "Huawei"), _supplier(db, "Huawei Tech")
+
+    db.add_all([
+        SupplierEntityLink(supplier_id=both.id, entity_id=survivor.id, confidence_score=1.0),
+        SupplierEntityLink(supplier_id=both.id, entity_id=merged.id, confidence_score=0.9),
+        SupplierEntityLink(supplier_id=only_merged.id, entity_id=merged.id, confidence_score=1.0),
+        SanctionedEntity(entity_id=survivor.id, source="OFAC", program="SDN"),
+        SanctionedEntity(entity_id=merged.id, source="OFAC", program="SDN"),
+        SanctionedEntity(entity_id=merged.id, source="BIS", program="Entity List"),
+        CoveredEntity(entity_id=merged.id, designation="Section 889(a)(1)(A)"),
+        GlobalEntityAlias(entity_id=merged.id, alias="HW Tech", normalized_alias="hw tech"),
+    ])
+    db.commit()
+    survivor_id, merged_id = survivor.id, merged.id
+    generation = current_generation(db)
+
+    assert apply_merges([MergeDecision(survivor_id=survivor_id, merged_ids=[merged_id])], db) == 1
+
+    assert db.get(GlobalEntity, merged_id) is None
+    links = db.query(SupplierEntityLink.supplier_id, SupplierEntityLink.entity_id).all()
+    assert sorted(links) == sorted([(both.id, survivor_id), (only_merged.id, survivor_id)])
+    hits = db.query(SanctionedEntity.entity_id, SanctionedEntity.source).all()
+    assert sorted(hits) == [(survivor_id, "BIS"), (survivor_id, "OFAC")]
+    assert db.query(CoveredEntity.entity_id).scalar() == survivor_id
+    aliases = {a.normalized_alias: a.entity_id for a in db.query(GlobalEntityAlias)}
+    assert aliases == {"hw tech": survivor_id, "huawei technologies company": survivor_id}
+
+    assert graph_merges == [[{"old": "Huawei Technologies Company", "new": "Huawei Technologies Co., Ltd."}]]
+    assert current_generation(db) == generation + 1
+
+
+def test_clustering_merges_new_duplicates_only_within_a_country(db, graph_merges):
+    original = _entity(db, "Huawei Technologies Co., Ltd.", "huawei technologies")
+    db.commit()
+    _entity(db, "HUAWEI TECHNOLOGIES", "huawei technologies")
+    elsewhere = _entity(db, "Huawei Technologies", "huawei technologies", country="US")
+    unrelated = _entity(db, "Acme Widgets", "acme widgets")
+    db.commit()
+    kept = {original.id, elsewhere.id, unrelated.id}
+
+    assert cluster_new_entities(db) == 1
+    assert {e.id for e in db.query(GlobalEntity.id)} == kept
+    # A second run has nothing new to look at
+    assert cluster_new_entities(db) == 0
+
+
+def test_clustering_revisits_entities_renamed_since_the_last_run(db, graph_merges):
+    original = _entity(db, "Huawei Technologies Co., Ltd.", "huawei technologies")
+    renamed = _entity(db, "Shenzhen Import Agent", "shenzhen import agent")
+    db.commit()
+    assert cluster_new_entities(db) == 0
+
+    # Graph sync bookkeeping is not a change worth re-clustering
+    renamed.graph_sync_hash = "abc"
+    db.commit()
+    assert renamed.resolution_changed_at is None
+
+    renamed.canonical_name = "HUAWEI TECHNOLOGIES"
+    renamed.normalized_name = "huawei technologies"
+    db.commit()
+    assert renamed.resolution_changed_at is not None
+    renamed_id = renamed.id
+
+    assert cluster_new_entities(db) == 1
+    assert db.get(GlobalEntity, renamed_id) is None
+    assert db.get(GlobalEntity, original.id) is not None
+    assert cluster_new_entities(db) == 0
@@ -0,0 +1,69 @@
+"""Fuzzy entity matching: the in-process candidate index kept in step with global_entities."""
+
+import math
+
+import pytest
+
+from app.models import GlobalEntity
+from app.screening.name_index import NameIndex
+from app.services import entity_matching_service
+from app.services.entity_cache import bump_generation
+from app.services.entity_matching_service import FUZZY_REVIEW_SCORE, entity_candidates, fuzzy_match_bulk
+
+NAMES = [
+    "huawei technologies", "zte", "hikvision digital technology", "dahua technology",
+    "acme widgets", "globex", "initech", "umbrella", "stark industries", "wayne enterprises",
+]
+
+
+@pytest.fixture
+def index(monkeypatch):
+    """A fresh in-process index that counts the names it indexes."""
+    indexed = []
+
+    class CountingIndex(NameIndex):
+        def __init__(self, names):
+            indexed.append(len(names))
+            super().__init__(names)
+
+    monkeypatch.setattr(entity_matching_service, "NameIndex", CountingIndex)
+    monkeypatch.setattr(entity_matching_service, "_memory_index", entity_matching_service._EntityNameIndex())
+    return indexed
+
+
+def _add(db, names):
+    db.add_all(GlobalEntity(canonical_name=n, normalized_name=n) for n in names)
+    db.commit()
+
+
+def _expected(db, queries):
+    rows = db.query(GlobalEntity.id, GlobalEntity.normalized_name).order_by(GlobalEntity.id).all()
+    full = NameIndex([r.normalized_name for r in rows])
+    return [
+        sorted((rows[i].id, rows[i].normalized_name) for i in full.candidates(q, FUZZY_REVIEW_SCORE))
+        for q in queries
+    ]
+
+
+def test_incremental_inserts_match_a_full_rebuild(db, index):
+    queries = ["huawei technology", "zte corp", "dahua tech", "acme widget 17", "globex 3"]
+    added = 0
+    for step in range(60):
+        _add(db, [f"{NAMES[(step + k) % len(NAMES)]} {step}-{k}" for k in range(step % 4 + 1)])
+        added += step % 4 + 1
+        assert [sorted(c) for c in entity_candidates(queries, db)] == _expected(db, queries)
+
+    # Appending and merging segments, not rebuilding on every call
+    assert sum(index) <= added * (math.log2(added) + 1)
+
+
+def test_deleted_entities_stop_being_candidates(db, index):
+    _add(db, ["huawei technologies", "huawei technologies co", "zte"])
+    assert fuzzy_match_bulk(["huawei technologies ltd"], db)
+
+    db.query(GlobalEntity).filter(GlobalEntity.normalized_name.like("huawei%")).delete(synchronize_session=False)
+    bump_generation(db.connection())
+    db.commit()
+
+    assert entity_candidates(["huawei technologies ltd"], db) == [[]]
+    assert fuzzy_match_bulk(["huawei technologies ltd"], db) == {}
@@ -0,0 +1,198 @@
+"""Graph sync: Neo4j is only written when a node's or relationship's hash changed."""
+
+import pytest
+
+from app.graph import graph_client
+from app.models import GlobalEntity, Supplier, SupplierEntityLink
+from app.services.entity_resolution_service import resolve_supplier_entity
+from app.services.graph_sync_service import (
+    entity_graph_hash,
+    link_graph_hash,
+    reconcile_graph,
+    sync_entity_nodes_bulk,
+)
+
+
+class _FakeGraph:
+    """Stands in for the Neo4j driver: a set of entity nodes and RESOLVES_TO pairs, plus a write log."""
+
+    def __init__(self):
+        self.entities: set[str] = set()
+        self.links: set[tuple[str, str]] = set()
+        self.writes: list[tuple[str, list]] = []
+        self.fail = False
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query: str, **params):
+        if "RETURN e.canonical_name AS name" in query:
+            return [{"name": n} for n in params["names"] if n in self.entities]
+        if "RETURN s.name AS supplier" in query:
+            return [{"supplier": s, "entity": e} for s, e in params["pairs"] if (s, e) in self.links]
+
+        if self.fail:
+            raise RuntimeError("Neo4j unavailable")
+        if "RESOLVES_TO" in query:
+            rows = params.get("rows") or [{"supplier": params["supplier"], "entity": params["entity"]}]
+            pairs = [(r["supplier"], r["entity"]) for r in rows]
+            self.links.update(pairs)
+            self.entities.update(e for _, e in pairs)
+            self.writes.append(("link", pairs))
+        else:
+            names = [r["name"] for r in params["rows"]] if "rows" in params else [params["name"]]
+            self.entities.update(names)
+            self.writes.append(("entity", names))
+        return []
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    fake = _FakeGraph()
+    monkeypatch.setattr(graph_client, "driver", fake)
+    return fake
+
+
+def _supplier(db, name: str) -> Supplier:
+    supplier = Supplier(name=name, normalized_name=name.lower(), country="US")
+    db.add(supplier)
+    db.commit()
+    return supplier
+
+
+# =====================================================
+# HASHES
+# =====================================================
+
+def test_hashes_change_only_with_graph_visible_properties():
+    assert entity_graph_hash("Acme Widgets", "COMPANY", "US") == entity_graph_hash("Acme Widgets", "COMPANY", "US")
+    assert entity_graph_hash("Acme Widgets", "COMPANY", "US") != entity_graph_hash("Acme Widgets", "COMPANY", "CA")
+    assert entity_graph_hash("Acme Widgets", None, None) == entity_graph_hash("Acme Widgets", "", "")
+
+    # Confidence is compared at 4 decimals, so float noise does not cause a rewrite
+    synced = link_graph_hash("Acme", "Acme Widgets", 0.9, "AUTO")
+    assert link_graph_hash("Acme", "Acme Widgets", 0.90000001, "AUTO") == synced
+    assert link_graph_hash("Acme", "Acme Widgets", 0.85, "AUTO") != synced
+    assert link_graph_hash("Acme", "Acme Widgets", 0.9, "MANUAL") != synced
+
+
+# =====================================================
+# RESOLUTION PATH
+# =====================================================
+
+def test_resolving_an_unchanged_link_skips_the_graph_write(db, graph):
+    supplier = _supplier(db, "Acme Widgets")
+
+    entity = resolve_supplier_entity(supplier, db)
+    assert graph.writes == [("entity", ["Acme Widgets"]), ("link", [("Acme Widgets", "Acme Widgets")])]
+
+    link = db.query(SupplierEntityLink).filter_by(supplier_id=supplier.id).one()
+    assert link.graph_sync_hash == link_graph_hash("Acme Widgets", entity.canonical_name, link.confidence_score, "AUTO")
+    assert link.graph_synced_at is not None
+
+    graph.writes.clear()
+    assert resolve_supplier_entity(supplier, db).id == entity.id
+    assert graph.writes == []
+
+
+def test_resolving_a_changed_link_rewrites_the_relationship(db, graph):
+    supplier = _supplier(db, "Acme Widgets")
+    entity = resolve_supplier_entity(supplier, db)
+    graph.writes.clear()
+
+    # Same entity, but the relationship's confidence moved
+    link = db.query(SupplierEntityLink).filter_by(supplier_id=supplier.id).one()
+    link.confidence_score = 0.8
+    db.commit()
+
+    assert resolve_supplier_entity(supplier, db).id == entity.id
+    assert graph.writes == [("link", [("Acme Widgets", "Acme Widgets")])]
+
+    # Renamed to another company: new node, link moved to it
+    graph.writes.clear()
+    supplier.name, supplier.normalized_name = "Globex Industries", "globex industries"
+    db.commit()
+
+    moved = resolve_supplier_entity(supplier, db)
+    assert moved.id != entity.id
+    assert graph.writes == [("entity", ["Globex Industries"]), ("link", [("Globex Industries", "Globex Industries")])]
+    assert db.query(SupplierEntityLink).filter_by(supplier_id=supplier.id).one().entity_id == moved.id
+
+
+def test_failed_graph_write_is_retried_on_the_next_resolution(db, graph):
+    supplier = _supplier(db, "Acme Widgets")
+    graph.fail = True
+    resolve_supplier_entity(supplier, db)
+
+    link = db.query(SupplierEntityLink).filter_by(supplier_id=supplier.id).one()
+    assert link.graph_sync_hash is None
+
+    graph.fail = False
+    resolve_supplier_entity(supplier, db)
+    db.refresh(link)
+    assert ("link", [("Acme Widgets", "Acme Widgets")]) in graph.writes
+    assert link.graph_sync_hash is not None
+
+
+# =====================================================
+# BULK SYNC
+# =====================================================
+
+def test_bulk_entity_sync_writes_only_dirty_entities_once(db, graph):
+    clean = GlobalEntity(
+        canonical_name="Acme Widgets", normalized_name="acme widgets", entity_type="COMPANY", country="US",
+    )
+    clean.graph_sync_hash = entity_graph_hash("Acme Widgets", "COMPANY", "US")
+    dirty = GlobalEntity(canonical_name="Globex Industries", normalized_name="globex industries", entity_type="COMPANY")
+    db.add_all([clean, dirty])
+    db.commit()
+
+    sync_entity_nodes_bulk([clean, dirty, dirty])
+
+    assert graph.writes == [("entity", ["Globex Industries"])]
+    assert dirty.graph_sync_hash == entity_graph_hash("Globex Industries", "COMPANY", None)
+
+    graph.writes.clear()
+    sync_entity_nodes_bulk([clean, dirty])
+    assert graph.writes == []
+
+
+def test_bulk_entity_sync_leaves_entities_dirty_when_the_write_fails(db, graph):
+    entity = GlobalEntity(canonical_name="Globex Industries", normalized_name="globex industries")
+    db.add(entity)
+    db.commit()
+
+    graph.fail = True
+    sync_entity_nodes_bulk([entity])
+    assert entity.graph_sync_hash is None
+
+
+# =====================================================
+# RECONCILIATION
+# =====================================================
+
+def test_reconcile_repairs_dirty_rows_and_rows_missing_from_the_graph(db, graph):
+    for name in ("Acme Widgets", "Globex Industries", "Initech"):
+        resolve_supplier_entity(_supplier(db, name), db)
+    assert reconcile_graph(db) == 0
+
+    # Node dropped from the graph, link hash gone stale in SQL
+    graph.entities.discard("Acme Widgets")
+    graph.links.discard(("Acme Widgets", "Acme Widgets"))
+    initech = db.query(SupplierEntityLink).join(Supplier).filter(Supplier.name == "Initech").one()
+    initech.graph_sync_hash = None
+    db.commit()
+    graph.writes.clear()
+
+    assert reconcile_graph(db) == 3
+    assert graph.writes == [
+        ("entity", ["Acme Widgets"]),
+        ("link", [("Acme Widgets", "Acme Widgets"), ("Initech", "Initech")]),
+    ]
+    assert reconcile_graph(db) == 0
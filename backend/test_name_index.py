@@ -0,0 +1,138 @@
+"""
+Recall of the sanctions blocking index: every pair brute force scores at
+or above the threshold must be a candidate, at every query length.
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+from rapidfuzz import fuzz, process
+
+from app.core.normalization import normalize_name
+from app.screening.index_file import open_index_file, write_index_file
+from app.screening.name_index import NameIndex
+from app.screening.sanctions_store import ListSnapshot, SanctionsRecord
+from app.services.public_data_service import (
+    MATCH_THRESHOLD,
+    OFAC_LIST,
+    _screen_list,
+    _screen_list_exhaustive,
+)
+
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+_COMMON = [
+    "international", "trading", "bank", "group", "industries", "holdings",
+    "technology", "import", "export", "shipping", "electronics",
+]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(2, 10)))
+
+
+def _name(rng: random.Random) -> str:
+    tokens = [_word(rng) for _ in range(rng.randint(1, 3))] + rng.sample(_COMMON, rng.randint(0, 2))
+    return " ".join(tokens)
+
+
+def _perturb(name: str, edits: int, rng: random.Random) -> str:
+    chars = list(name)
+    for _ in range(edits):
+        pos = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.33:
+            chars.insert(pos, rng.choice(_ALPHABET))
+        elif op < 0.66 and len(chars) > 1:
+            del chars[pos]
+        else:
+            chars[pos] = rng.choice(_ALPHABET)
+    return " ".join("".join(chars).split())
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = random.Random(7)
+    names = list(dict.fromkeys(_name(rng) for _ in range(20000)))
+    names.append("tjrfuapr international")
+    queries = [_perturb(rng.choice(names), rng.randint(0, 4), rng) for _ in range(600)]
+    queries += [_name(rng) for _ in range(100)]
+    queries.append("trrfuapr interoarional")
+    return names, [q for q in queries if q]
+
+
+def _brute_force(queries: list[str], names: list[str]) -> list[set[int]]:
+    matrix = process.cdist(queries, names, scorer=fuzz.token_set_ratio, score_cutoff=MATCH_THRESHOLD - 0.5, workers=-1)
+    return [
+        {j for j in matrix[i].nonzero()[0].tolist() if fuzz.token_set_ratio(q, names[j]) >= MATCH_THRESHOLD}
+        for i, q in enumerate(queries)
+    ]
+
+
+def test_candidates_cover_every_brute_force_hit(corpus):
+    names, queries = corpus
+    index = NameIndex(names)
+
+    expected = _brute_force(queries, names)
+    missed = [
+        (q, names[j])
+        for q, hits in zip(queries, expected)
+        for j in hits - set(index.candidates(q, MATCH_THRESHOLD))
+    ]
+
+    assert sum(map(len, expected)) > 1000
+    assert missed == []
+
+
+def test_long_query_without_shared_token_is_a_candidate():
+    index = NameIndex(["tjrfuapr international", "unrelated trading"])
+    assert fuzz.token_set_ratio("trrfuapr interoarional", "tjrfuapr international") >= MATCH_THRESHOLD
+    assert 0 in index.candidates("trrfuapr interoarional", MATCH_THRESHOLD)
+
+
+def test_mapped_index_blocks_like_the_in_memory_one(corpus, install_list, tmp_path):
+    names, queries = corpus
+    snapshot = install_list(OFAC_LIST, names[:5000])
+
+    path = str(tmp_path / "ofac.sidx")
+    write_index_file(snapshot, path)
+    mapped = open_index_file(path)
+
+    for q in queries[:300]:
+        assert mapped.index.candidates(q, MATCH_THRESHOLD) == snapshot.index.candidates(q, MATCH_THRESHOLD)
+
+
+def test_mapped_records_keep_missing_and_empty_details_apart(tmp_path):
+    details = [
+        {"program": "SDGT", "eu_reference": "EU.1.2"},
+        {"program": "", "eu_reference": "EU.3.4"},   # listed with an empty programme
+        {},                                          # legacy export: no details at all
+        {"program": "SDGT"},
+    ]
+    records = tuple(
+        SanctionsRecord(name=f"Entity {n}", normalized_name=normalize_name(f"Entity {n}"), details=d)
+        for n, d in zip("ABCD", details)
+    )
+    snapshot = ListSnapshot(
+        source=OFAC_LIST, version="v1", records=records, fetched_at=datetime.utcnow(),
+        index=NameIndex([r.normalized_name for r in records]),
+    )
+
+    path = str(tmp_path / "ofac.sidx")
+    write_index_file(snapshot, path)
+    mapped = open_index_file(path)
+
+    assert list(mapped.records) == list(records)
+    assert list(mapped.index.names) == snapshot.index.names
+    assert mapped.index.names[-1] == "entity d"
+
+
+def test_screen_list_matches_exhaustive_screening(corpus, install_list):
+    names, queries = corpus
+    install_list(OFAC_LIST, names, version="recall")
+
+    def matched(hits):
+        return sorted((h["matched_name"], h["match_score"]) for h in hits)
+
+    for q in queries[::5]:
+        assert matched(_screen_list(OFAC_LIST, q)) == matched(_screen_list_exhaustive(OFAC_LIST, q))
@@ -0,0 +1,144 @@
+"""Sanctions list deltas: what changed between versions and which suppliers they touch."""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.normalization import normalize_name
+from app.models import GlobalEntity, GlobalEntityAlias, Supplier, SupplierEntityLink
+from app.screening.feed_diff import diff_snapshots
+from app.screening.sanctions_store import ListSnapshot, SanctionsRecord
+from app.services import reverse_screening_service
+from app.services.public_data_service import OFAC_LIST
+from app.services.reverse_screening_service import (
+    affected_supplier_ids,
+    match_delta_entities,
+    reverse_screen_delta,
+)
+
+
+def _snapshot(version: str, entries: list[tuple]) -> ListSnapshot:
+    """entries: (name, program) or (name, program, extra details)."""
+    records = tuple(
+        SanctionsRecord(
+            name=name,
+            normalized_name=normalize_name(name),
+            details={"program": program, **(extra[0] if extra else {})},
+        )
+        for name, program, *extra in entries
+    )
+    return ListSnapshot(source=OFAC_LIST, version=version, records=records, fetched_at=datetime.utcnow())
+
+
+# =====================================================
+# FEED DIFF
+# =====================================================
+
+def test_diff_is_keyed_on_normalized_name_and_program():
+    old = _snapshot("v1", [
+        ("Bank Melli Iran", "IRAN"),
+        ("ZTE Corporation", "SDGT"),
+        ("Rosoboronexport", "UKRAINE-EO13662", {"remarks": "old"}),
+        ("Old Shipping Co", "IRAN"),
+    ])
+    new = _snapshot("v2", [
+        ("BANK MELLI IRAN", "IRAN"),                 # same normalized name: unchanged
+        ("ZTE Corporation", "IRAN"),                 # re-listed under another program
+        ("Rosoboronexport", "UKRAINE-EO13662", {"remarks": "new"}),  # detail edit only
+        ("New Trading LLC", "SDGT"),
+    ])
+
+    delta = diff_snapshots(old, new)
+
+    assert (delta.source, delta.old_version, delta.new_version) == (OFAC_LIST, "v1", "v2")
+    assert sorted((r.name, r.details["program"]) for r in delta.added) == [
+        ("New Trading LLC", "SDGT"), ("ZTE Corporation", "IRAN"),
+    ]
+    assert sorted((r.name, r.details["program"]) for r in delta.removed) == [
+        ("Old Shipping Co", "IRAN"), ("ZTE Corporation", "SDGT"),
+    ]
+    assert len(delta) == 4
+
+
+def test_identical_versions_have_no_delta():
+    entries = [("Bank Melli Iran", "IRAN"), ("ZTE Corporation", "SDGT")]
+    assert len(diff_snapshots(_snapshot("v1", entries), _snapshot("v2", list(reversed(entries))))) == 0
+
+
+# =====================================================
+# AFFECTED SUPPLIERS
+# =====================================================
+
+@pytest.fixture
+def portfolio(db, monkeypatch):
+    """Entities and suppliers reaching "Rosoboronexport" by each route reverse screening follows."""
+    graph = {"Rosoboronexport": {"Rostec State Corporation"}}
+    monkeypatch.setattr(
+        reverse_screening_service,
+        "_related_entity_names",
+        lambda names: set().union(*(graph.get(n, set()) for n in names)),
+    )
+
+    def entity(name):
+        e = GlobalEntity(canonical_name=name, normalized_name=normalize_name(name))
+        db.add(e)
+        db.flush()
+        return e
+
+    def supplier(name, entity=None, parent_company=None):
+        s = Supplier(name=name, normalized_name=normalize_name(name), country="RU", parent_company=parent_company)
+        db.add(s)
+        db.flush()
+        if entity is not None:
+            db.add(SupplierEntityLink(supplier_id=s.id, entity_id=entity.id, confidence_score=1.0))
+        return s
+
+    sanctioned = entity("Rosoboronexport")
+    related = entity("Rostec State Corporation")
+    aliased = entity("Almaz-Antey Concern")
+    db.add(GlobalEntityAlias(
+        entity_id=aliased.id, alias="Almaz Antey Air Defense",
+        normalized_alias=normalize_name("Almaz Antey Air Defense"),
+    ))
+    unrelated = entity("Acme Widgets")
+
+    suppliers = {
+        "linked": supplier("Rosoboronexport JSC", sanctioned),
+        "related": supplier("Rostec", related),
+        "parent_company": supplier("Moscow Machinery Trading", parent_company="Rosoboronexport"),
+        "alias": supplier("Almaz-Antey", aliased),
+        "unrelated": supplier("Acme Widgets", unrelated),
+    }
+    db.commit()
+    return {"sanctioned": sanctioned, "aliased": aliased, "suppliers": suppliers}
+
+
+def test_delta_matches_entities_by_canonical_name_and_alias(db, portfolio):
+    delta = diff_snapshots(_snapshot("v1", []), _snapshot("v2", [("Rosoboronexport", "RUSSIA-EO14024"), ("Almaz Antey Air Defense", "RUSSIA-EO14024")]))
+
+    assert match_delta_entities(delta, db) == {portfolio["sanctioned"].id, portfolio["aliased"].id}
+
+
+def test_affected_suppliers_via_links_graph_relations_and_parent_company(db, portfolio):
+    suppliers = portfolio["suppliers"]
+
+    assert affected_supplier_ids({portfolio["sanctioned"].id}, db) == {
+        suppliers["linked"].id, suppliers["related"].id, suppliers["parent_company"].id,
+    }
+    assert affected_supplier_ids(set(), db) == set()
+
+
+def test_reassessments_are_queued_with_the_list_update_as_trigger(db, portfolio, monkeypatch):
+    from app.worker.tasks import run_assessment_task
+
+    queued = []
+    monkeypatch.setattr(run_assessment_task, "delay", lambda *args: queued.append(args))
+    delta = diff_snapshots(_snapshot("v1", [("Rosoboronexport", "RUSSIA-EO14024")]), _snapshot("v2", []))
+
+    summary = reverse_screen_delta(delta, db)
+
+    trigger = {"type": "sanctions_list_update", "list": OFAC_LIST, "old_version": "v1", "new_version": "v2"}
+    suppliers = portfolio["suppliers"]
+    expected = sorted([suppliers["linked"].id, suppliers["related"].id, suppliers["parent_company"].id])
+    assert summary["affected_suppliers"] == expected
+    assert queued == [(supplier_id, None, trigger) for supplier_id in expected]
@@ -25,7 +25,7 @@ if not user:
 # create a sanctioned supplier
 s = db.query(Supplier).filter_by(name="HUAWEI TECHNOLOGIES CO., LTD.").first()
 if not s:
-    from app.services.entity_resolution_service import normalize as norm
+    from app.core.normalization import normalize_name as norm
     s = Supplier(name="HUAWEI TECHNOLOGIES CO., LTD.", normalized_name=norm("HUAWEI TECHNOLOGIES CO., LTD."), organization_id=org.id, country="CN")
     db.add(s)
     db.commit()
@@ -0,0 +1,169 @@
+"""Sanctions screening through check_sanctions / check_sanctions_lists(_bulk) on installed list snapshots."""
+
+import pytest
+
+from app.models import Supplier
+from app.screening.result_cache import screening_cache
+from app.screening.sanctions_store import sanctions_store
+from app.services import public_data_service
+from app.services.public_data_service import (
+    BIS_LIST,
+    BULK_SCREEN_MIN_NAMES,
+    EU_LIST,
+    OFAC_LIST,
+    SANCTIONS_LISTS,
+    _check_sanctions_lists_bulk_local,
+    _check_sanctions_lists_local,
+)
+from app.services.sanctions_service import check_sanctions
+from app.services.scoring_engine import ScoringEngine
+
+
+OFAC_NAMES = ["huawei technologies", "zte corporation", "bank melli iran", "rosoboronexport"]
+BIS_NAMES = ["hikvision digital technology", "dahua technology"]
+EU_NAMES = ["sberbank", "rostec state corporation"]
+
+QUERIES = [
+    "Huawei Technologies Co., Ltd.", "ZTE Corp", "Bank Melli", "Sberbank of Russia",
+    "Rostec", "Dahua Technology Co", "Hikvision", "Acme Widgets", "Huawei Technologies Co., Ltd.",
+]
+
+
+@pytest.fixture
+def lists(install_list):
+    install_list(OFAC_LIST, OFAC_NAMES)
+    install_list(BIS_LIST, BIS_NAMES)
+    install_list(EU_LIST, EU_NAMES)
+
+
+def _supplier(db, name, country="US"):
+    supplier = Supplier(name=name, normalized_name=name.lower(), country=country)
+    db.add(supplier)
+    db.commit()
+    return supplier
+
+
+def _fail_list(monkeypatch, failing: str):
+    screen = public_data_service._screen_list_bulk
+
+    def flaky(list_name, norms):
+        if list_name == failing:
+            raise ConnectionError("list unavailable")
+        return screen(list_name, norms)
+
+    monkeypatch.setattr(public_data_service, "_screen_list_bulk", flaky)
+
+
+def _hits(result: dict) -> list[tuple]:
+    return sorted((h["list"], h["matched_name"], h["match_score"]) for h in result["hits"])
+
+
+# =====================================================
+# BULK VS SINGLE
+# =====================================================
+
+@pytest.mark.parametrize("min_names", [BULK_SCREEN_MIN_NAMES, 0], ids=["blocking", "cdist"])
+def test_bulk_screening_matches_single_name_screening(lists, monkeypatch, min_names):
+    monkeypatch.setattr(public_data_service, "BULK_SCREEN_MIN_NAMES", min_names)
+
+    screening_cache.clear()
+    single = [_check_sanctions_lists_local(q) for q in QUERIES]
+    screening_cache.clear()
+    bulk = _check_sanctions_lists_bulk_local(QUERIES)
+
+    assert [_hits(r) for r in bulk] == [_hits(r) for r in single]
+    assert sum(r["flagged"] for r in bulk) >= 5
+    assert bulk[0]["list_versions"] == single[0]["list_versions"]
+
+
+def test_small_batch_never_builds_a_full_matrix(lists, monkeypatch):
+    def cdist(*args, **kwargs):
+        raise AssertionError("cdist over the whole list for a handful of names")
+
+    monkeypatch.setattr(public_data_service.process, "cdist", cdist)
+    screening_cache.clear()
+
+    results = _check_sanctions_lists_bulk_local(QUERIES)
+    assert results[0]["flagged"]
+    assert all(status == "ok" for status in results[0]["list_status"].values())
+
+
+# =====================================================
+# LIST VERSIONS
+# =====================================================
+
+@pytest.mark.parametrize("screen", [
+    lambda names: _check_sanctions_lists_bulk_local(names)[0],
+    lambda names: _check_sanctions_lists_local(names[0]),
+], ids=["bulk", "single"])
+def test_reported_version_is_the_one_screened(lists, install_list, monkeypatch, screen):
+    screened = sanctions_store.peek(OFAC_LIST)
+    get = sanctions_store.get
+
+    def get_then_swap(list_name):
+        snapshot = get(list_name)
+        if list_name == OFAC_LIST:
+            # A refresh lands between screening and reporting
+            install_list(OFAC_LIST, OFAC_NAMES + ["new entry"], version="next")
+        return snapshot
+
+    monkeypatch.setattr(sanctions_store, "get", get_then_swap)
+    screening_cache.clear()
+
+    result = screen(["Huawei Technologies"])
+    assert result["flagged"]
+    assert result["list_versions"][OFAC_LIST] == screened.version
+    assert sanctions_store.peek(OFAC_LIST).version != screened.version
+
+
+# =====================================================
+# SKIPPED LISTS
+# =====================================================
+
+def test_clean_supplier_passes_when_every_list_was_screened(db, lists):
+    result = check_sanctions(_supplier(db, "Acme Widgets").id, db)
+
+    assert result["overall_status"] == "PASS"
+    assert result["lists_skipped"] == []
+    assert set(result["list_status"]) == set(SANCTIONS_LISTS)
+
+
+def test_unscreened_list_makes_the_result_incomplete(db, lists, monkeypatch):
+    _fail_list(monkeypatch, EU_LIST)
+
+    result = check_sanctions(_supplier(db, "Acme Widgets").id, db)
+
+    assert result["overall_status"] == "INCOMPLETE"
+    assert result["lists_skipped"] == [EU_LIST]
+    assert result["list_status"][EU_LIST] == "unavailable"
+    assert EU_LIST in result["reason"]
+
+
+def test_hit_on_a_screened_list_still_fails(db, lists, monkeypatch):
+    _fail_list(monkeypatch, EU_LIST)
+
+    result = check_sanctions(_supplier(db, "Huawei Technologies Co., Ltd.", "CN").id, db)
+
+    assert result["overall_status"] == "FAIL"
+    assert result["lists_skipped"] == [EU_LIST]
+
+
+def test_incomplete_screening_never_scores_pass():
+    context = {
+        "sanctions_hit": False,
+        "sanctions_incomplete": [EU_LIST],
+        "section_889_status": "PASS",
+        "country": "US",
+        "industry": "Manufacturing",
+        "address": "1 Main St",
+        "unknown_sub_tiers": False,
+        "news_signal_score": 0,
+        "graph_risk_score": 0,
+    }
+
+    score, status, factors, _ = ScoringEngine.calculate_risk_score(context)
+    assert (score, status) == (0, "CONDITIONAL")
+    assert any(f["key"] == "sanctions_coverage" and f["triggered"] for f in factors)
+
+    complete = ScoringEngine.calculate_risk_score({**context, "sanctions_incomplete": []})
+    assert complete[1] == "PASS"
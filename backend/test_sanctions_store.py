@@ -0,0 +1,166 @@
+"""SanctionsStore refresh safety and EU XML parsing."""
+
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from app.screening import sanctions_store as store_module
+from app.screening.sanctions_store import SanctionsSource, SanctionsStore
+from app.services.public_data_service import _parse_eu
+
+
+def _eu_xml(count: int, start: int = 0) -> bytes:
+    entities = "".join(
+        f'<sanctionEntity euReferenceNumber="EU.{i}">'
+        f'<regulation programme="PRG{i % 3}"/>'
+        f'<nameAlias wholeName="Entity Number {i} Trading"/>'
+        f'<nameAlias wholeName="Entity {i} Alias"/>'
+        f"</sanctionEntity>"
+        for i in range(start, start + count)
+    )
+    return f'<export xmlns="http://eu.europa.ec/fpi/fsd/export">{entities}</export>'.encode()
+
+
+class _Response:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.status_code = 200
+        self.headers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, size):
+        for i in range(0, len(self.body), size):
+            yield self.body[i:i + size]
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Make the next refresh download ``body``."""
+    def set_body(body: bytes):
+        monkeypatch.setattr(store_module.requests, "get", lambda *a, **kw: _Response(body))
+    return set_body
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(store_module, "SANCTIONS_INDEX_DIR", str(tmp_path))
+    store = SanctionsStore()
+    store.register(SanctionsSource(name="EU Test", url="http://example.invalid/eu.xml", parser=_parse_eu))
+    return store
+
+
+def _dom_names(payload: bytes) -> set[str]:
+    """What the pre-iterparse parser read: every nameAlias / wholeName, via a full DOM."""
+    names = set()
+    for elem in ET.parse(io.BytesIO(payload)).getroot().iter():
+        if elem.tag.endswith("nameAlias") or elem.tag.endswith("wholeName"):
+            name = elem.text or elem.get("wholeName", "")
+            if name and name.strip():
+                names.add(name.strip())
+    return names
+
+
+_EU_MIXED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<export xmlns="http://eu.europa.ec/fpi/fsd/export" generationDate="2024-01-01">
+  <sanctionEntity euReferenceNumber="EU.27.28" logicalId="13">
+    <regulation programme="IRN" regulationType="amendment"><publicationUrl>x</publicationUrl></regulation>
+    <regulation programme="UKR"/>
+    <subjectType code="enterprise"/>
+    <nameAlias wholeName="Bank Sepah" firstName="" lastName=""/>
+    <nameAlias wholeName="Bank Sepah International PLC"/>
+    <nameAlias wholeName="Bank Sepah"/>
+    <citizenship countryIso2Code="IR"/>
+  </sanctionEntity>
+  <sanctionEntity euReferenceNumber="EU.1.2">
+    <regulation programme="RUS"/>
+    <nameAlias>Rostec State Corporation</nameAlias>
+    <nameAlias wholeName=""/>
+    <identification number="123"/>
+  </sanctionEntity>
+  <sanctionEntity euReferenceNumber="EU.3.4">
+    <wholeName>Ivan Petrovich Sidorov</wholeName>
+    <nameAlias wholeName="I. P. Sidorov"/>
+  </sanctionEntity>
+</export>"""
+
+_EU_LEGACY = b"""<?xml version="1.0"?>
+<WHOLE>
+  <ENTITY><NAME><nameAlias wholeName="Legacy Trading Co"/><wholeName>Legacy Holdings</wholeName></NAME></ENTITY>
+</WHOLE>"""
+
+
+# =====================================================
+# PARSING
+# =====================================================
+
+@pytest.mark.parametrize("payload", [_EU_MIXED, _EU_LEGACY, _eu_xml(50)], ids=["mixed", "legacy", "generated"])
+def test_iterparse_reads_the_same_names_as_the_dom_parser(payload):
+    records = _parse_eu(io.BytesIO(payload))
+
+    assert {r.name for r in records} == _dom_names(payload)
+    assert all(r.normalized_name for r in records)
+
+
+def test_eu_records_carry_programme_and_reference():
+    records = _parse_eu(io.BytesIO(_EU_MIXED))
+    details = {r.name: r.details for r in records}
+
+    # One record per distinct name within an entity; the first regulation names the programme
+    assert [r.name for r in records].count("Bank Sepah") == 1
+    assert details["Bank Sepah International PLC"] == {"program": "IRN", "eu_reference": "EU.27.28"}
+    assert details["Rostec State Corporation"] == {"program": "RUS", "eu_reference": "EU.1.2"}
+    assert details["Ivan Petrovich Sidorov"] == {"program": "", "eu_reference": "EU.3.4"}
+
+
+def test_malformed_eu_xml_raises():
+    truncated = _eu_xml(10)[:-40]
+    with pytest.raises(ET.ParseError):
+        _parse_eu(io.BytesIO(truncated))
+
+
+# =====================================================
+# REFRESH
+# =====================================================
+
+def test_refresh_loads_a_good_payload(store, serve):
+    serve(_eu_xml(100))
+    snapshot = store.refresh("EU Test")
+
+    assert len(snapshot.records) == 200
+    assert store.peek("EU Test") is snapshot
+
+
+def test_truncated_payload_keeps_the_last_good_snapshot(store, serve):
+    serve(_eu_xml(100))
+    good = store.refresh("EU Test")
+
+    serve(_eu_xml(100, start=1)[:-40])
+    assert store.refresh("EU Test") is good
+    assert store.peek("EU Test").version == good.version
+
+
+def test_payload_far_smaller_than_the_current_one_is_refused(store, serve):
+    serve(_eu_xml(100))
+    good = store.refresh("EU Test")
+
+    serve(_eu_xml(10))
+    assert store.refresh("EU Test") is good
+
+    # Normal churn still goes through
+    serve(_eu_xml(90))
+    assert len(store.refresh("EU Test").records) == 180
+
+
+def test_empty_first_load_installs_nothing(store, serve):
+    serve(b'<export xmlns="http://eu.europa.ec/fpi/fsd/export"></export>')
+    assert store.refresh("EU Test") is None
+    assert store.peek("EU Test") is None
@@ -0,0 +1,37 @@
+"""Which jobs an API process schedules."""
+
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.services import scheduler_service
+from app.services.public_data_service import sanctions_store
+from app.services.reverse_screening_service import handle_list_update
+
+
+@pytest.fixture
+def start(monkeypatch):
+    monkeypatch.setattr(scheduler_service, "scheduler", BackgroundScheduler())
+    monkeypatch.setattr(sanctions_store, "_listeners", [])
+
+    def start(daemon_url: str):
+        monkeypatch.setattr(scheduler_service, "SCREENING_SERVICE_URL", daemon_url)
+        monkeypatch.setattr(scheduler_service.scheduler, "start", lambda: None)
+        scheduler_service.start_scheduler()
+        return {job.id for job in scheduler_service.scheduler.get_jobs()}
+
+    return start
+
+
+def test_without_a_daemon_the_api_refreshes_sanctions_lists(start):
+    jobs = start("")
+
+    assert "sanctions_snapshot_refresh" in jobs
+    assert handle_list_update in sanctions_store._listeners
+
+
+def test_with_a_daemon_list_updates_are_left_to_it(start):
+    jobs = start("http://127.0.0.1:8765")
+
+    assert "sanctions_snapshot_refresh" not in jobs
+    assert handle_list_update not in sanctions_store._listeners
+    assert {"supplier_rescore", "entity_clustering", "graph_sync_reconcile"} <= jobs
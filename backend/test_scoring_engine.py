@@ -0,0 +1,175 @@
+"""Vectorized batch scoring against the per-context scorer."""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.models import AssessmentHistory, ScoringConfig, Supplier
+from app.schemas import ScoringConfigUpdate, ScoringWhatIfResponse
+from app.services.scoring_engine import ScoringEngine, compile_rules
+from app.services.scoring_simulation_service import simulate_scoring_config
+
+
+@pytest.fixture
+def rules(db):
+    ScoringEngine.invalidate()
+    return ScoringEngine.rules()
+
+
+def _contexts(rules, count: int, seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    countries = list(rules.countries) + ["US", "DE", "", None]
+    thresholds = [t for t, _, _ in rules.news_tiers + rules.network_tiers]
+    signals = [0, 1, 99.5] + thresholds + [t - 0.5 for t in thresholds] + [t + 0.5 for t in thresholds]
+    return [
+        {
+            "sanctions_hit": rng.random() < 0.1,
+            "sanctions_incomplete": rng.choice([[], [], [], ["EU Consolidated Sanctions"]]),
+            "section_889_status": rng.choice(["PASS", "FAIL", "CONDITIONAL", None]),
+            "country": rng.choice(countries),
+            "industry": rng.choice(["Manufacturing", "", None]),
+            "address": rng.choice(["1 Main St", ""]),
+            "unknown_sub_tiers": rng.random() < 0.3,
+            "news_signal_score": rng.choice(signals),
+            "graph_risk_score": rng.choice(signals),
+        }
+        for _ in range(count)
+    ]
+
+
+def _assert_batch_matches(contexts, rules):
+    batch = ScoringEngine.calculate_risk_scores_batch(contexts, rules)
+    for i, context in enumerate(contexts):
+        score, status, factors, version = ScoringEngine.calculate_risk_score(context, rules)
+        assert (batch.scores[i], batch.statuses[i]) == (score, status), context
+        assert batch[i] == (score, status, factors, version)
+
+
+def test_batch_matches_single_scoring(rules):
+    contexts = _contexts(rules, 3000)
+    _assert_batch_matches(contexts, rules)
+
+    statuses = set(ScoringEngine.calculate_risk_scores_batch(contexts, rules).statuses.tolist())
+    assert statuses == {"PASS", "CONDITIONAL", "FAIL"}
+
+
+def test_batch_matches_single_scoring_under_other_weights(rules):
+    weights = SimpleNamespace(
+        version="what-if", sanctions_weight=35, section889_fail_weight=80, section889_conditional_weight=5
+    )
+    _assert_batch_matches(_contexts(rules, 1000, seed=12), rules.with_weights(weights))
+
+
+def test_batch_matches_single_scoring_with_default_rules():
+    default = compile_rules({"version": "v1.0-default", "max_score": 100, "thresholds": {"fail": 75, "conditional": 40}, "rules": {}})
+    _assert_batch_matches(_contexts(default, 300, seed=13), default)
+
+
+def test_empty_batch():
+    batch = ScoringEngine.calculate_risk_scores_batch([], compile_rules({"rules": {}}))
+    assert len(batch) == 0 and batch.scores.shape == (0,)
+
+
+# =====================================================
+# WHAT-IF SIMULATION
+# =====================================================
+
+_CLEAN = {
+    "sanctions_hit": False,
+    "section_889_status": "PASS",
+    "country": "US",
+    "industry": "Manufacturing",
+    "address": "1 Main St",
+    "unknown_sub_tiers": False,
+    "news_signal_score": 0,
+    "graph_risk_score": 0,
+}
+
+
+@pytest.fixture
+def portfolio(db):
+    """Latest assessment context per supplier name (plus older rows and a snapshot without context)."""
+    db.add(ScoringConfig(sanctions_weight=70, section889_fail_weight=30, section889_conditional_weight=15, version="v7"))
+
+    latest = {
+        "Sanctioned Co": {**_CLEAN, "sanctions_hit": True},
+        "Covered Co": {**_CLEAN, "section_889_status": "FAIL", "news_signal_score": 45},
+        "Conditional Co": {**_CLEAN, "section_889_status": "CONDITIONAL", "address": ""},
+        "Clean Co": _CLEAN,
+    }
+    for name, context in latest.items():
+        supplier = Supplier(name=name, normalized_name=name.lower(), country="US")
+        db.add(supplier)
+        db.flush()
+        # An older assessment the simulation must ignore
+        db.add(AssessmentHistory(supplier_id=supplier.id, snapshot={"context_used": {**_CLEAN, "sanctions_hit": True}}))
+        db.flush()
+        db.add(AssessmentHistory(supplier_id=supplier.id, snapshot={"context_used": context}))
+
+    legacy = Supplier(name="Legacy Co", normalized_name="legacy co", country="US")
+    db.add(legacy)
+    db.flush()
+    db.add(AssessmentHistory(supplier_id=legacy.id, snapshot={"overall_status": "PASS"}))
+    db.commit()
+
+    ScoringEngine.invalidate()
+    return latest
+
+
+def test_what_if_rescores_latest_contexts_under_candidate_weights(db, portfolio):
+    candidate = ScoringConfigUpdate(sanctions_weight=40, section889_fail_weight=80, section889_conditional_weight=45)
+    rules = ScoringEngine.rules()
+    candidate_rules = rules.with_weights(candidate)
+
+    result = simulate_scoring_config(candidate, db)
+
+    assert (result["suppliers"], result["skipped"]) == (4, 1)
+    assert result["current_config_version"] == "v7"
+
+    expected = {}
+    for name, context in portfolio.items():
+        current = ScoringEngine.calculate_risk_score(context, rules)
+        proposed = ScoringEngine.calculate_risk_score(context, candidate_rules)
+        expected[name] = (current[0], proposed[0], current[1], proposed[1])
+
+    movers = result["top_movers"]
+    assert {
+        m["supplier"]: (m["current_score"], m["candidate_score"], m["current_status"], m["candidate_status"])
+        for m in movers
+    } == {name: e for name, e in expected.items() if e[0] != e[1]}
+    assert [abs(m["delta"]) for m in movers] == sorted((abs(m["delta"]) for m in movers), reverse=True)
+    assert all(m["delta"] == m["candidate_score"] - m["current_score"] for m in movers)
+
+    migrations = {}
+    for current_score, proposed_score, current_status, proposed_status in expected.values():
+        if current_status != proposed_status:
+            key = f"{current_status}->{proposed_status}"
+            migrations[key] = migrations.get(key, 0) + 1
+    assert migrations and result["migrations"] == migrations
+
+    assert sum(result["candidate_status_counts"].values()) == 4
+
+
+def test_what_if_leaves_the_live_config_untouched(db, portfolio):
+    rules = ScoringEngine.rules()
+    candidate = ScoringConfigUpdate(sanctions_weight=10, section889_fail_weight=10, section889_conditional_weight=10)
+
+    result = simulate_scoring_config(candidate, db, top_n=2)
+    ScoringWhatIfResponse(**result)
+    assert len(result["top_movers"]) == 2
+
+    active = db.query(ScoringConfig).filter(ScoringConfig.active == True).all()
+    assert [(c.version, c.sanctions_weight, c.section889_fail_weight) for c in active] == [("v7", 70, 30)]
+    assert ScoringEngine.rules() is rules
+    assert ScoringEngine.calculate_risk_score(portfolio["Sanctioned Co"])[0] == 70
+
+
+def test_what_if_route_returns_the_simulation(db, portfolio):
+    pytest.importorskip("jose")
+    from app.api.scoring_config_api import what_if_scoring_config
+
+    candidate = ScoringConfigUpdate(sanctions_weight=40, section889_fail_weight=80, section889_conditional_weight=45)
+    response = what_if_scoring_config(candidate, top_n=20, db=db, admin_user=None)
+
+    assert response == simulate_scoring_config(candidate, db, top_n=20)
@@ -0,0 +1,108 @@
+"""Section 889: covered-entity findings through entity links, graph parents / subsidiaries and fuzzy names."""
+
+import pytest
+
+from app.models import CoveredEntity, GlobalEntity, Supplier, SupplierEntityLink
+from app.services import section889_service
+from app.services.section889_service import evaluate_section_889, evaluate_section_889_bulk
+
+A1 = "Section 889(a)(1)(A)"
+A1B = "Section 889(a)(1)(B)"
+
+# Graph SUBSIDIARY_OF edges, as _related_entities reports them
+RELATED = {
+    "Acme Widgets": {"Hikvision Digital Technology": "parent"},
+    "Dahua Holdings": {"Dahua Technology": "subsidiary", "Acme Widgets": "parent"},
+}
+
+
+def _entity(db, name, designation=None):
+    entity = GlobalEntity(canonical_name=name, normalized_name=name.lower())
+    db.add(entity)
+    db.flush()
+    if designation:
+        db.add(CoveredEntity(entity_id=entity.id, designation=designation))
+    return entity
+
+
+def _supplier(db, name, country="US", entity=None):
+    supplier = Supplier(name=name, normalized_name=name.lower(), country=country)
+    db.add(supplier)
+    db.flush()
+    if entity is not None:
+        db.add(SupplierEntityLink(supplier_id=supplier.id, entity_id=entity.id, confidence_score=1.0))
+    return supplier
+
+
+@pytest.fixture
+def suppliers(db, monkeypatch):
+    monkeypatch.setattr(
+        section889_service,
+        "_related_entities",
+        lambda names: {n: RELATED[n] for n in names if n in RELATED},
+    )
+
+    huawei = _entity(db, "Huawei Technologies", A1)
+    _entity(db, "Hikvision Digital Technology", A1B)
+    _entity(db, "Dahua Technology", A1B)
+    _entity(db, "ZTE Corporation", A1)
+    acme = _entity(db, "Acme Widgets")
+    dahua_holdings = _entity(db, "Dahua Holdings")
+    clean = _entity(db, "Shenzhen Plastics")
+
+    created = {
+        "direct": _supplier(db, "Huawei", "China", huawei),
+        "parent": _supplier(db, "Acme Widgets Inc", entity=acme),
+        "subsidiary": _supplier(db, "Dahua Holdings Ltd", entity=dahua_holdings),
+        "fuzzy": _supplier(db, "ZTE Corp"),
+        "country": _supplier(db, "Shenzhen Plastics Co", "China", clean),
+        "clean": _supplier(db, "Midwest Fasteners"),
+    }
+    db.commit()
+    return created
+
+
+def test_each_rule_reports_how_the_supplier_matched(db, suppliers):
+    results = {key: evaluate_section_889(s.id, db) for key, s in suppliers.items()}
+
+    assert results["direct"]["matched_via"] == "entity_link"
+    assert results["direct"]["designation"] == A1
+
+    assert results["parent"]["matched_via"] == "parent"
+    assert results["parent"]["reason"] == "Parent entity is a covered entity: Hikvision Digital Technology"
+
+    # A covered subsidiary wins over the uncovered parent
+    assert results["subsidiary"]["matched_via"] == "subsidiary"
+    assert results["subsidiary"]["designation"] == A1B
+
+    assert results["fuzzy"]["matched_via"] == "fuzzy"
+    assert results["fuzzy"]["reason"] == "Matches covered entity: ZTE Corporation"
+
+    assert results["country"]["section_889_status"] == "CONDITIONAL"
+    assert results["clean"]["section_889_status"] == "PASS"
+
+
+def test_batch_evaluation_matches_one_at_a_time(db, suppliers):
+    ids = [s.id for s in suppliers.values()]
+    single = {i: evaluate_section_889(i, db) for i in ids}
+
+    assert evaluate_section_889_bulk(ids + [10_000], db) == single
+
+
+def test_linked_supplier_is_still_fuzzy_matched(db, suppliers):
+    # Resolved to its own, uncovered entity, but the name resembles a covered one
+    lookalike = _entity(db, "Huawei Technologies Trading")
+    supplier = _supplier(db, "Huawei Technologies Trading", entity=lookalike)
+    db.commit()
+
+    result = evaluate_section_889(supplier.id, db)
+    assert result["section_889_status"] == "FAIL"
+    assert result["matched_via"] == "fuzzy"
+    assert result["reason"] == "Matches covered entity: Huawei Technologies"
+
+
+def test_linked_supplier_with_an_unrelated_name_passes(db, suppliers):
+    supplier = _supplier(db, "Midwest Bolts", entity=_entity(db, "Midwest Bolts"))
+    db.commit()
+
+    assert evaluate_section_889(supplier.id, db)["section_889_status"] == "PASS"
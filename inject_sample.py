@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import Supplier, Organization, User, GlobalEntity
-from app.services.entity_resolution_service import normalize
+from app.core.normalization import normalize_name
 
 def inject_sample_supplier():
     db = SessionLocal()
@@ -21,7 +21,7 @@ def inject_sample_supplier():
         
         # Ensure a GlobalEntity exists for resolution
         name = "Alpha Defense Systems"
-        norm = normalize(name)
+        norm = normalize_name(name)
         
         entity = db.query(GlobalEntity).filter(GlobalEntity.normalized_name == norm).first()
         if not entity: